@@ -2,16 +2,24 @@ import tkinter as tk
 import socket
 import threading
 import os
+import errno
+import mmap
 import time
+import pathlib
+import concurrent.futures
+from collections import deque
 from tkinter import ttk, filedialog
-import numpy as np # Still imported but its usage for dummy data creation is removed
 import struct # For packing/unpacking binary data
+import selectors
+import queue
+import re
 
 
 # Configuration
 SERVER_IP = '0.0.0.0'  # Listen on all interfaces
 SERVER_PORT = 9999
 BUFFER_SIZE = 4096
+SEND_BUFFER_SIZE = 1 << 20 # 1MB kernel send buffer so whole ADC files can be queued per write
 FOLDER = "adc_data" # Folder for ADC .txt files
 
 # Define constants for length-prefixing
@@ -19,6 +27,29 @@ FILENAME_LENGTH_BYTES = 4  # 4 bytes for filename length (max ~4GB filename, pra
 FILE_CONTENT_LENGTH_BYTES = 8 # 8 bytes for file content length (max ~16 Exabytes, suitable for very large files)
 CONFIG_LENGTH_BYTES = 4 # 4 bytes for configuration message length
 
+# Precompiled big-endian packers matching the byte counts above
+FILENAME_LENGTH_STRUCT = struct.Struct('>I')
+FILE_CONTENT_LENGTH_STRUCT = struct.Struct('>Q')
+CONFIG_LENGTH_STRUCT = struct.Struct('>I')
+END_OF_TRANSMISSION_FRAME = FILENAME_LENGTH_STRUCT.pack(0) # Reserved filename length 0 marks the end of the stream
+LARGE_PAYLOAD_BYTES = 64 * 1024 # Payloads at or above this size are sent with sendmsg instead of being concatenated
+STREAM_CHUNK_SIZE = 64 * 1024 # Read size when a file has to be streamed through Python instead of sendfile
+MMAP_THRESHOLD_BYTES = 1 << 20 # Without sendfile, files larger than this are sent from a read-only memory map
+PRECISE_INTERVAL_MS = 5 # Intervals below this are paced with a busy-wait tail instead of time.sleep alone
+SPIN_WAIT_S = 0.002 # Longest busy-wait tail; shorter intervals spin for a quarter of the interval
+CLOSE_DRAIN_TIMEOUT_S = 0.2 # How long closing a client waits for it to acknowledge the end of the stream
+BATCH_FLUSH_BYTES = 16 * 1024 # At those intervals, small frames are coalesced until this many bytes are pending
+PREFETCH_DEPTH = 2 # Number of files read ahead of the one being sent in interval mode
+HEADER_SEND_FLAGS = getattr(socket, "MSG_MORE", 0) # 0 where the flag is unavailable (Windows, macOS)
+HZ_PATTERN = re.compile(r'hz(\d+)') # Extracts the frequency from names like "...20hz50.txt"
+UI_POLL_MS = 50 # How often the Tk thread applies status updates queued by the sender thread
+# errno values meaning os.sendfile cannot be used for this file/socket pair, so the read path is used instead
+SENDFILE_UNSUPPORTED_ERRNOS = {errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP}
+
+
+class SendingStopped(Exception):
+    """Raised inside the sender thread when stop_sending interrupts a send that is waiting on the client."""
+
 
 # Removed create_sample_data() function as per request.
 # You will need to ensure your 'adc_data' folder exists and contains valid .txt files
@@ -102,11 +133,27 @@ class LoadCellServer:
         self.client_conn = None
         self.is_sending = False
         self.send_thread = None
+        self._file_cache = {} # Maps file path -> (packed header, file content) read ahead for sending
+        self._freq_index = {} # Maps frequency string -> data folder files recorded at that frequency
+        self._folder_entries = {} # Maps data folder file name -> (path, size) from the last scan
+        # UI inputs captured by start_sending for the sender thread
+        self._send_mode = None
+        self._send_interval_ms = None
+        self._send_frequency = None
+        # Self-pipe used to wake the sender thread out of select() when sending is stopped
+        self._stop_reader, self._stop_writer = socket.socketpair()
+        self._stop_reader.setblocking(False)
+        self._send_selector = None # Waits on the client socket and the stop signal while a send is blocked
+        # ("status", text) and ("finished", None) events from the sender thread; only the Tk thread touches widgets
+        self._ui_events = queue.Queue()
+        # The listening socket stays open for the life of the app; each run only accepts on it
+        self._open_listener()
 
         # Update UI elements initially based on default mode
         self.update_ui_elements()
         # Bind the window close event to cleanup function
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.root.after(UI_POLL_MS, self._process_ui_events)
 
 
     def apply_styles(self):
@@ -156,9 +203,19 @@ class LoadCellServer:
             self.status.config(text="Already sending...")
             return
 
-        # Ensure any previous connections are fully closed before starting new one
-        self._cleanup_connections()
+        # The previous sender thread closes its own connection; it must be gone before starting again.
+        # Never join it here: that would block the Tk loop for the length of its close and drain
+        if self.send_thread and self.send_thread.is_alive():
+            self.status.config(text="Still stopping the previous run, try again.")
+            return
+        self._file_cache = {} # Files may have changed on disk since the last run
         
+        # Snapshot the UI inputs here; the sender thread must not touch Tk widgets
+        self._send_mode = self.mode.get()
+        self._send_interval_ms = int(self.interval_var.get())
+        self._send_frequency = self.freq_entry.get()
+
+        self._apply_ui_events() # A late "finished" from the previous run must not reset this run's buttons
         self.is_sending = True
         self.start_button.config(state="disabled")
         self.stop_button.config(state="normal")
@@ -172,35 +229,39 @@ class LoadCellServer:
             return
 
         self.is_sending = False # Signal the thread to stop
+        self._stop_writer.send(b"\0") # Wake the thread if it is waiting in select()
         self.status.config(text="Stopping sending...")
         self.stop_button.config(state="disabled")
-        self.start_button.config(state="normal")
-        
-        # Give the thread a moment to recognize the stop flag and close gracefully
-        # If it doesn\'t close promptly, force close sockets.
-        if self.send_thread and self.send_thread.is_alive():
-            # A small delay to allow the thread to self-terminate if it's in a safe state
-            time.sleep(0.1) 
-        
-        self._cleanup_connections() # Force close any lingering sockets
+        # The thread half-closes and drains its connection itself, then queues "finished",
+        # which re-enables Start; closing it from here would switch the socket back to
+        # blocking under the sender and stall the GUI for the drain
 
-    def _cleanup_connections(self):
-        """Closes server and client sockets cleanly."""
-        if self.client_conn:
-            try:
-                # Attempt to gracefully shut down both read and write sides
-                self.client_conn.shutdown(socket.SHUT_RDWR)
-                self.client_conn.close()
-                print("[SERVER] Client connection closed.")
-            except OSError as e:
-                print(f"[SERVER] Error closing client connection: {e}")
-            finally:
-                self.client_conn = None
-        
+    def _open_listener(self):
+        """
+        Creates, binds and starts the long-lived listening socket.
+        Failures are reported and retried the next time sending starts.
+        """
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1) # Allows immediate reuse of address
+            if hasattr(socket, "SO_REUSEPORT"): # Not available on Windows
+                listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            listener.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) # Inherited by accepted sockets on most platforms
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+            listener.bind((SERVER_IP, SERVER_PORT))
+            listener.listen(16)
+            listener.setblocking(False)
+        except OSError as e:
+            listener.close()
+            print(f"[SERVER] Could not open listening socket on {SERVER_IP}:{SERVER_PORT}: {e}")
+            return
+        self.server_socket = listener
+        print(f"[SERVER] Listening on {SERVER_IP}:{SERVER_PORT}")
+
+    def _close_listener(self):
+        """Closes the long-lived listening socket."""
         if self.server_socket:
             try:
-                # Shutdown and close the listening socket
-                self.server_socket.shutdown(socket.SHUT_RDWR)
                 self.server_socket.close()
                 print("[SERVER] Server listening socket closed.")
             except OSError as e:
@@ -208,9 +269,71 @@ class LoadCellServer:
             finally:
                 self.server_socket = None
 
+    def _cleanup_connections(self):
+        """
+        Closes the client socket cleanly. The listening socket is kept for the next run.
+        Only the sender thread calls this, once it no longer uses the socket.
+        """
+        conn, self.client_conn = self.client_conn, None
+        if conn:
+            try:
+                # Half-close so data still queued reaches the client, then briefly drain until it closes too.
+                # SHUT_RDWR here could reset the connection and drop that data.
+                conn.shutdown(socket.SHUT_WR)
+                conn.settimeout(CLOSE_DRAIN_TIMEOUT_S)
+                deadline = time.monotonic() + CLOSE_DRAIN_TIMEOUT_S
+                while conn.recv(BUFFER_SIZE) and time.monotonic() < deadline:
+                    pass
+            except socket.timeout:
+                pass # Client did not close in time, close our side anyway
+            except OSError as e:
+                print(f"[SERVER] Error shutting down client connection: {e}")
+            finally:
+                conn.close()
+                print("[SERVER] Client connection closed.")
+
+    def _drain_stop_signal(self):
+        """Discards stop notifications left over from a previous run."""
+        try:
+            while self._stop_reader.recv(BUFFER_SIZE):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _set_status(self, text):
+        """
+        Queues a status label update; safe from any thread.
+        Calling Tk (even root.after) from the sender thread would block it until the Tk loop runs.
+        """
+        self._ui_events.put(("status", text))
+
+    def _process_ui_events(self):
+        """Runs on the Tk thread every UI_POLL_MS and applies what the sender thread queued."""
+        self._apply_ui_events()
+        self.root.after(UI_POLL_MS, self._process_ui_events)
+
+    def _apply_ui_events(self):
+        """Applies every queued sender event now. Tk thread only."""
+        try:
+            while True:
+                event, text = self._ui_events.get_nowait()
+                if event == "status":
+                    self.status.config(text=text)
+                elif event == "finished":
+                    self.start_button.config(state="normal")
+                    self.stop_button.config(state="disabled")
+        except queue.Empty:
+            pass
+
     def on_closing(self):
         """Handles the window closing event to ensure graceful shutdown."""
         self.stop_sending()
+        # A sender still closing its connection is a daemon thread that no longer touches Tk;
+        # leave the sockets it may be waiting on to process exit rather than closing them under it
+        if not (self.send_thread and self.send_thread.is_alive()):
+            self._close_listener()
+            self._stop_reader.close()
+            self._stop_writer.close()
         self.root.destroy()
 
 
@@ -220,43 +343,51 @@ class LoadCellServer:
         Runs in a separate thread.
         """
         try:
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1) # Allows immediate reuse of address
-            self.server_socket.bind((SERVER_IP, SERVER_PORT))
-            self.server_socket.listen(1)
-            self.status.config(text="Waiting for client connection...")
-            
-            # Set a timeout for accept to allow checking self.is_sending
-            self.server_socket.settimeout(1.0) # 1 second timeout for accept
-
-            while self.is_sending: # Keep trying to accept as long as sending is active
-                try:
-                    conn, addr = self.server_socket.accept()
-                    self.client_conn = conn # Store the active client connection
-                    break # Connection accepted, exit loop
-                except socket.timeout:
-                    # No connection within timeout, check if sending should stop
-                    if not self.is_sending:
-                        print("[SERVER] Server accept timed out, stopping.")
-                        self.status.config(text="Sending stopped.")
-                        return # Exit thread if stop requested
-                    continue # Continue waiting for connection
-            
-            if not self.is_sending: # Check if loop exited due to stop flag
+            if self.server_socket is None: # Opening at startup failed, try again now
+                self._open_listener()
+                if self.server_socket is None:
+                    raise OSError(f"Cannot listen on {SERVER_IP}:{SERVER_PORT}")
+            self._set_status("Waiting for client connection...")
+
+            # Sleep until either a client connects or stop_sending pokes the self-pipe
+            self._drain_stop_signal()
+            with selectors.DefaultSelector() as selector:
+                selector.register(self.server_socket, selectors.EVENT_READ)
+                selector.register(self._stop_reader, selectors.EVENT_READ)
+                ready = {key.fileobj for key, _ in selector.select()}
+
+            if self._stop_reader in ready or not self.is_sending:
                 print("[SERVER] Sending stopped before connection was established.")
-                self.status.config(text="Sending stopped.")
+                self._set_status("Sending stopped.")
                 return
 
-            self.status.config(text=f"Connected to {addr}")
+            conn, addr = self.server_socket.accept()
+            conn.setblocking(False) # Sends wait in select() instead, so stop_sending can interrupt them
+            # Disable Nagle so small frames are not held back waiting for delayed ACKs
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+            self.client_conn = conn # Store the active client connection
+            self._send_selector = selectors.DefaultSelector()
+            self._send_selector.register(conn, selectors.EVENT_WRITE)
+            self._send_selector.register(self._stop_reader, selectors.EVENT_READ)
+
+            self._set_status(f"Connected to {addr}")
 
             # Ensure the data folder exists, even if not creating dummy data
             if not os.path.exists(FOLDER):
                 os.makedirs(FOLDER)
                 print(f"Created data folder: {FOLDER} (was missing)")
 
-            all_files_in_folder = sorted([f for f in os.listdir(FOLDER) if f.endswith(".txt")])
+            # One directory scan gives names, paths and sizes (DirEntry caches its stat)
+            with os.scandir(FOLDER) as entries:
+                self._folder_entries = {
+                    entry.name: (entry.path, entry.stat().st_size)
+                    for entry in entries
+                    if entry.name.endswith(".txt") and entry.is_file()
+                }
+            all_files_in_folder = sorted(self._folder_entries)
             if not all_files_in_folder:
-                self.status.config(text=f"Error: No .txt files found in '{FOLDER}'!")
+                self._set_status(f"Error: No .txt files found in '{FOLDER}'!")
                 print(f"[SERVER] Error: No .txt files found in '{FOLDER}'.")
                 self._send_file(self.client_conn, None) # Send EOT or error signal to client
                 return
@@ -264,8 +395,15 @@ class LoadCellServer:
 
             print(f"[SERVER] Files in {FOLDER}: {all_files_in_folder}")
 
-            selected_mode = self.mode.get()
-            interval_ms = int(self.interval_var.get())
+            # Index files by frequency once so freq mode is a dict lookup instead of a scan
+            self._freq_index = {}
+            for fname in all_files_in_folder:
+                match = HZ_PATTERN.search(fname)
+                if match:
+                    self._freq_index.setdefault(match.group(1), []).append(fname)
+
+            selected_mode = self._send_mode
+            interval_ms = self._send_interval_ms
 
             # Send initial configuration data (interval and mode) to client
             self._send_config(self.client_conn, interval_ms, selected_mode)
@@ -273,33 +411,55 @@ class LoadCellServer:
             if selected_mode == "interval":
                 self._send_files_at_interval(self.client_conn, all_files_in_folder, interval_ms)
             elif selected_mode == "freq":
-                self._send_file_by_frequency(self.client_conn, all_files_in_folder)
+                self._send_file_by_frequency(self.client_conn)
             elif selected_mode == "select_file":
                 self._send_selected_file(self.client_conn)
 
             if self.is_sending: # Only update status if not explicitly stopped
-                self.status.config(text="Finished sending files.")
+                self._set_status("Finished sending files.")
         
+        except SendingStopped:
+            print("[SERVER] Sending stopped by user.")
         except Exception as error:
-            self.status.config(text=f"Error: {str(error)}")
+            self._set_status(f"Error: {str(error)}")
             print(f"[SERVER] Exception in _send_files_thread: {error}")
         finally:
             self.is_sending = False
+            if self._send_selector:
+                self._send_selector.close()
+                self._send_selector = None
             self._cleanup_connections() # Ensure sockets are closed
             # Re-enable start button and disable stop button on thread completion in main GUI thread
-            self.root.after(100, lambda: self.start_button.config(state="normal"))
-            self.root.after(100, lambda: self.stop_button.config(state="disabled"))
+            self._ui_events.put(("finished", None))
+
+
+    def _cache_file(self, filename):
+        """
+        Reads a file from the data folder once and stores its header and contents side by side,
+        so the sending loop can hand both to the kernel in one sendmsg without joining them.
+        Runs on the read-ahead worker thread in interval mode.
+
+        Args:
+            filename (str): Name of the file inside the data folder.
+        """
+        filepath, _ = self._folder_entries[filename]
+        if filepath not in self._file_cache:
+            file_data = pathlib.Path(filepath).read_bytes()
+            # Header built from the bytes actually read, so it is right even if the file changed since the scan
+            self._file_cache[filepath] = (self._file_header(filename, len(file_data)), file_data)
 
 
     def _send_config(self, connection, interval_ms, mode):
         """Sends initial configuration data to the client using length-prefixing."""
         config_data_str = f"INTERVAL:{interval_ms}\\nMODE:{mode}\\n"
         config_data_bytes = config_data_str.encode('utf-8')
-        config_len_bytes = len(config_data_bytes).to_bytes(CONFIG_LENGTH_BYTES, 'big')
+        config_len_bytes = CONFIG_LENGTH_STRUCT.pack(len(config_data_bytes))
         
         try:
-            connection.sendall(config_len_bytes + config_data_bytes)
+            self._send_frame(connection, config_len_bytes, config_data_bytes)
             print(f"[SERVER] Sent config: {config_data_str.strip()}")
+        except SendingStopped:
+            print("[SERVER] Sending stopped before config was sent.")
         except Exception as e:
             print(f"[SERVER] Error sending config: {e}")
             self.is_sending = False # Stop sending if config fails
@@ -314,43 +474,113 @@ class LoadCellServer:
             all_files (list): A list of all files in the data folder.
             interval_ms (int): The interval between sending files in milliseconds.
         """
-        for filename in all_files:
-            if not self.is_sending: # Check stop flag before sending each file
-                print("[SERVER] Interval sending stopped by user.")
-                break
-            if filename.endswith(".txt"):
-                print(f"[SERVER] Preparing to send file: {filename}")
-                self._send_file(connection, os.path.join(FOLDER, filename))
-                if not self.is_sending: # Check again after sending
+        interval_s = interval_ms / 1000.0 # Convert ms to seconds
+        precise = interval_ms < PRECISE_INTERVAL_MS
+        # A tail as long as the interval would leave nothing to sleep through at 1-2ms
+        spin_s = min(SPIN_WAIT_S, interval_s / 4) if precise else 0.0
+        batch = bytearray() # Small frames waiting to go out in one write (sub-5ms intervals only)
+        # Bind everything the loop touches per file to locals; attribute and global lookups add up at 1ms
+        perf_counter = time.perf_counter
+        cache_file, file_cache, folder_entries = self._cache_file, self._file_cache, self._folder_entries
+        send_file, flush_batch, sleep_until = self._send_file, self._flush_batch, self._sleep_until
+        file_count = len(all_files)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as reader:
+            # Read ahead on a worker thread so file N+1 comes off disk while file N is on the wire
+            submit = reader.submit
+            pending_reads = deque(submit(cache_file, f) for f in all_files[:PREFETCH_DEPTH])
+            next_read = pending_reads.popleft
+            next_tick = perf_counter()
+            for index, filename in enumerate(all_files):
+                if not self.is_sending: # Check stop flag before sending each file (set from the GUI thread)
+                    print("[SERVER] Interval sending stopped by user.")
                     break
-                time.sleep(interval_ms / 1000.0) # Convert ms to seconds
+                next_read().result() # Wait for this file's frame (re-raises read errors)
+                if index + PREFETCH_DEPTH < file_count:
+                    pending_reads.append(submit(cache_file, all_files[index + PREFETCH_DEPTH]))
+                if filename.endswith(".txt"):
+                    print(f"[SERVER] Preparing to send file: {filename}")
+                    filepath = folder_entries[filename][0]
+                    header, file_data = file_cache[filepath]
+                    if precise and len(header) + len(file_data) < BATCH_FLUSH_BYTES:
+                        # Same framing as a single send, so the client peels batched files off unchanged
+                        batch += header
+                        batch += file_data
+                    else:
+                        flush_batch(connection, batch) # Keep files in order
+                        send_file(connection, filepath)
+                    file_cache.pop(filepath, None) # Each file goes out once per run, keep memory bounded to the read-ahead
+                    if not self.is_sending: # Check again after sending
+                        break
+                    # Pace against absolute deadlines so send time does not add to the period
+                    next_tick += interval_s
+                    if next_tick > perf_counter():
+                        flush_batch(connection, batch) # Ahead of schedule, don't hold frames while idle
+                        sleep_until(next_tick, spin_s)
+                    else:
+                        if len(batch) >= BATCH_FLUSH_BYTES:
+                            flush_batch(connection, batch)
+                        next_tick = perf_counter() # Running late, re-anchor instead of bursting to catch up
         if self.is_sending: # Only send empty file if not stopped
-            self._send_file(connection, None) # Signal end of interval files
+            flush_batch(connection, batch)
+            send_file(connection, None) # Signal end of interval files
+
+    def _flush_batch(self, connection, batch):
+        """
+        Sends any coalesced frames in one write and empties the buffer.
+
+        Args:
+            connection (socket.socket): The socket connection to the client.
+            batch (bytearray): Back-to-back framed files, cleared once sent.
+        """
+        if not batch or not self.is_sending:
+            return
+        try:
+            self._send_buffers(connection, [batch])
+            print(f"[SERVER] Sent batched files, Size: {len(batch)} bytes (with headers)")
+            batch.clear()
+        except SendingStopped:
+            print("[SERVER] Sending stopped while sending batched files.")
+        except BrokenPipeError:
+            print("[SERVER] Client disconnected while sending batched files.")
+            self.is_sending = False # Client disconnected, stop sending
+        except Exception as error:
+            print(f"[SERVER] Error sending batched files: {error}")
+            self._set_status(f"Error sending batched files: {error}")
+            self.is_sending = False # Critical error, stop sending
 
-    def _send_file_by_frequency(self, connection, all_files):
+    def _sleep_until(self, deadline, spin_s=0.0):
+        """
+        Sleeps until the given time.perf_counter() deadline.
+        With spin_s > 0 the last stretch is busy-waited, since time.sleep can overshoot
+        by 1-15ms (notably on Windows), which matters for the 1ms and 2ms intervals.
+
+        Args:
+            deadline (float): Target time.perf_counter() value.
+            spin_s (float): Busy-wait the final spin_s seconds instead of sleeping.
+        """
+        remaining = deadline - time.perf_counter() - spin_s
+        if remaining > 0:
+            time.sleep(remaining)
+        if spin_s:
+            while time.perf_counter() < deadline:
+                time.sleep(0) # Releases the GIL, so the read-ahead worker and Tk keep running during the spin
+
+    def _send_file_by_frequency(self, connection):
         """
         Sends a specific file based on the entered frequency.
 
         Args:
             connection (socket.socket): The socket connection to the client.
-            all_files (list): A list of all files in the data folder.
         """
-        frequency = self.freq_entry.get()
-        matched_files = [\
-            fname\
-            for fname in all_files\
-            if f"hz{frequency}" in fname and fname.endswith(".txt")\
-        ]
+        frequency = self._send_frequency
+        matched_files = self._freq_index.get(frequency, [])
 
         if not matched_files:
-            self.status.config(text=f"No file found for {frequency} Hz")
+            self._set_status(f"No file found for {frequency} Hz")
             # Signal to client that no file was found for frequency mode
-            no_file_msg = f"NO_FILE_FOUND:{frequency}".encode('utf-8')
-            filename_len_bytes = len(no_file_msg).to_bytes(FILENAME_LENGTH_BYTES, 'big')
             # For simplicity, send 0 content length when sending a control message
-            file_content_len_bytes = (0).to_bytes(FILE_CONTENT_LENGTH_BYTES, 'big') 
             try:
-                connection.sendall(filename_len_bytes + no_file_msg + file_content_len_bytes)
+                self._send_frame(connection, self._file_header(f"NO_FILE_FOUND:{frequency}", 0))
                 print(f"[SERVER] Sent NO_FILE_FOUND for {frequency} Hz.")
             except Exception as e:
                 print(f"[SERVER] Error sending NO_FILE_FOUND message: {e}")
@@ -359,7 +589,7 @@ class LoadCellServer:
         # Send the file
         if self.is_sending:
             print(f"[SERVER] Preparing to send frequency file: {matched_files[0]}")
-            self._send_file(connection, os.path.join(FOLDER, matched_files[0]))
+            self._send_file(connection, self._folder_entries[matched_files[0]][0])
         else:
             print("[SERVER] Sending stopped while in frequency mode.")
         self._send_file(connection, None) # Signal end of files in this mode
@@ -373,13 +603,10 @@ class LoadCellServer:
             connection (socket.socket): The socket connection to the client.
         """
         if not self.selected_file:
-            self.status.config(text="No file selected!")
+            self._set_status("No file selected!")
             # Signal to client that no file was selected
-            no_file_msg = b"NO_FILE_SELECTED"
-            filename_len_bytes = len(no_file_msg).to_bytes(FILENAME_LENGTH_BYTES, 'big')
-            file_content_len_bytes = (0).to_bytes(FILE_CONTENT_LENGTH_BYTES, 'big')
             try:
-                connection.sendall(filename_len_bytes + no_file_msg + file_content_len_bytes)
+                self._send_frame(connection, self._file_header("NO_FILE_SELECTED", 0))
                 print("[SERVER] Sent NO_FILE_SELECTED message.")
             except Exception as e:
                 print(f"[SERVER] Error sending NO_FILE_SELECTED message: {e}")
@@ -393,6 +620,135 @@ class LoadCellServer:
         self._send_file(connection, None) # Signal end of files in this mode
 
 
+    def _send_frame(self, connection, header, payload=b""):
+        """
+        Sends a length-prefixed header followed by its payload with as few syscalls as possible.
+        Small frames are concatenated into one buffer; large payloads use scatter/gather
+        sendmsg so the payload is not copied just to prepend the header.
+
+        Args:
+            connection (socket.socket): The socket connection to the client.
+            header (bytes): The packed length-prefix header.
+            payload (bytes): The data following the header.
+        """
+        if len(payload) < LARGE_PAYLOAD_BYTES or not hasattr(connection, "sendmsg"):
+            self._send_buffers(connection, [header + payload])
+        else:
+            self._send_buffers(connection, [header, payload])
+
+    def _send_buffers(self, connection, buffers, flags=0):
+        """
+        Writes buffers back to back on the non-blocking client socket. Partial sends are resumed
+        from memoryview slices, and whenever the socket is full the thread waits in select()
+        on both the socket and the stop signal instead of blocking inside the kernel.
+
+        Args:
+            connection (socket.socket): The socket connection to the client.
+            buffers (list): Bytes-like objects to send in order.
+            flags (int): Flags passed to every send call (e.g. MSG_MORE).
+
+        Raises:
+            SendingStopped: If stop_sending was called while waiting for the socket.
+        """
+        pending = deque(memoryview(buffer) for buffer in buffers if len(buffer))
+        scatter_gather = hasattr(connection, "sendmsg")
+        try:
+            while pending:
+                try:
+                    if scatter_gather and len(pending) > 1:
+                        sent = connection.sendmsg(pending, [], flags)
+                    else:
+                        sent = connection.send(pending[0], flags)
+                except BlockingIOError:
+                    self._wait_writable()
+                    continue
+                while sent: # Drop fully sent buffers, slice the first partially sent one
+                    if sent >= len(pending[0]):
+                        sent -= len(pending.popleft())
+                    else:
+                        pending[0] = pending[0][sent:]
+                        sent = 0
+        finally:
+            for view in pending: # Release leftover views so callers can clear buffers or close maps after an error
+                view.release()
+
+    def _wait_writable(self):
+        """Waits until the client socket can take more data, raising SendingStopped if sending is stopped first."""
+        if self.is_sending:
+            ready = {key.fileobj for key, _ in self._send_selector.select()}
+            if self._stop_reader not in ready:
+                return
+        raise SendingStopped()
+
+
+    def _sendfile(self, connection, fd, count):
+        """
+        Streams a file descriptor straight from the page cache into the socket with os.sendfile.
+
+        Args:
+            connection (socket.socket): The socket connection to the client.
+            fd (int): An open, readable file descriptor positioned anywhere (an explicit offset is used).
+            count (int): The number of bytes to send.
+
+        Returns:
+            bool: False if sendfile is unsupported here and nothing was sent, True once all bytes are sent.
+        """
+        if not hasattr(os, "sendfile"):
+            return False
+
+        offset = 0
+        while offset < count:
+            try:
+                sent = os.sendfile(connection.fileno(), fd, offset, count - offset)
+            except BlockingIOError:
+                self._wait_writable()
+                continue
+            except OSError as e:
+                if offset == 0 and e.errno in SENDFILE_UNSUPPORTED_ERRNOS:
+                    return False # e.g. the file lives on a filesystem without sendfile support
+                raise
+            if sent == 0:
+                raise BrokenPipeError("Connection closed during sendfile")
+            offset += sent
+        return True
+
+    def _send_mapped(self, connection, fd, count):
+        """
+        Sends a large file from a read-only memory map, so its pages go from the page cache
+        to the socket without being copied into Python objects first.
+
+        Args:
+            connection (socket.socket): The socket connection to the client.
+            fd (int): An open, readable file descriptor.
+            count (int): The number of bytes announced in the header.
+        """
+        with mmap.mmap(fd, count, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise"): # Python 3.8+, and not on Windows
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+                mapped.madvise(mmap.MADV_WILLNEED)
+            self._send_buffers(connection, [mapped])
+
+    def _stream_file(self, connection, fd, count):
+        """
+        Sends a file descriptor's contents in fixed-size chunks through one reusable buffer,
+        so memory use stays bounded however large the file is.
+
+        Args:
+            connection (socket.socket): The socket connection to the client.
+            fd (int): An open, readable file descriptor positioned at the start of the file.
+            count (int): The number of bytes announced in the header.
+        """
+        chunk = memoryview(bytearray(STREAM_CHUNK_SIZE))
+        remaining = count
+        with open(fd, "rb", buffering=0, closefd=False) as file:
+            while remaining:
+                read = file.readinto(chunk[:min(remaining, STREAM_CHUNK_SIZE)])
+                if not read:
+                    raise OSError(f"File shrank while sending, {remaining} bytes short")
+                self._send_buffers(connection, [chunk[:read]])
+                remaining -= read
+
+
     def _send_file(self, connection, filepath):
         """
         Sends the contents of a file to the client using length-prefixing.
@@ -404,40 +760,57 @@ class LoadCellServer:
         """
         try:
             if filepath is None:
-                filename = "END_OF_TRANSMISSION"
-                file_data = b""
                 print("[SERVER] Sending END_OF_TRANSMISSION signal.")
-            else:
-                filename = os.path.basename(filepath)
-                with open(filepath, "rb") as file:
-                    file_data = file.read()
-
-            filename_bytes = filename.encode('utf-8')
-            filename_length = len(filename_bytes)
-            file_content_length = len(file_data)
-
-            # Pack lengths into fixed-size byte strings
-            filename_len_packed = filename_length.to_bytes(FILENAME_LENGTH_BYTES, 'big')
-            file_content_len_packed = file_content_length.to_bytes(FILE_CONTENT_LENGTH_BYTES, 'big')
-
-            # Send filename length, filename, file content length, and file content
-            connection.sendall(filename_len_packed)
-            connection.sendall(filename_bytes)
-            connection.sendall(file_content_len_packed)
-            connection.sendall(file_data)
-
-            if filepath is not None:
-                print(f"[SERVER] Sent file \'{filename}\', Size: {file_content_length} bytes")
+                self._send_buffers(connection, [END_OF_TRANSMISSION_FRAME])
+                return
+
+            filename = os.path.basename(filepath)
+            cached_frame = self._file_cache.get(filepath)
+            if cached_frame is not None:
+                header, file_data = cached_frame
+                self._send_frame(connection, header, file_data)
+                print(f"[SERVER] Sent cached file \'{filename}\', Size: {len(header) + len(file_data)} bytes (with header)")
+                return
+
+            fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+            try:
+                file_content_length = os.fstat(fd).st_size
+                # MSG_MORE (Linux) holds the header back so it leaves in the same segment as the payload start
+                self._send_buffers(connection, [self._file_header(filename, file_content_length)], HEADER_SEND_FLAGS)
+
+                # Zero-copy path first; fall back to reading the file where sendfile is unavailable (e.g. Windows)
+                if not self._sendfile(connection, fd, file_content_length):
+                    if file_content_length > MMAP_THRESHOLD_BYTES:
+                        self._send_mapped(connection, fd, file_content_length)
+                    else:
+                        self._stream_file(connection, fd, file_content_length)
+            finally:
+                os.close(fd)
+
+            print(f"[SERVER] Sent file \'{filename}\', Size: {file_content_length} bytes")
             
+        except SendingStopped:
+            print(f"[SERVER] Sending stopped while sending {filename if filepath else 'EOT signal'}.")
         except BrokenPipeError:
             print(f"[SERVER] Client disconnected while sending {filename if filepath else 'EOT signal'}.")
             self.is_sending = False # Client disconnected, stop sending
         except Exception as error:
             print(f"[SERVER] Error in _send_file for \'{filepath}\': {error}")
-            self.status.config(text=f"Error sending file \'{filename if filepath else 'EOT signal'}\': {error}")
+            self._set_status(f"Error sending file \'{filename if filepath else 'EOT signal'}\': {error}")
             self.is_sending = False # Critical error, stop sending
 
 
+    def _file_header(self, filename, file_content_length):
+        """Packs the filename length, filename, and file content length into one header."""
+        filename_bytes = filename.encode('utf-8')
+        content_length_offset = FILENAME_LENGTH_BYTES + len(filename_bytes)
+        header = bytearray(content_length_offset + FILE_CONTENT_LENGTH_BYTES)
+        FILENAME_LENGTH_STRUCT.pack_into(header, 0, len(filename_bytes))
+        header[FILENAME_LENGTH_BYTES:content_length_offset] = filename_bytes
+        FILE_CONTENT_LENGTH_STRUCT.pack_into(header, content_length_offset, file_content_length)
+        return header
+
+
 # Run GUI
 if __name__ == "__main__":
     # Removed the call to create_sample_data()
@@ -247,11 +247,14 @@ def receive_data_loop(data_queue):
                     break
                 
                 filename_length = int.from_bytes(filename_len_bytes, 'big')
+                if filename_length == 0: # Reserved length marking the end of the stream
+                    print("[CLIENT] Received END_OF_TRANSMISSION signal.")
+                    break
                 filename_bytes = recvall(s, filename_length)
                 if not filename_bytes: break
                 file_name = filename_bytes.decode('utf-8')
 
-                if file_name == "END_OF_TRANSMISSION":
+                if file_name == "END_OF_TRANSMISSION": # Older servers send the marker as a filename
                     print("[CLIENT] Received END_OF_TRANSMISSION signal.")
                     break
                 
@@ -1,67 +1,177 @@
 import socket
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
 import numpy as np
-import time
-from scipy.signal import firwin, lfilter
+from scipy.signal import firwin, lfilter, oaconvolve
+import scipy.fft
 import os
+import re
 import threading
-from collections import deque
+import queue
+import concurrent.futures
+from collections import OrderedDict
 import struct  # Import struct for packing/unpacking binary data
+from functools import lru_cache
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("[CLIENT] Numba not found, FIR filtering falls back to SciPy lfilter. Install it with 'pip install numba'")
 
 # Configuration
 SERVER_IP = '127.0.0.1'
 SERVER_PORT = 9999
-BUFFER_SIZE = 4096
+BUFFER_SIZE = 1 << 20  # Initial size of the reusable receive buffer (doubles if a file needs more)
+COMPACT_THRESHOLD = 64 * 1024  # Consumed bytes allowed at the front of the receive buffer before it is compacted
 SEPARATOR = b'||'
 ZERO_CAL = 0.01823035255075
 SCALE_CAL = 0.00000451794631
+_INV_SCALE32 = 1.0 / float(0x80000000)  # Multiply instead of dividing every sample
+_INV_SCALE_CAL = 1.0 / SCALE_CAL
+PLOT_STRIDE = 10  # Samples added between live plot redraws
+FFT_WINDOW_SIZE = 128  # Samples per live FFT window
+FFT_CACHE_SIZE = 64  # Spectra remembered by live_plot, keyed by a rounded fingerprint of the window
+PLOT_HISTORY = 1000  # Most recent samples shown in the live time-domain plots
+FIR_NUMTAPS = 51
+FFT_FILTER_MIN_WORK = 1_000_000  # samples x taps above which the FIR is applied by overlap-add FFT convolution
+ADC_PATTERN = re.compile(rb'ADC:[ \t]*(-?\d+)')  # The integer after each "ADC:"; only spaces and tabs may come between, as in the numba parser
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, boundscheck=False)
+    def _parse_adc_numba(data, out):
+        """Scans bytes for "ADC:<integer>" and writes each integer to out; returns how many were found."""
+        count = 0
+        i = 0
+        n = data.shape[0]
+        while i + 4 < n:
+            if data[i] == 65 and data[i + 1] == 68 and data[i + 2] == 67 and data[i + 3] == 58:  # b"ADC:"
+                i += 4
+                while i < n and (data[i] == 32 or data[i] == 9):  # Spaces or tabs after the colon
+                    i += 1
+                negative = i < n and data[i] == 45  # b"-"
+                if negative:
+                    i += 1
+                start = i
+                value = 0
+                while i < n and 48 <= data[i] <= 57:  # Accumulate decimal digits
+                    value = value * 10 + (data[i] - 48)
+                    i += 1
+                if i > start:
+                    out[count] = -value if negative else value
+                    count += 1
+            else:
+                i += 1
+        return count
+
+
+def parse_adc_values(data, start, end):
+    """
+    Extracts the integers from the "ADC:<value>" lines in data[start:end].
+
+    Args:
+        data (bytes or bytearray): Received file content.
+        start (int): Offset of the first byte that belongs to the file.
+        end (int): Offset just past the last byte that belongs to the file.
+
+    Returns:
+        np.ndarray: int64 ADC values, in file order.
+    """
+    if not NUMBA_AVAILABLE:
+        return np.fromiter(map(int, ADC_PATTERN.findall(data, start, end)), dtype=np.int64)
+    if end == start:
+        return np.empty(0, dtype=np.int64)
+    out = np.empty((end - start) // 5 + 1, dtype=np.int64)  # Each value needs at least the 5 bytes of "ADC:0"
+    count = _parse_adc_numba(np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start), out)
+    return out[:count]
 
 
-def normalize(values):
+def normalize(values, out=None):
     """
     Normalize the raw ADC values to weights using the provided formula.
 
     Args:
-        values (list): List of raw ADC values.
+        values (list or np.ndarray): Raw ADC values.
+        out (np.ndarray, optional): float32 array to write the weights into; may be values itself.
 
     Returns:
-        list: List of calculated weights.
+        np.ndarray: Calculated weights.
     """
-    weights = []
-    for raw_value in values:
-        try:
-            data_in = float(raw_value) / float(0x80000000)
-            calculated_weight = (data_in - ZERO_CAL) / SCALE_CAL
-            weights.append(calculated_weight)
-        except ZeroDivisionError:
-            print("[CLIENT] Error: Division by zero in normalize function.")
-            return [0.0] * len(values)  # Return a list of zeros
-        except Exception as e:
-            print(f"[CLIENT] Error in normalize function: {e}")
-            return [0.0] * len(values)
-    return weights
-
-
-
-def remove_dc_offset(values):
-    """Remove DC offset by subtracting the mean"""
     try:
-        return values - np.mean(values)
+        # Vectorized instead of a Python loop over every sample; the later steps run in place
+        # float32 is ample for plotting and halves the memory traffic of every later step
+        weights = np.multiply(np.asarray(values, dtype=np.float32), _INV_SCALE32, out=out)
+        weights -= ZERO_CAL
+        weights *= _INV_SCALE_CAL
+        return weights
+    except Exception as e:
+        print(f"[CLIENT] Error in normalize function: {e}")
+        return np.zeros(len(values), dtype=np.float32)  # Return zeros
+
+
+
+def remove_dc_offset(values, out=None):
+    """Remove DC offset by subtracting the mean (pass out=values to do it in place)"""
+    try:
+        return np.subtract(values, np.mean(values), out=out)
     except Exception as e:
         print(f"[CLIENT] Error in remove_dc_offset function: {e}")
         return np.zeros_like(values)
 
 
-def compute_fft(values, sampling_rate):
-    """Compute FFT and return frequency spectrum"""
+@lru_cache(maxsize=8)
+def _hanning(N):
+    """float32 Hanning window of length N, built once per length and shared read-only."""
+    window = np.hanning(N).astype(np.float32)
+    window.setflags(write=False)
+    return window
+
+
+_HANNING_LIVE = _hanning(FFT_WINDOW_SIZE)  # Steady-state live plot window, skips even the cache lookup
+
+
+@lru_cache(maxsize=8)
+def _rfft_frequencies(N, sampling_rate):
+    """Frequencies of the first N // 2 rfft bins, built once per (length, rate) and shared read-only."""
+    frequencies = np.fft.rfftfreq(N, d=1 / sampling_rate)[:N // 2]
+    frequencies.setflags(write=False)
+    return frequencies
+
+
+def compute_fft(values, sampling_rate, cache=None):
+    """
+    Compute FFT and return frequency spectrum.
+
+    Args:
+        values (list or np.ndarray): Samples to analyse.
+        sampling_rate (float): Sampling rate in Hz.
+        cache (OrderedDict, optional): LRU cache of magnitudes. Windows whose first sample, last
+            sample and energy match to 3 decimals reuse the stored magnitude instead of a new FFT.
+    """
     N = len(values)
     if N < 2:
         return np.array([0]), np.array([0]), 0
     try:
-        windowed_values = values * np.hanning(N)
-        fft_values = np.fft.fft(windowed_values)
-        fft_magnitude = np.abs(fft_values[:N // 2])
-        frequencies = np.fft.fftfreq(N, d=1 / sampling_rate)[:N // 2]
+        fft_magnitude = key = None
+        if cache is not None:
+            values = np.asarray(values)
+            key = (N, round(float(values[0]), 3), round(float(values[-1]), 3), round(float(np.dot(values, values)), 3))
+            fft_magnitude = cache.get(key)
+            if fft_magnitude is not None:
+                cache.move_to_end(key)
+        if fft_magnitude is None:
+            window = _HANNING_LIVE if N == FFT_WINDOW_SIZE else _hanning(N)
+            # Real input: only the non-mirrored half is computed. scipy.fft keeps the plan for each
+            # length cached between calls, and one worker avoids thread start-up on short windows
+            fft_values = scipy.fft.rfft(values * window, workers=1)
+            fft_magnitude = np.abs(fft_values[:N // 2])
+            if cache is not None:
+                cache[key] = fft_magnitude
+                if len(cache) > FFT_CACHE_SIZE:
+                    cache.popitem(last=False)
+        frequencies = _rfft_frequencies(N, sampling_rate)
         dominant_freq_index = np.argmax(fft_magnitude)
         cut_off_frequency = frequencies[dominant_freq_index]
         return frequencies, fft_magnitude, cut_off_frequency
@@ -71,25 +181,64 @@ def compute_fft(values, sampling_rate):
 
 
 
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, boundscheck=False, parallel=True, nogil=True)
+    def _fir_numba(x, h, out):
+        """
+        Direct-form FIR convolution, equivalent to lfilter(h, 1.0, x) with zero initial state.
+        Each output only reads the input, so the outputs are split across cores, without the GIL.
+        """
+        taps = h.shape[0]
+        for i in prange(x.shape[0]):
+            acc = np.float32(0.0)  # Accumulate in float32 like the inputs, so the loop vectorizes 8-wide
+            for k in range(min(taps, i + 1)):
+                acc += h[k] * x[i - k]
+            out[i] = acc
+
+
+@lru_cache(maxsize=64)
+def _fir_coefficients(normalized_cutoff):
+    """Design the low-pass FIR once per (rounded) cut-off; the result is shared, so it is read-only."""
+    fir_coefficients = firwin(numtaps=FIR_NUMTAPS, cutoff=normalized_cutoff, window="hamming", pass_zero=True).astype(np.float32)
+    fir_coefficients.setflags(write=False)
+    return fir_coefficients
+
+
 def fir_filter(values, cut_off_frequency, sampling_rate):
     """Apply FIR filter using dynamic cut-off frequency"""
     try:
         nyquist = sampling_rate / 2
-        normalized_cutoff = cut_off_frequency / nyquist
-        fir_coefficients = firwin(numtaps=51, cutoff=normalized_cutoff, window="hamming", pass_zero=True)
-        filtered_values = lfilter(fir_coefficients, 1.0, values)
+        normalized_cutoff = round(cut_off_frequency / nyquist, 4)
+        fir_coefficients = _fir_coefficients(normalized_cutoff)
+        if len(values) * len(fir_coefficients) > FFT_FILTER_MIN_WORK:
+            # Long signal: overlap-add is O(N log M) instead of O(N * M). Keeping the first len(values)
+            # samples of the full convolution gives the same causal output as lfilter.
+            with scipy.fft.set_workers(-1):
+                filtered_values = oaconvolve(values, fir_coefficients, mode='full')[:len(values)]
+        elif NUMBA_AVAILABLE:
+            values = np.ascontiguousarray(values, dtype=np.float32)
+            filtered_values = np.empty_like(values)
+            _fir_numba(values, fir_coefficients, filtered_values)
+        else:
+            filtered_values = lfilter(fir_coefficients, np.float32(1.0), values)  # A float32 denominator keeps lfilter in float32
         return filtered_values, fir_coefficients
     except Exception as e:
         print(f"[CLIENT] Error in fir_filter function: {e}")
-        return values, []  # Return original values and empty coefficients
+        return np.array(values, dtype=np.float32), []  # Return a copy of the original values and empty coefficients
 
 
-def live_plot(raw_values, filtered_values, interval_ms, label="ADC Data"):
-    """Animate raw data, FIR-filtered data, and FFT spectrum dynamically"""
-    norm_raw = normalize(raw_values)
-    norm_filtered = normalize(filtered_values)
+def live_plot(raw_weights, filtered_weights, interval_ms, label="ADC Data"):
+    """
+    Animate raw data, FIR-filtered data, and FFT spectrum dynamically.
+    A Matplotlib animation timer adds PLOT_STRIDE samples per frame, and only the three lines
+    are redrawn over a cached background (blitting) instead of drawing the whole figure.
 
-    plt.ion()
+    Args:
+        raw_weights (np.ndarray): Normalized raw weights from process_data.
+        filtered_weights (np.ndarray): Normalized FIR-filtered weights from process_data.
+        interval_ms (int): The sampling interval in milliseconds.
+        label (str): Name shown in the plot titles.
+    """
     fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(10, 8), sharex=False)
     fig.subplots_adjust(hspace=0.5)
 
@@ -97,8 +246,8 @@ def live_plot(raw_values, filtered_values, interval_ms, label="ADC Data"):
     ax1.set_title(f"Raw ADC Data - {label}")
     ax1.set_xlabel("Sample Index")
     ax1.set_ylabel("Weights")
-    ax1.set_xlim(0, max(100, len(norm_raw)))
-    ax1.set_ylim(min(norm_raw), max(norm_raw))
+    ax1.set_xlim(0, max(100, len(raw_weights)))
+    ax1.set_ylim(np.min(raw_weights), np.max(raw_weights))
     ax1.grid(True)
     raw_line, = ax1.plot([], [], color='red', label="Raw Data")
     ax1.legend()
@@ -107,82 +256,87 @@ def live_plot(raw_values, filtered_values, interval_ms, label="ADC Data"):
     ax2.set_title(f"FIR-Filtered ADC Data - {label}")
     ax2.set_xlabel("Sample Index")
     ax2.set_ylabel("Weights")
-    ax2.set_xlim(0, max(100, len(norm_filtered)))
-    ax2.set_ylim(min(norm_filtered), max(norm_filtered))
+    ax2.set_xlim(0, max(100, len(filtered_weights)))
+    ax2.set_ylim(np.min(filtered_weights), np.max(filtered_weights))
     ax2.grid(True)
     filtered_line, = ax2.plot([], [], color='black', label="FIR-Filtered Data")
     ax2.legend()
 
     # Frequency-domain plot (FFT)
+    # The timer plays samples back at the nominal rate, and blitting needs fixed axes, so the
+    # limits are set once: up to Nyquist, and up to the largest magnitude a window can reach
+    window_size = FFT_WINDOW_SIZE
+    sampling_rate = 1000 / interval_ms
+    peak_magnitude = np.max(np.abs(filtered_weights)) * np.sum(_hanning(max(2, min(window_size, len(filtered_weights)))))
     ax3.set_title(f"FFT Spectrum - {label}")
     ax3.set_xlabel("Frequency (Hz)")
     ax3.set_ylabel("Magnitude")
+    ax3.set_xlim(0, sampling_rate / 2)
+    ax3.set_ylim(0, peak_magnitude * 1.2 or 1.0)
     ax3.grid(True)
     fft_line, = ax3.plot([], [], color='blue', label="FFT Spectrum")
     ax3.legend()
 
-    x_data, raw_y_data, filtered_y_data = [], [], []
-    fft_x_data, fft_y_data = [], []
-    start_time = time.time()
-    window_size = 128
-    raw_buffer = deque(maxlen=1000)
-    filtered_buffer = deque(maxlen=1000)
-
-    for i in range(len(filtered_values)):
-        x_data.append(i)
-        raw_buffer.append(norm_raw[i + len(norm_raw) - len(filtered_values)])
-        filtered_buffer.append(norm_filtered[i])
-        raw_y_data = list(raw_buffer)
-        filtered_y_data = list(filtered_buffer)
-
-        raw_line.set_data(x_data, raw_y_data)
-        filtered_line.set_data(x_data, filtered_y_data)
-        ax1.set_xlim(0, max(100, i + 10))
-        ax2.set_xlim(0, max(100, i + 10))
-
-        elapsed_time = time.time() - start_time
-        actual_sampling_rate = len(filtered_y_data) / elapsed_time if elapsed_time > 0 else 1000 / interval_ms
-
-        fft_frequencies, fft_magnitude, cut_off_frequency = compute_fft(filtered_y_data[-window_size:],
-                                                                        actual_sampling_rate)
-        fft_x_data = fft_frequencies
-        fft_y_data = fft_magnitude
-        fft_line.set_data(fft_x_data, fft_y_data)
-        if len(fft_frequencies) > 0:
-            ax3.set_xlim(0, max(fft_frequencies))
-        if len(fft_magnitude) > 0:
-            ax3.set_ylim(0, max(fft_magnitude) * 1.2)
-        fig.canvas.draw()
-        fig.canvas.flush_events()
-        time.sleep(interval_ms / 1000.0)
-    plt.ioff()
-    plt.tight_layout()
-    plt.show()
+    fft_cache = OrderedDict()
+    fft_refresh = window_size // 4  # A quarter-window of new samples changes the spectrum visibly
+    fft_end = 0  # Frame end the shown spectrum was computed at
+    sample_count = len(filtered_weights)
+    raw_offset = len(raw_weights) - sample_count
+    # Each frame shows samples [0, end); redraw every PLOT_STRIDE samples and on the last one
+    frame_ends = list(range(1, sample_count + 1, PLOT_STRIDE))
+    if frame_ends[-1] != sample_count:
+        frame_ends.append(sample_count)
+
+    def update(end):
+        nonlocal fft_end
+        start = max(0, end - PLOT_HISTORY)  # Views into the weight arrays, nothing is copied
+        x_data = np.arange(start, end)
+        raw_line.set_data(x_data, raw_weights[start + raw_offset:end + raw_offset])
+        filtered_line.set_data(x_data, filtered_weights[start:end])
+
+        if end - fft_end >= fft_refresh or end == sample_count:  # Otherwise keep the last spectrum
+            fft_frequencies, fft_magnitude, cut_off_frequency = compute_fft(filtered_weights[max(0, end - window_size):end],
+                                                                            sampling_rate, fft_cache)
+            fft_line.set_data(fft_frequencies, fft_magnitude)
+            fft_end = end
+
+        if end == sample_count:
+            for line in (raw_line, filtered_line, fft_line):
+                line.set_animated(False)  # Let the final static figure draw the lines normally
+            fig.canvas.draw_idle()
+        return raw_line, filtered_line, fft_line
+
+    animation = FuncAnimation(fig, update, frames=frame_ends, interval=interval_ms * PLOT_STRIDE,
+                              blit=True, repeat=False, cache_frame_data=False)
+    plt.show()  # Runs the GUI event loop, which drives the animation, until the window is closed
+    return animation
 
 
 
 def write_data_to_file(file_name, raw_weights, filtered_weights, fir_coefficients, fft_frequencies, fft_magnitude):
     """
-    Writes all data to a text file.  Handles potential errors.
+    Writes all data to a compressed NumPy archive (.npz).  Handles potential errors.
+    Arrays are stored as float32, which is plenty for plotting and halves the file size;
+    load them back with np.load(path)["raw"], ["filt"], ["fir"], ["freqs"] and ["mag"].
 
     Args:
         file_name (str): The name of the file.
-        raw_weights (list): List of raw weight values.
-        filtered_weights (list): List of filtered weight values.
-        fir_coefficients (list): List of FIR filter coefficients.
-        fft_frequencies (list): List of FFT frequencies.
-        fft_magnitude (list): List of FFT magnitudes.
+        raw_weights (np.ndarray): Raw weight values.
+        filtered_weights (np.ndarray): Filtered weight values.
+        fir_coefficients (np.ndarray): FIR filter coefficients.
+        fft_frequencies (np.ndarray): FFT frequencies.
+        fft_magnitude (np.ndarray): FFT magnitudes.
     """
     try:
         if not os.path.exists("output_data"):
             os.makedirs("output_data")
-        filepath = os.path.join("output_data", f"all_data_{file_name}.txt")
-        with open(filepath, "w") as f:
-            f.write(f"Raw Weights:\n{raw_weights}\n\n")
-            f.write(f"Filtered Weights:\n{filtered_weights}\n\n")
-            f.write(f"FIR Coefficients:\n{fir_coefficients}\n\n")
-            f.write(f"FFT Frequencies:\n{fft_frequencies}\n\n")
-            f.write(f"FFT Magnitudes:\n{fft_magnitude}\n\n")
+        filepath = os.path.join("output_data", f"all_data_{file_name}.npz")
+        np.savez_compressed(filepath,
+                            raw=np.asarray(raw_weights, dtype=np.float32),
+                            filt=np.asarray(filtered_weights, dtype=np.float32),
+                            fir=np.asarray(fir_coefficients, dtype=np.float32),
+                            freqs=np.asarray(fft_frequencies, dtype=np.float32),
+                            mag=np.asarray(fft_magnitude, dtype=np.float32))
         print(f"[CLIENT] Successfully wrote data to {filepath}")
     except Exception as e:
         print(f"[CLIENT] Error writing to file: {e}")
@@ -194,22 +348,30 @@ def process_data(raw_values, interval_ms, file_name):
     Process the raw data, including normalization, filtering, and FFT.
 
     Args:
-        raw_values (list): List of raw ADC values.
+        raw_values (np.ndarray): Raw ADC values.
         interval_ms (int): The sampling interval in milliseconds.
         file_name (str): The name of the data file.
+
+    Returns:
+        tuple or None: (raw_weights, filtered_weights, interval_ms, file_name) for live_plot, or None
+        if there is nothing to plot. Runs in a worker process, so plotting is left to the main process.
     """
     try:
         if len(raw_values) > 0:
             print(f"[CLIENT] Processing data for {file_name}")
-            raw_values = remove_dc_offset(np.array(raw_values))
-            fft_frequencies, fft_magnitude, cut_off_frequency = compute_fft(raw_values, 1000 / interval_ms)
-            filtered_values, fir_coefficients = fir_filter(raw_values, cut_off_frequency, 1000 / interval_ms)
-            normalized_raw_values = normalize(raw_values)
-            normalized_filtered_values = normalize(filtered_values)
-
-            # Calculate weights
-            raw_weights = [(float(val) / float(0x80000000) - ZERO_CAL) / SCALE_CAL for val in raw_values]
-            filtered_weights = [(float(val) / float(0x80000000) - ZERO_CAL) / SCALE_CAL for val in filtered_values]
+            # One float32 copy of the samples; DC removal and normalization then work in place on it.
+            # The integer mean is taken off before the cast, so float32 keeps the small variations
+            # instead of spending its precision on the ~2**31 offset
+            raw_values = np.asarray(raw_values)
+            samples = (raw_values - np.int64(np.mean(raw_values))).astype(np.float32)
+            remove_dc_offset(samples, out=samples)
+            sampling_rate = 1000 / interval_ms
+            fft_frequencies, fft_magnitude, cut_off_frequency = compute_fft(samples, sampling_rate)
+            filtered_values, fir_coefficients = fir_filter(samples, cut_off_frequency, sampling_rate)
+
+            # Calculate weights (the FFT and filter are done with the unscaled data)
+            raw_weights = normalize(samples, out=samples)
+            filtered_weights = normalize(filtered_values, out=filtered_values)
 
             # Print first 5 values for debugging
             print(f"[CLIENT] Raw Weights (first 5): {raw_weights[:5]}")
@@ -219,38 +381,76 @@ def process_data(raw_values, interval_ms, file_name):
             print(f"[CLIENT] FFT Magnitudes (first 5): {fft_magnitude[:5]}")
 
             write_data_to_file(file_name, raw_weights, filtered_weights, fir_coefficients, fft_frequencies, fft_magnitude)
-            live_plot(normalized_raw_values, normalized_filtered_values, interval_ms, label=file_name)
+            return raw_weights, filtered_weights, interval_ms, file_name
         else:
             print(f"[CLIENT] No data to process for {file_name}")
     except Exception as e:
         print(f"[CLIENT] Error processing data: {e}")
+    return None
 
 
 
-def receive_and_plot():
+def receive_data(executor, pending_results):
     """
-    Receives data from the server, processes it, and displays it.
-    Handles data reception, parsing, and calls processing functions.
+    Receives data from the server and hands each file to the process pool.
+    Runs on a background thread; the main thread plots the results.
+
+    Args:
+        executor (concurrent.futures.Executor): Pool that runs process_data.
+        pending_results (queue.Queue): Receives one future per file, then None once the connection ends.
     """
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     try:
         s.connect((SERVER_IP, SERVER_PORT))
         print("[CLIENT] Connected to server.")
-        buffer = b''
+        buffer = bytearray(BUFFER_SIZE)  # Reused for the whole session
+        start = 0  # Unconsumed bytes are buffer[start:used]
+        used = 0
         interval_ms = 20
         mode = "interval"
         file_name = ""
 
-        while True:
-            data = s.recv(BUFFER_SIZE)
-            if not data:
-                break
-            buffer += data
-
-            while SEPARATOR in buffer:
-                sep_idx = buffer.index(SEPARATOR)
-                header = buffer[:sep_idx].decode(errors='ignore')
-                buffer = buffer[sep_idx + len(SEPARATOR):]
+        def compact():
+            """Moves the unconsumed bytes to the front of buffer."""
+            nonlocal start, used
+            buffer[:used - start] = buffer[start:used]
+            used -= start
+            start = 0
+
+        def receive_more():
+            """
+            Receives straight into the free tail of buffer, reclaiming consumed space or growing it
+            when full. Returns 0 on EOF. May compact, so callers keep offsets relative to start.
+            """
+            nonlocal used
+            if used == len(buffer):
+                if start:
+                    compact()
+                else:
+                    buffer.extend(bytes(len(buffer)))
+            with memoryview(buffer) as view:
+                received = s.recv_into(view[used:])
+            used += received
+            return received
+
+        def consume(end):
+            """
+            Drops the bytes before offset end by advancing start. The remainder is only moved to the
+            front once COMPACT_THRESHOLD bytes are consumed, so each byte is moved at most a few times.
+            """
+            nonlocal start, used
+            start = end
+            if start == used:
+                start = used = 0  # Nothing left to keep, so nothing to move
+            elif start > COMPACT_THRESHOLD:
+                compact()
+
+        scanned = 0  # Unconsumed bytes already searched for a separator
+        while receive_more():
+            sep_idx = buffer.find(SEPARATOR, start + scanned, used)
+            while sep_idx >= 0:
+                header = buffer[start:sep_idx].decode(errors='ignore')
+                consume(sep_idx + len(SEPARATOR))
 
                 if "INTERVAL:" in header:
                     interval_ms = int(header.split(":")[1])
@@ -261,35 +461,27 @@ def receive_and_plot():
                 elif header:
                     file_name = header
                     print(f"[CLIENT] Received file header: {file_name}")
-                    file_content = b''
                     print(f"[CLIENT] Receiving file content for {file_name}")
-                    while True:
-                        next_part = s.recv(BUFFER_SIZE)
-                        if not next_part:
+                    # Content runs to the next separator or the end of the stream. Bytes that arrived in
+                    # the same recv as the header are part of it; only newly received bytes are rescanned.
+                    content_end = buffer.find(SEPARATOR, start, used)
+                    while content_end < 0:
+                        scanned = max(0, used - start - len(SEPARATOR) + 1)
+                        if not receive_more():
+                            content_end = used
                             break
-                        if SEPARATOR in next_part:
-                            next_sep = next_part.index(SEPARATOR)
-                            file_content += next_part[:next_sep]
-                            buffer = next_part[next_sep:]
-                            break
-                        else:
-                            file_content += next_part
-                    print(f"[CLIENT] Received file content. Length: {len(file_content)}")
-                    lines = file_content.decode(errors='ignore').splitlines()
-                    raw_values = []
-                    for line in lines:
-                        if 'ADC:' in line:
-                            try:
-                                adc = int(line.strip().split("ADC:")[-1])
-                                raw_values.append(adc)
-                            except ValueError:
-                                print(f"[CLIENT] Warning: Invalid ADC value in line: {line}")
-                                # Handle the error, e.g., skip this value or use a default
-                                pass
-                    if raw_values:
-                        threading.Thread(target=process_data, args=(raw_values, interval_ms, file_name)).start()
+                        content_end = buffer.find(SEPARATOR, start + scanned, used)
+                    print(f"[CLIENT] Received file content. Length: {content_end - start}")
+                    # Scan the raw bytes once instead of decoding and splitting into per-line strings
+                    raw_values = parse_adc_values(buffer, start, content_end)
+                    consume(content_end)  # The separator stays and is read as an empty header next
+                    if raw_values.size:
+                        # Numeric work runs in another process so it is not serialized with receiving by the GIL
+                        pending_results.put(executor.submit(process_data, raw_values, interval_ms, file_name))
                     else:
                         print(f"[CLIENT] No ADC values found in file content.")
+                sep_idx = buffer.find(SEPARATOR, start, used)
+            scanned = max(0, used - start - len(SEPARATOR) + 1)
 
     except ConnectionResetError:
         print("[CLIENT] Error: Connection with server was reset.")
@@ -300,6 +492,30 @@ def receive_and_plot():
     finally:
         s.close()
         print("[CLIENT] Connection closed.")
+        pending_results.put(None)
+
+
+def receive_and_plot():
+    """
+    Receives data from the server, processes it, and displays it.
+    Files are received on a background thread and processed in a process pool; Matplotlib
+    objects cannot cross process boundaries, so the plots are drawn here on the main thread.
+    """
+    pending_results = queue.Queue()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        threading.Thread(target=receive_data, args=(executor, pending_results), daemon=True).start()
+        while True:
+            future = pending_results.get()
+            if future is None:
+                break
+            try:
+                plot_args = future.result()  # Results are plotted in the order the files arrived
+            except Exception as e:  # e.g. a worker process died
+                print(f"[CLIENT] Error processing data: {e}")
+                continue
+            if plot_args:
+                raw_weights, filtered_weights, interval_ms, file_name = plot_args
+                live_plot(raw_weights, filtered_weights, interval_ms, label=file_name)
 
 
 
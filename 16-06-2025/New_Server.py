@@ -366,14 +366,16 @@ class LoadCellServerApp:
             interval_ms (int): interval in milliseconds
         """
         try:
-            with open(filepath, "rb") as file:
-                file_data = file.read()
             filename_header = os.path.basename(filepath).encode() + SEPARATOR
             print(f"[SERVER] Sending header: {filename_header}")
-            connection.sendall(filename_header + file_data)
+            with open(filepath, "rb") as file:
+                connection.sendall(filename_header)
+                # Kernel copies the file straight to the socket (os.sendfile); socket.sendfile falls
+                # back to read/send by itself where that is unavailable, e.g. on Windows
+                connection.sendfile(file)
         except Exception as error:
             print(f"[SERVER] Error in _send_file: {error}")
-            self.status_label.config(f"Error sending file : {error}")
+            self.status_label.config(text=f"Error sending file : {error}")
 
 
 
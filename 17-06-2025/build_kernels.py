@@ -0,0 +1,22 @@
+# Builds loadcell_kernels, an ahead-of-time compiled copy of the client's Numba kernels, next to this file.
+# client.py imports it when present, so runs skip the JIT warm-up. Rebuild after changing the kernels:
+#     python build_kernels.py
+import os
+from numba.pycc import CC
+
+from client import _parse_adc_numba, _normalize_numba
+
+cc = CC('loadcell_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+@cc.export('parse_adc', 'i8(u1[:], i8[:])')
+def parse_adc(data, out):
+    return _parse_adc_numba(data, out)
+
+@cc.export('normalize_weights', 'void(i8[:], f8[:])')
+def normalize_weights(adc_values, out):
+    _normalize_numba(adc_values, out)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"[BUILD] Wrote loadcell_kernels to {cc.output_dir}")
@@ -2,26 +2,57 @@ import socket
 import threading
 import time
 import os
-from collections import deque
+import re
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import matplotlib.pyplot as plt
 import numpy as np
-from scipy.signal import firwin, lfilter
+from scipy.signal import firwin, oaconvolve
+import scipy.fft
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # ======================= Configuration =======================
 SERVER_IP = '127.0.0.1'
 SERVER_PORT = 9999
+SOCKET_BUFFER_BYTES = 4 << 20  # Kernel receive buffer; the kernel may cap it (net.core.rmem_max)
 
 FILENAME_LENGTH_BYTES = 4
 FILE_CONTENT_LENGTH_BYTES = 8
 CONFIG_LENGTH_BYTES = 4
+CONTENT_FORMAT_BYTES = 1
+INTERVAL_PATTERN = re.compile(rb'INTERVAL:(\d+)')
+FORMAT_TEXT = 0   # content is the "ADC:<value>" text file
+FORMAT_INT32 = 1  # content is the ADC values as big-endian int32
 
 # Calibration constants
 ZERO_CAL = 0.01823035255075
 SCALE_CAL = 0.00000451794631
+# (v / 2**31 - ZERO_CAL) / SCALE_CAL folded into one multiply and one subtract
+WEIGHT_GAIN = 1.0 / (SCALE_CAL * float(0x80000000))
+WEIGHT_OFFSET = ZERO_CAL / SCALE_CAL
 
 # Buffer length for live plotting
 BUFFER_SIZE = 100
 
+# Processed files waiting for the writer thread; when full the receiver waits rather than dropping data
+WRITE_QUEUE_SIZE = 16
+
+# Live plot redraws are capped at about 30 per second
+REDRAW_PERIOD_S = 1 / 30
+# Y limits are kept while they hold the data and exceed its range by at most this fraction per side
+LIMIT_TOLERANCE = 0.05
+
+# FIR low-pass filter
+FIR_NUMTAPS = 51
+FIR_CUTOFF_STEP_HZ = 0.5  # Cutoffs are rounded to this step so each design is built once
+FFT_FILTER_MIN_WORK = 1_000_000  # samples x taps above which the filter uses overlap-add FFT convolution
+
 # Flags
 stop_receiving_data = False
 
@@ -36,39 +67,178 @@ def recvall(sock, n):
         data += packet
     return data
 
+class RingF64:
+    # The last `size` float64 samples. Each sample is stored twice, at i and i + size, so the
+    # window is always the contiguous view data[head:head + size], oldest sample first
+    def __init__(self, size):
+        self.size = size
+        self.data = np.zeros(2 * size)
+        self.head = 0  # Oldest sample, overwritten next
+
+    def push(self, x):
+        self.data[self.head] = x
+        self.data[self.head + self.size] = x
+        self.head = (self.head + 1) % self.size
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)[-self.size:]  # Anything older would be overwritten
+        first = min(len(values), self.size - self.head)
+        rest = len(values) - first
+        for offset in (0, self.size):
+            self.data[offset + self.head:offset + self.head + first] = values[:first]
+            self.data[offset:offset + rest] = values[first:]
+        self.head = (self.head + len(values)) % self.size
+
+    def snapshot(self):
+        # A view, so it changes with the next push; copy it to keep it
+        return self.data[self.head:self.head + self.size]
+
+def recvall_into(sock, buffer, n):
+    # Fills buffer[:n] straight from the socket, without building a bytes object per packet
+    received = 0
+    with memoryview(buffer) as view:
+        while received < n:
+            count = sock.recv_into(view[received:n])
+            if not count:
+                return False
+            received += count
+    return True
+
+if NUMBA_AVAILABLE:
+    # nogil lets the parsing overlap with Matplotlib work on other threads;
+    # cache=True keeps the compiled code on disk so later runs skip the JIT
+    @njit(cache=True, nogil=True)
+    def _parse_adc_numba(data, out):
+        # Scans bytes for "ADC:<integer>" and writes each integer to out; returns how many were found
+        count = 0
+        i = 0
+        n = data.shape[0]
+        while i + 4 < n:
+            if data[i] == 65 and data[i + 1] == 68 and data[i + 2] == 67 and data[i + 3] == 58:  # b"ADC:"
+                i += 4
+                while i < n and (data[i] == 32 or data[i] == 9):  # Spaces or tabs after the colon
+                    i += 1
+                negative = i < n and data[i] == 45  # b"-"
+                if negative:
+                    i += 1
+                start = i
+                value = 0
+                while i < n and 48 <= data[i] <= 57:  # Accumulate decimal digits
+                    value = value * 10 + (data[i] - 48)
+                    i += 1
+                if i > start:
+                    out[count] = -value if negative else value
+                    count += 1
+            else:
+                i += 1
+        return count
+
+    @njit(cache=True, nogil=True)
+    def _normalize_numba(adc_values, out):
+        for i in range(adc_values.shape[0]):
+            out[i] = adc_values[i] * WEIGHT_GAIN - WEIGHT_OFFSET
+
+# Ahead-of-time build of the kernels above (python build_kernels.py): the same machine code,
+# without the JIT compile on the first call of every run
+try:
+    from loadcell_kernels import parse_adc as _parse_adc_kernel, normalize_weights as _normalize_kernel
+    KERNELS_AVAILABLE = True
+except ImportError:
+    KERNELS_AVAILABLE = NUMBA_AVAILABLE
+    if NUMBA_AVAILABLE:
+        _parse_adc_kernel, _normalize_kernel = _parse_adc_numba, _normalize_numba
+    else:
+        print("[CLIENT] Numba not found, ADC parsing falls back to Python. Install it with 'pip install numba'")
+
+def parse_adc_buffer(content, length):
+    # content[:length] is the raw file bytes; returns the ADC values as an int64 array
+    if KERNELS_AVAILABLE:
+        out = np.empty(length // 5 + 1, dtype=np.int64)  # Each value needs at least the 5 bytes of "ADC:0"
+        count = _parse_adc_kernel(np.frombuffer(content, dtype=np.uint8, count=length), out)
+        return out[:count]
+    adc_values = []
+    for line in content[:length].decode(errors='ignore').splitlines():
+        if 'ADC:' in line:
+            try:
+                adc_values.append(int(line.split("ADC:")[-1]))
+            except ValueError:
+                pass
+    return np.array(adc_values, dtype=np.int64)
+
 def normalize(adc_values):
-    weights = []
-    for v in adc_values:
-        data_in = float(v) / float(0x80000000)
-        weights.append((data_in - ZERO_CAL) / SCALE_CAL)
+    # Any integer array, including the big-endian int32 view of a binary frame
+    adc_values = np.asarray(adc_values)
+    if KERNELS_AVAILABLE and adc_values.dtype == np.int64:
+        weights = np.empty(adc_values.shape[0])
+        _normalize_kernel(adc_values, weights)  # One pass over memory
+        return weights
+    weights = np.multiply(adc_values, WEIGHT_GAIN, dtype=np.float64)  # Converts while multiplying, no integer copy
+    weights -= WEIGHT_OFFSET
     return weights
 
 # ================================= Data Processing =================================
 
+# Window and bin frequencies are built once per length and shared, so they are read-only
+@lru_cache(maxsize=8)
+def _hann(N):
+    window = np.hanning(N)
+    window.setflags(write=False)
+    return window
+
+@lru_cache(maxsize=8)
+def _rfreqs(N, sampling_rate):
+    freqs = scipy.fft.rfftfreq(N, d=1/sampling_rate)
+    freqs.setflags(write=False)
+    return freqs
+
 def compute_fft(values, sampling_rate):
     N = len(values)
     if N < 2:
         return np.array([]), np.array([]), 0
-    windowed = values * np.hanning(N)
-    fft_res = np.fft.fft(windowed)
-    fft_mag = np.abs(fft_res[:N // 2])
-    freqs = np.fft.fftfreq(N, d=1/sampling_rate)[:N // 2]
+    windowed = values * _hann(N)
+    fft_res = scipy.fft.rfft(windowed, workers=-1)  # One-sided spectrum of the real signal
+    fft_mag = np.abs(fft_res)
+    freqs = _rfreqs(N, sampling_rate)
     dominant_idx = np.argmax(fft_mag) if fft_mag.size else 0
     cutoff = freqs[dominant_idx] if freqs.size else 0
     return freqs, fft_mag, cutoff
 
-def apply_fir_filter(values, cutoff_frequency, sampling_rate):
+def design_fir_filter(cutoff_frequency, sampling_rate):
+    return _firwin_cached(round(cutoff_frequency / FIR_CUTOFF_STEP_HZ), sampling_rate)
+
+# Shared between calls, so the coefficients are read-only
+@lru_cache(maxsize=64)
+def _firwin_cached(cutoff_steps, sampling_rate):
+    cutoff_frequency = cutoff_steps * FIR_CUTOFF_STEP_HZ
     nyquist = sampling_rate / 2
     if cutoff_frequency <= 0 or cutoff_frequency >= nyquist:
-        return values, []
-    normalized_cutoff = cutoff_frequency / nyquist
-    coeffs = firwin(numtaps=51, cutoff=normalized_cutoff, window='hamming')
-    filtered = lfilter(coeffs, 1.0, values)
-    return filtered, coeffs
-
-# Save to text file
-def write_data_to_file(file_name, raw_w, filt_w, fir_coeffs, freqs, fft_mag):
+        coeffs = np.array([])
+    else:
+        normalized_cutoff = cutoff_frequency / nyquist
+        coeffs = firwin(numtaps=FIR_NUMTAPS, cutoff=normalized_cutoff, window='hamming')
+    coeffs.setflags(write=False)
+    return coeffs
+
+def apply_fir_filter(values, coeffs, history):
+    # history holds the FIR_NUMTAPS - 1 inputs before values, so filtering them together continues
+    # the filter across packets; lfilter's zi state would be tied to the previous coefficients.
+    # The 'valid' part of the convolution is exactly the outputs for values
+    if len(coeffs) == 0:
+        return values
+    extended = np.concatenate((history, values))
+    if len(extended) * len(coeffs) > FFT_FILTER_MIN_WORK:
+        return oaconvolve(extended, coeffs, mode='valid')
+    return np.convolve(extended, coeffs, mode='valid')
+
+# Save as a compressed NumPy archive; load with np.load(path)["raw"], ["filt"], ["fir"], ["freqs"], ["mag"].
+# dump_text=True also writes the old human-readable text file
+def write_data_to_file(file_name, raw_w, filt_w, fir_coeffs, freqs, fft_mag, dump_text=False):
     os.makedirs("output_data", exist_ok=True)
+    np.savez_compressed(os.path.join("output_data", f"all_data_{file_name}.npz"),
+                        raw=np.asarray(raw_w), filt=np.asarray(filt_w), fir=np.asarray(fir_coeffs),
+                        freqs=np.asarray(freqs), mag=np.asarray(fft_mag))
+    if not dump_text:
+        return
     path = os.path.join("output_data", f"all_data_{file_name}.txt")
     with open(path, "w") as f:
         f.write("Raw Weights:\n")
@@ -82,14 +252,26 @@ def write_data_to_file(file_name, raw_w, filt_w, fir_coeffs, freqs, fft_mag):
         f.write("\n\nFFT Magnitudes:\n")
         f.write(np.array2string(np.array(fft_mag), max_line_width=np.inf))
 
+# Writer thread: saves queued (file_name, raw_w, filt_w, fir_coeffs, freqs, fft_mag) tuples until it gets None
+def data_writer_loop(write_queue):
+    while True:
+        item = write_queue.get()
+        if item is None:
+            break
+        try:
+            write_data_to_file(*item)
+        except Exception as e:
+            print(f"[CLIENT] Error writing data for {item[0]}: {e}")
+
 # ================================= Live Plotting Setup =================================
 
-def init_live_plot():
+def init_live_plot(sampling_rate):
     plt.ion()
     fig, (ax_raw, ax_filt, ax_fft) = plt.subplots(3, 1, figsize=(10, 8))
-    line_raw, = ax_raw.plot([], [], color='red', label="Raw Data")
-    line_filt, = ax_filt.plot([], [], color='black', label="FIR-Filtered Data")
-    line_fft, = ax_fft.plot([], [], color='blue', label="FFT Magnitude")
+    # Animated lines are left out of full draws and blitted over the saved backgrounds
+    line_raw, = ax_raw.plot([], [], color='red', label="Raw Data", animated=True)
+    line_filt, = ax_filt.plot([], [], color='black', label="FIR-Filtered Data", animated=True)
+    line_fft, = ax_fft.plot([], [], color='blue', label="FFT Magnitude", animated=True)
 
     ax_raw.set_title("Raw Weight vs. Time")
     ax_filt.set_title("Filtered Weight vs. Time")
@@ -102,29 +284,57 @@ def init_live_plot():
         ax.legend()
 
     fig.tight_layout()
-    return fig, ax_raw, ax_filt, ax_fft, line_raw, line_filt, line_fft
+    fig.canvas.draw()
+    blit_cache = {
+        "x": np.arange(BUFFER_SIZE) * (1.0 / sampling_rate),  # time axis in seconds, shared by every update
+        "limits": None,  # Axis limits the backgrounds were drawn with
+        "backgrounds": [fig.canvas.copy_from_bbox(ax.bbox) for ax in (ax_raw, ax_filt, ax_fft)],
+    }
+    return fig, ax_raw, ax_filt, ax_fft, line_raw, line_filt, line_fft, blit_cache
 
 # ================================= Plot Loop =================================
 
-def update_live_plot(fig, ax_raw, ax_filt, ax_fft, line_raw, line_filt, line_fft,
+def stable_limits(previous, lo, hi):
+    # Reusing the previous limits keeps the blit backgrounds valid instead of relaying out every update
+    tolerance = LIMIT_TOLERANCE * (hi - lo)
+    if previous is not None and 0 <= lo - previous[0] <= tolerance and 0 <= previous[1] - hi <= tolerance:
+        return previous
+    return (lo, hi)
+
+def update_live_plot(fig, ax_raw, ax_filt, ax_fft, line_raw, line_filt, line_fft, blit_cache,
                      raw_buffer, filt_buffer, fft_freqs, fft_mag, sampling_rate):
+    # raw_buffer and filt_buffer are ring buffer views; set_data takes them without an extra array
     N = len(raw_buffer)
-    x = np.arange(N) * (1.0 / sampling_rate)  # time axis in seconds
+    x = blit_cache["x"] if len(blit_cache["x"]) == N else np.arange(N) * (1.0 / sampling_rate)
 
     line_raw.set_data(x, raw_buffer)
     line_filt.set_data(x, filt_buffer)
-
-    ax_raw.set_xlim(0, x[-1] if N > 1 else 1)
-    ax_raw.set_ylim(min(raw_buffer), max(raw_buffer))
-
-    ax_filt.set_xlim(0, x[-1] if N > 1 else 1)
-    ax_filt.set_ylim(min(filt_buffer), max(filt_buffer))
-
     line_fft.set_data(fft_freqs, fft_mag)
-    ax_fft.set_xlim(0, max(fft_freqs) if fft_freqs.size > 0 else 1)
-    ax_fft.set_ylim(0, max(fft_mag) if fft_mag.size > 0 else 1)
 
-    fig.canvas.draw()
+    axes = (ax_raw, ax_filt, ax_fft)
+    previous = blit_cache["limits"] or (None,) * 6
+    x_limit = (0, x[-1] if N > 1 else 1)
+    # NumPy reductions instead of Python-level min()/max() scans; the FFT bins are sorted
+    limits = (x_limit, stable_limits(previous[1], raw_buffer.min(), raw_buffer.max()),
+              x_limit, stable_limits(previous[3], filt_buffer.min(), filt_buffer.max()),
+              (0, fft_freqs[-1] if fft_freqs.size > 0 else 1),
+              stable_limits(previous[5], 0, fft_mag.max() if fft_mag.size > 0 else 1))
+
+    if limits != blit_cache["limits"]:
+        # Ticks and grids move with the limits, so redraw everything but the lines and save it
+        for ax, xlim, ylim in zip(axes, limits[0::2], limits[1::2]):
+            ax.set_xlim(*xlim)
+            ax.set_ylim(*ylim)
+        fig.canvas.draw()
+        blit_cache["backgrounds"] = [fig.canvas.copy_from_bbox(ax.bbox) for ax in axes]
+        blit_cache["limits"] = limits
+    else:
+        for background in blit_cache["backgrounds"]:
+            fig.canvas.restore_region(background)
+
+    for ax, line in zip(axes, (line_raw, line_filt, line_fft)):
+        ax.draw_artist(line)
+        fig.canvas.blit(ax.bbox)
     fig.canvas.flush_events()
 
 # ================================= Data Receiving Thread =================================
@@ -132,14 +342,12 @@ def update_live_plot(fig, ax_raw, ax_filt, ax_fft, line_raw, line_filt, line_fft
 def receive_and_plot_data_loop():
     global stop_receiving_data
 
-    # Initial buffers
-    raw_buffer = deque(maxlen=BUFFER_SIZE)
-    filt_buffer = deque(maxlen=BUFFER_SIZE)
-    for _ in range(BUFFER_SIZE):
-        raw_buffer.append(0.0)
-        filt_buffer.append(0.0)
+    # Initial buffers, filled with zeros
+    raw_buffer = RingF64(BUFFER_SIZE)
+    filt_buffer = RingF64(BUFFER_SIZE)
 
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_BYTES)  # Before connect, so the window scale covers it
     sock.connect((SERVER_IP, SERVER_PORT))
     sock.settimeout(1.0)
 
@@ -149,21 +357,72 @@ def receive_and_plot_data_loop():
         print("[CLIENT] No config received.")
         return
     cfg_len = int.from_bytes(cfg_len_bytes, 'big')
-    cfg_data = recvall(sock, cfg_len).decode()
-    print(f"[CLIENT] Received config:\n{cfg_data}")
+    cfg_bytes = recvall(sock, cfg_len)
+    print(f"[CLIENT] Received config:\n{cfg_bytes.decode(errors='replace')}")
 
-    interval_ms = 20
-    for line in cfg_data.splitlines():
-        if line.startswith("INTERVAL:"):
-            try:
-                interval_ms = int(line.split(":")[1])
-            except ValueError:
-                pass
+    # Read straight from the bytes instead of splitting the decoded text into lines
+    match = INTERVAL_PATTERN.search(cfg_bytes)
+    interval_ms = int(match.group(1)) if match else 20
 
     sampling_rate = 1000.0 / interval_ms
 
+    # Disk writes happen on their own thread so receiving never waits for them
+    write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    writer = threading.Thread(target=data_writer_loop, args=(write_queue,), daemon=True)
+    writer.start()
+
+    # FIR state carried across packets
+    fir_history = np.zeros(FIR_NUMTAPS - 1)  # Matches the zeros the buffers start with
+
+    content_buffer = bytearray(64 * 1024)  # Reused for every file; replaced by a larger one when needed
+
     # Initialize plot
-    fig, ax_raw, ax_filt, ax_fft, line_raw, line_filt, line_fft = init_live_plot()
+    fig, ax_raw, ax_filt, ax_fft, line_raw, line_filt, line_fft, blit_cache = init_live_plot(sampling_rate)
+    last_draw = 0.0
+    undrawn = None  # Latest plot data skipped by the redraw cap
+
+    def process_packet(weights):
+        # Runs on the compute thread. Only one packet is in flight at a time, so the buffers and
+        # the FIR history are still updated in arrival order
+        nonlocal fir_history
+        raw_buffer.extend(weights)
+
+        # One FFT and one filter pass per packet instead of per sample
+        current_raw = raw_buffer.snapshot()
+        fft_freqs, fft_mag, cutoff = compute_fft(current_raw, sampling_rate)
+        fir_coeffs = design_fir_filter(cutoff, sampling_rate)
+        filtered_values = apply_fir_filter(weights, fir_coeffs, fir_history)
+        fir_history = np.concatenate((fir_history, weights))[-(FIR_NUMTAPS - 1):]
+        filt_buffer.extend(filtered_values)
+
+        # full FIR-buffer for overall plot
+        full_filtered = filt_buffer.snapshot()
+        return current_raw, full_filtered, fft_freqs, fft_mag, fir_coeffs
+
+    def show_packet(fname, result):
+        nonlocal last_draw, undrawn
+        current_raw, full_filtered, fft_freqs, fft_mag, fir_coeffs = result
+
+        # Packets are processed as soon as they arrive; only the redraws are paced
+        now = time.monotonic()
+        if now - last_draw >= REDRAW_PERIOD_S:
+            update_live_plot(fig, ax_raw, ax_filt, ax_fft,
+                             line_raw, line_filt, line_fft, blit_cache,
+                             current_raw,
+                             full_filtered,
+                             fft_freqs, fft_mag,
+                             sampling_rate)
+            last_draw = now
+            undrawn = None
+        else:
+            undrawn = (current_raw, full_filtered, fft_freqs, fft_mag)
+
+        write_queue.put((fname, current_raw.copy(), full_filtered.copy(), fir_coeffs, fft_freqs, fft_mag))
+
+    # Packet N is computed while packet N + 1 is received and parsed; scipy.fft runs with workers=-1
+    # and releases the GIL, as do most of the NumPy kernels
+    compute_pool = ThreadPoolExecutor(max_workers=1)
+    pending = None  # (fname, future) of the packet being computed
 
     while not stop_receiving_data:
         filename_len_bytes = recvall(sock, FILENAME_LENGTH_BYTES)
@@ -171,12 +430,18 @@ def receive_and_plot_data_loop():
             break
         fname_len = int.from_bytes(filename_len_bytes, 'big')
         fname = recvall(sock, fname_len).decode()
+        content_format = recvall(sock, CONTENT_FORMAT_BYTES)
+        if not content_format:
+            break
 
         content_len_bytes = recvall(sock, FILE_CONTENT_LENGTH_BYTES)
         if not content_len_bytes:
             break
         content_len = int.from_bytes(content_len_bytes, 'big')
-        content_data = recvall(sock, content_len).decode(errors='ignore')
+        if content_len > len(content_buffer):
+            content_buffer = bytearray(content_len)
+        if not recvall_into(sock, content_buffer, content_len):
+            break
 
         if fname.startswith("NO_FILE"):
             print(f"[CLIENT] Server message: {fname}")
@@ -185,45 +450,31 @@ def receive_and_plot_data_loop():
             print("[CLIENT] End of transmission.")
             break
 
-        adc_values = []
-        for line in content_data.splitlines():
-            if 'ADC:' in line:
-                try:
-                    adc_values.append(int(line.split("ADC:")[-1]))
-                except ValueError:
-                    pass
+        if content_format[0] == FORMAT_INT32:
+            adc_values = np.frombuffer(content_buffer, dtype='>i4', count=content_len // 4)  # A view, no copy
+        else:
+            adc_values = parse_adc_buffer(content_buffer, content_len)
 
-        if not adc_values:
+        if adc_values.size == 0:
             continue
 
-        samples = len(adc_values)
-        for i, adc in enumerate(adc_values):
-            weight = (adc / float(0x80000000) - ZERO_CAL) / SCALE_CAL
-            raw_buffer.append(weight)
-
-            # running buffer to apply filter & FFT
-            current_raw = np.array(raw_buffer)
-            freqs, mag, cutoff = compute_fft(current_raw, sampling_rate)
-            filtered_values, fir_coeffs = apply_fir_filter(current_raw, cutoff, sampling_rate)
-            filt_buffer.append(filtered_values[-1])
-
-            # full FIR-buffer for overall plot
-            full_filtered = np.array(filt_buffer)
-            fft_freqs = freqs
-            fft_mag = mag
-
-            update_live_plot(fig, ax_raw, ax_filt, ax_fft,
-                             line_raw, line_filt, line_fft,
-                             np.array(raw_buffer),
-                             full_filtered,
-                             fft_freqs, fft_mag,
-                             sampling_rate)
+        if pending is not None:
+            show_packet(pending[0], pending[1].result())
+        # One vectorized pass from ADC counts to weights. Done here because adc_values may be a view
+        # of content_buffer, which the next packet overwrites
+        weights = normalize(adc_values)
+        pending = (fname, compute_pool.submit(process_packet, weights))
 
-            time.sleep(interval_ms / 1000.0)
+    if pending is not None:
+        show_packet(pending[0], pending[1].result())
+    compute_pool.shutdown()
 
-        write_data_to_file(fname, list(raw_buffer), list(filt_buffer), fir_coeffs.tolist(), fft_freqs, fft_mag)
+    if undrawn is not None:  # Show the final state
+        update_live_plot(fig, ax_raw, ax_filt, ax_fft, line_raw, line_filt, line_fft, blit_cache, *undrawn, sampling_rate)
 
     sock.close()
+    write_queue.put(None)
+    writer.join()  # Finish pending writes before the main thread is allowed to exit
     stop_receiving_data = True
     print("[CLIENT] Receiver thread ending, closing.")
 
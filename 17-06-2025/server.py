@@ -1,6 +1,7 @@
 import socket
 import threading
 import os
+import re
 import time
 import tkinter as tk
 from tkinter import ttk, filedialog
@@ -11,9 +12,14 @@ SERVER_IP = '0.0.0.0'
 SERVER_PORT = 9999
 DATA_FOLDER = "adc_data"
 BUFFER_SIZE = 4096
+SOCKET_BUFFER_BYTES = 4 << 20  # Kernel send buffer; the kernel may cap it (net.core.wmem_max)
 FILENAME_LENGTH_BYTES = 4
 FILE_CONTENT_LENGTH_BYTES = 8
 CONFIG_LENGTH_BYTES = 4
+CONTENT_FORMAT_BYTES = 1
+FORMAT_TEXT = 0   # content is the "ADC:<value>" text file
+FORMAT_INT32 = 1  # content is the ADC values as big-endian int32
+ADC_PATTERN = re.compile(rb'ADC:\s*(-?\d+)')
 
 def create_sample_data():
     if not os.path.exists(DATA_FOLDER):
@@ -32,6 +38,27 @@ def create_sample_data():
             for _ in range(100):
                 f.write(f"ADC:{int(np.random.rand()*0x80000000)}\n")
 
+# Text file path -> ((mtime_ns, size) it was built from, int32 payload or None)
+_binary_cache = {}
+
+def get_binary_copy(filepath):
+    # The file's ADC values as big-endian int32 bytes, kept in memory and rebuilt when the text changes.
+    # Nothing is written next to the user's data. Returns None if the values do not fit in int32; send the text then
+    st = os.stat(filepath)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _binary_cache.get(filepath)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    with open(filepath, "rb") as f:
+        values = np.fromiter(map(int, ADC_PATTERN.findall(f.read())), dtype=np.int64)
+    info = np.iinfo(np.int32)
+    if values.size and (values.min() < info.min or values.max() > info.max):
+        payload = None
+    else:
+        payload = values.astype('>i4').tobytes()
+    _binary_cache[filepath] = (stamp, payload)
+    return payload
+
 class LoadCellServerApp:
     def __init__(self, root):
         self.root = root
@@ -175,6 +202,10 @@ class LoadCellServerApp:
         try:
             self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, "SO_REUSEPORT"):  # Not on Windows
+                self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            # Set before listen so accepted connections inherit it
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_BYTES)
             self.server_socket.bind((SERVER_IP, SERVER_PORT))
             self.server_socket.listen(1)
             self.server_socket.settimeout(1)
@@ -182,6 +213,8 @@ class LoadCellServerApp:
             while self.is_sending:
                 try:
                     self.connection, addr = self.server_socket.accept()
+                    # Frames are written whole, so Nagle would only hold back the last segment
+                    self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                     break
                 except socket.timeout:
                     continue
@@ -226,7 +259,7 @@ class LoadCellServerApp:
         matched = [f for f in files if f"hz{freq}" in f]
         if not matched:
             msg = f"NO_FILE_FOUND:{freq}".encode()
-            self.connection.sendall(len(msg).to_bytes(FILENAME_LENGTH_BYTES,'big')+msg+
+            self.connection.sendall(len(msg).to_bytes(FILENAME_LENGTH_BYTES,'big')+msg+bytes([FORMAT_TEXT])+
                                     (0).to_bytes(FILE_CONTENT_LENGTH_BYTES,'big'))
         else:
             self._send_file(self.connection, os.path.join(DATA_FOLDER,matched[0]))
@@ -235,22 +268,34 @@ class LoadCellServerApp:
     def _send_selected_file(self):
         if not self.selected_file:
             msg = b"NO_FILE_SELECTED"
-            self.connection.sendall(len(msg).to_bytes(FILENAME_LENGTH_BYTES,'big')+msg+
+            self.connection.sendall(len(msg).to_bytes(FILENAME_LENGTH_BYTES,'big')+msg+bytes([FORMAT_TEXT])+
                                     (0).to_bytes(FILE_CONTENT_LENGTH_BYTES,'big'))
         else:
             self._send_file(self.connection, self.selected_file)
             self._send_file(self.connection, None)
 
     def _send_file(self, conn, filepath):
+        fmt = FORMAT_TEXT
+        payload = None
         if filepath is None:
-            fn = "END_OF_TRANSMISSION".encode('utf-8'); data = b""
+            fn = "END_OF_TRANSMISSION".encode('utf-8')
         else:
             fn = os.path.basename(filepath).encode('utf-8')
-            with open(filepath, "rb") as f: data = f.read()
-        conn.sendall(len(fn).to_bytes(FILENAME_LENGTH_BYTES,'big'))
-        conn.sendall(fn)
-        conn.sendall(len(data).to_bytes(FILE_CONTENT_LENGTH_BYTES,'big'))
-        conn.sendall(data)
+            payload = get_binary_copy(filepath)  # ~3x fewer bytes than the text, and nothing to parse
+            if payload is not None:
+                fmt = FORMAT_INT32
+        if payload is not None:
+            size = len(payload)
+        else:
+            size = os.stat(filepath).st_size if filepath else 0
+        # The whole header in one write instead of four small ones
+        conn.sendall(len(fn).to_bytes(FILENAME_LENGTH_BYTES,'big') + fn + bytes([fmt]) +
+                     size.to_bytes(FILE_CONTENT_LENGTH_BYTES,'big'))
+        if payload is not None:
+            conn.sendall(payload)
+        elif filepath:
+            # Kernel copies the file to the socket (os.sendfile); falls back to read/send where unavailable
+            with open(filepath, "rb") as f: conn.sendfile(f, count=size)
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -2,12 +2,21 @@ import socket
 import matplotlib.pyplot as plt
 import numpy as np
 import time
-from scipy.signal import firwin, lfilter
+from scipy.signal import firwin, oaconvolve
+from scipy.fft import rfft, rfftfreq, next_fast_len
 import os
+import re
+import selectors
 import threading
-from collections import deque
 import struct # For packing/unpacking binary data
 import queue # For thread-safe data passing between network and plotting threads
+from functools import lru_cache
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError: # numba is optional; the per-sample FIR falls back to NumPy
+    NUMBA_AVAILABLE = False
 
 # Configuration
 SERVER_IP = '127.0.0.1'
@@ -19,14 +28,63 @@ FILENAME_LENGTH_BYTES = 4
 FILE_CONTENT_LENGTH_BYTES = 8
 CONFIG_LENGTH_BYTES = 4
 
+# Received files waiting for the plotting thread; the network thread blocks once this many are queued
+DATA_QUEUE_SIZE = 4
+# How often (s) a waiting receive checks whether plotting has stopped
+RECV_POLL_INTERVAL = 0.5
+
+# One "ADC:<value>" sample per line; the whole file is scanned in a single pass over the raw bytes
+_ADC_RE = re.compile(rb'ADC:[ \t]*([+-]?\d+)[ \t]*\r?$', re.MULTILINE)
+
 # Calibration constants for converting ADC values to meaningful weights
 ZERO_CAL = 0.01823035255075
 SCALE_CAL = 0.00000451794631
+INV_FULLSCALE = 1.0 / float(0x80000000) # Multiply instead of dividing every sample
+INV_SCALE_CAL = 1.0 / SCALE_CAL if SCALE_CAL != 0 else 0.0 # A zero scale gives zero weights, as before
+
+# Number of most recent raw samples the live DSP (mean, FFT, FIR) works on
+DSP_WINDOW_SIZE = 500
+
+
+class RingBuffer:
+    """
+    Fixed-size float64 sample buffer backed by a preallocated NumPy array. Each sample is
+    written twice, at head and head + maxlen, so the contents are always one contiguous
+    view (oldest first) and never need copying.
+    """
+    __slots__ = ('data', 'head', 'full', 'maxlen')
+
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self.data = np.empty(2 * maxlen, dtype=np.float64)
+        self.head = 0 # Next slot to write; the oldest sample once the buffer is full
+        self.full = False
+
+    def append(self, value):
+        self.data[self.head] = value
+        self.data[self.head + self.maxlen] = value
+        self.head += 1
+        if self.head == self.maxlen:
+            self.head = 0
+            self.full = True
+
+    def clear(self):
+        self.head = 0
+        self.full = False
+
+    def view(self):
+        """The buffered samples, oldest first. A view, so it changes with the next append."""
+        if self.full:
+            return self.data[self.head:self.head + self.maxlen]
+        return self.data[:self.head]
+
+    def __len__(self):
+        return self.maxlen if self.full else self.head
+
 
 # Global variables for plotting (managed by the main thread)
-current_raw_buffer = deque(maxlen=500) # Buffer for raw data points for live plot (adjust size as needed)
-current_filtered_buffer = deque(maxlen=500) # Buffer for filtered data points for live plot
-dsp_raw_adc_buffer = deque(maxlen=500) # Buffer to hold raw values (before weight conversion) for DSP operations
+current_raw_buffer = RingBuffer(maxlen=500) # Buffer for raw data points for live plot (adjust size as needed)
+current_filtered_buffer = RingBuffer(maxlen=500) # Buffer for filtered data points for live plot
 
 # Matplotlib figure and axes objects for live update
 current_fig = None 
@@ -37,6 +95,16 @@ current_raw_line = None
 current_filtered_line = None
 current_fft_line = None
 
+# Blitting state: axis backgrounds without the lines, and the axis limits they were captured with
+plot_backgrounds = None
+plot_blit_limits = None
+LIMIT_TOLERANCE = 0.05 # Keep y-limits that already fit the data within 5% of its span
+
+# FIR coefficients used by the live loop, redesigned only when the cut-off moves noticeably
+live_fir_coefficients = np.array([])
+live_fir_cutoff = None
+FIR_CUTOFF_EPSILON = 0.05 # Hz
+
 plot_lock = threading.Lock() # Protect Matplotlib calls from concurrent access
 
 # Flag to signal plotting activity status
@@ -51,39 +119,71 @@ def normalize_to_weights(values):
     Assumes `values` are in the original ADC range or re-offset to it.
 
     Args:
-        values (list or np.array): List or array of raw ADC values (or values in that range).
+        values (list, np.array or float): Raw ADC values (or values in that range).
 
     Returns:
-        np.array: Array of calculated weights.
+        np.array: Array of calculated weights (0-d for a single value).
     """
-    weights = []
-    for val in values:
-        try:
-            # Ensure value is treated as a float
-            data_in = float(val) / float(0x80000000)
-            calculated_weight = (data_in - ZERO_CAL) / SCALE_CAL if SCALE_CAL != 0 else 0.0
-            weights.append(calculated_weight)
-        except Exception as e:
-            # print(f"[CLIENT] Error in normalize_to_weights function for value {val}: {e}") # Too verbose for live
-            weights.append(np.nan) # Append NaN on error to avoid breaking plot limits
-    return np.array(weights)
+    # One vectorized pass; NaN inputs simply propagate to NaN weights
+    with np.errstate(invalid='ignore'):
+        return (np.asarray(values, dtype=np.float64) * INV_FULLSCALE - ZERO_CAL) * INV_SCALE_CAL
 
 
-def remove_dc_offset_temp(values):
+def remove_dc_offset_temp(values, mean=None):
     """
     Temporarily remove DC offset by subtracting the mean of the input values.
     This is used *before* FFT/FIR to process AC components.
+    A precomputed `mean` (e.g. a running mean) can be passed to skip re-scanning the values.
     """
     try:
         values_array = np.array(values, dtype=float) 
         if values_array.size == 0:
             return np.array([])
-        return values_array - np.nanmean(values_array) # Use nanmean to handle potential NaNs
+        if mean is None:
+            mean = np.nanmean(values_array) # Use nanmean to handle potential NaNs
+        return values_array - mean
     except Exception as e:
         print(f"[CLIENT] Error in remove_dc_offset_temp function: {e}")
         return np.full_like(values_array, np.nan) # Fill with NaN on error
 
 
+# Scratch for the windowed FFT input, so compute_fft does not allocate it every call.
+# Sized for the live DSP window; only the main (plotting) thread runs the FFT.
+_fft_scratch = np.empty(DSP_WINDOW_SIZE, dtype=np.float64)
+
+
+@lru_cache(maxsize=16)
+def _hanning(N):
+    """Hanning window of length N, built once per length. Shared between calls, so it is read-only."""
+    window = np.hanning(N)
+    window.setflags(write=False)
+    return window
+
+
+@lru_cache(maxsize=128)
+def _firwin_cached(numtaps, normalized_cutoff):
+    """Low-pass FIR design, built once per (numtaps, cutoff). Shared between calls, so it is read-only."""
+    fir_coefficients = firwin(numtaps=numtaps, cutoff=normalized_cutoff, window="hamming", pass_zero=True)
+    fir_coefficients.setflags(write=False)
+    return fir_coefficients
+
+
+@lru_cache(maxsize=16)
+def _rfft_frequencies(N, sampling_rate):
+    """rfft bin frequencies, built once per (length, rate). Shared between calls, so they are read-only."""
+    frequencies = rfftfreq(N, d=1 / sampling_rate)
+    frequencies.setflags(write=False)
+    return frequencies
+
+
+@lru_cache(maxsize=16)
+def _largest_fast_len(n):
+    """Largest length <= n whose only prime factors are 2, 3 and 5, i.e. a fast FFT size."""
+    while n > 1 and next_fast_len(n, real=True) != n:
+        n -= 1
+    return n
+
+
 def compute_fft(values, sampling_rate):
     """
     Compute FFT and return frequency spectrum, magnitude, and dominant frequency.
@@ -103,10 +203,17 @@ def compute_fft(values, sampling_rate):
     try:
         # print(f"[CLIENT - FFT] Computing FFT for {N} samples (first 5: {values[:5]}). Input mean: {np.nanmean(values):.2f}") # DEBUG: Show input to FFT
         
-        windowed_values = values * np.hanning(N)
-        fft_values = np.fft.fft(windowed_values)
-        fft_magnitude = np.abs(fft_values[:N // 2])
-        frequencies = np.fft.fftfreq(N, d=1 / sampling_rate)[:N // 2]
+        if N <= len(_fft_scratch):
+            windowed_values = np.multiply(values, _hanning(N), out=_fft_scratch[:N])
+        else:
+            windowed_values = values * _hanning(N)
+        # Zero-pad to a length with only small prime factors; rfft computes just the one-sided
+        # spectrum of the real input, so nothing needs slicing off
+        N_fast = next_fast_len(N, real=True)
+        # scipy.fft (pocketfft) keeps its plan per length between calls and can use every core
+        fft_values = rfft(windowed_values, n=N_fast, workers=-1)
+        fft_magnitude = np.abs(fft_values)
+        frequencies = _rfft_frequencies(N_fast, sampling_rate)
         
         dominant_frequency = 0.0
         if len(fft_magnitude) > 1: 
@@ -130,24 +237,22 @@ def compute_fft(values, sampling_rate):
         return np.array([0]), np.array([0]), 0.0
 
 
-def fir_filter(values, cut_off_frequency, sampling_rate):
+def design_fir_filter(cut_off_frequency, sampling_rate, num_samples):
     """
-    Apply FIR low-pass filter using a dynamically determined cut-off frequency.
-    `values` are expected to be DC-removed for effective filtering of AC components.
+    Design the FIR low-pass filter for a dynamically determined cut-off frequency.
 
     Args:
-        values (np.array): Array of signal values (DC-removed).
         cut_off_frequency (float): The determined cut-off frequency in Hz.
         sampling_rate (float): Sampling rate of the signal in Hz.
+        num_samples (int): Number of samples available to filter; limits the number of taps.
 
     Returns:
-        np.array: Array of filtered signal values.
-        np.array: Array of FIR filter coefficients.
+        np.array: Array of FIR filter coefficients (empty if no valid filter can be designed).
     """
     try:
         nyquist = sampling_rate / 2
         
-        # print(f"[CLIENT - FIR] Input values length: {len(values)}, Sampling Rate: {sampling_rate:.2f} Hz, Nyquist: {nyquist:.2f} Hz")
+        # print(f"[CLIENT - FIR] Input values length: {num_samples}, Sampling Rate: {sampling_rate:.2f} Hz, Nyquist: {nyquist:.2f} Hz")
         # print(f"[CLIENT - FIR] Calculated Cut-off Freq: {cut_off_frequency:.2f} Hz")
 
         # Ensure cut_off_frequency is valid and normalized_cutoff is within (0, 1)
@@ -162,34 +267,60 @@ def fir_filter(values, cut_off_frequency, sampling_rate):
                     normalized_cutoff = cut_off_frequency / nyquist
             else: 
                 # print("[CLIENT - FIR] Cannot compute normalized cutoff, Nyquist is zero. Skipping FIR.") # Too verbose
-                return np.full_like(values, np.nan), np.array([]) 
+                return np.array([])
         else:
             normalized_cutoff = cut_off_frequency / nyquist
         
         # print(f"[CLIENT - FIR] Final Normalized Cutoff: {normalized_cutoff:.4f}")
 
         numtaps = 51 
-        if numtaps > len(values):
-            numtaps = len(values) 
+        if numtaps > num_samples:
+            numtaps = num_samples 
             if numtaps % 2 == 0 and numtaps > 0: numtaps -= 1 
             if numtaps < 1: 
-                # print(f"[CLIENT - FIR] Not enough samples ({len(values)}) for FIR filter (numtaps={numtaps}). Skipping.") # Too verbose
-                return np.full_like(values, np.nan), np.array([])
+                # print(f"[CLIENT - FIR] Not enough samples ({num_samples}) for FIR filter (numtaps={numtaps}). Skipping.") # Too verbose
+                return np.array([])
 
-        fir_coefficients = firwin(numtaps=numtaps, cutoff=normalized_cutoff, window="hamming", pass_zero=True)
+        # The cutoff is rounded so that nearly identical cutoffs share one cached design
+        fir_coefficients = _firwin_cached(numtaps, round(normalized_cutoff, 4))
         
         # print(f"[CLIENT - FIR] FIR Coefficients (first 5): {fir_coefficients[:5]}... Sum: {np.sum(fir_coefficients):.4f}")
 
         if np.all(fir_coefficients == 0) or np.any(np.isnan(fir_coefficients)):
             print("[CLIENT - FIR] Warning: FIR coefficients are problematic (all zeros or NaN). Filter will have no effect or crash.")
-            return np.full_like(values, np.nan), np.array([]) 
+            return np.array([])
 
+        return fir_coefficients
+    except Exception as e:
+        print(f"[CLIENT] Error in design_fir_filter function: {e}")
+        return np.array([])
+
+
+def fir_filter(values, cut_off_frequency, sampling_rate):
+    """
+    Apply FIR low-pass filter using a dynamically determined cut-off frequency.
+    `values` are expected to be DC-removed for effective filtering of AC components.
 
-        if len(values) < len(fir_coefficients):
-            # print(f"[CLIENT] Warning: Signal length ({len(values)}) too short for filter taps ({len(fir_coefficients)}). Skipping FIR filter.") # Too verbose
-            return np.full_like(values, np.nan), fir_coefficients 
+    Args:
+        values (np.array): Array of signal values (DC-removed).
+        cut_off_frequency (float): The determined cut-off frequency in Hz.
+        sampling_rate (float): Sampling rate of the signal in Hz.
 
-        filtered_values = lfilter(fir_coefficients, 1.0, values)
+    Returns:
+        np.array: Array of filtered signal values.
+        np.array: Array of FIR filter coefficients.
+    """
+    try:
+        fir_coefficients = design_fir_filter(cut_off_frequency, sampling_rate, len(values))
+        if len(fir_coefficients) == 0:
+            return np.full_like(values, np.nan), fir_coefficients
+
+        # An FIR filter is a plain convolution; the first len(values) outputs match lfilter.
+        # Overlap-add pays off for longer filters, but an FFT would smear a NaN over the whole output.
+        if len(fir_coefficients) >= 32 and not np.isnan(values).any():
+            filtered_values = oaconvolve(values, fir_coefficients, mode='full')[:len(values)]
+        else:
+            filtered_values = np.convolve(values, fir_coefficients, mode='full')[:len(values)]
         # print(f"[CLIENT - FIR] Filtered values first 5: {filtered_values[:5]}") # DEBUG
         return filtered_values, fir_coefficients
     except Exception as e:
@@ -197,6 +328,64 @@ def fir_filter(values, cut_off_frequency, sampling_rate):
         return np.full_like(values, np.nan), np.array([])  
 
 
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _fir_last_point(buf, coeffs, mean):
+        acc = 0.0
+        last = buf.shape[0] - 1
+        for k in range(coeffs.shape[0]):
+            acc += coeffs[k] * (buf[last - k] - mean)
+        return acc
+
+
+def fir_last_point(values, fir_coefficients, mean):
+    """
+    Newest output of the FIR filter over `values` with `mean` removed, i.e. the last
+    sample lfilter would return. It only depends on the last len(fir_coefficients) inputs.
+
+    Args:
+        values (np.array): Window of raw signal values, at least as long as the filter.
+        fir_coefficients (np.array): FIR filter coefficients.
+        mean (float): DC offset to subtract from `values` before filtering.
+
+    Returns:
+        float: The filtered (DC-removed) value for the newest sample.
+    """
+    if NUMBA_AVAILABLE:
+        return _fir_last_point(values, fir_coefficients, mean)
+    numtaps = len(fir_coefficients)
+    return float(np.dot(fir_coefficients[::-1], values[-numtaps:] - mean))
+
+
+def _invalidate_plot_backgrounds(event=None):
+    """Drops the cached blit backgrounds, e.g. after a resize, so the next update recaptures them."""
+    global plot_backgrounds
+    plot_backgrounds = None
+
+
+def _set_stable_ylim(ax, lo, hi):
+    """
+    Sets the y-limits of `ax` unless the current ones already contain (lo, hi) with at most
+    LIMIT_TOLERANCE of slack on either side. Unchanged limits keep the blit backgrounds valid.
+    """
+    current_lo, current_hi = ax.get_ylim()
+    tolerance = LIMIT_TOLERANCE * (hi - lo)
+    if 0 <= lo - current_lo <= tolerance and 0 <= current_hi - hi <= tolerance:
+        return
+    ax.set_ylim(lo, hi)
+
+
+def pause_plot(interval):
+    """
+    Like plt.pause, keeps the plot window responsive for `interval` seconds, but without
+    redrawing the whole figure; update_live_plot already blitted the changes.
+    """
+    if current_fig is not None and plt.fignum_exists(current_fig.number):
+        current_fig.canvas.start_event_loop(interval)
+    else:
+        time.sleep(interval)
+
+
 def init_plot(label="ADC Data"):
     """Initializes the Matplotlib figure and axes for live plotting."""
     global current_fig, current_ax1, current_ax2, current_ax3, \
@@ -238,24 +427,32 @@ def init_plot(label="ADC Data"):
         current_ax2.set_xlim(0, current_filtered_buffer.maxlen)
         current_ax3.set_xlim(0, 100) 
 
+        # Backgrounds are captured on the first update; a resize makes them stale
+        _invalidate_plot_backgrounds()
+        current_fig.canvas.mpl_connect('resize_event', _invalidate_plot_backgrounds)
+        plt.show(block=False)
+
         print(f"[CLIENT] Plot initialized for: {label}")
 
 
-def update_live_plot(sampling_rate, label="ADC Data"):
+def update_live_plot(sampling_rate, label="ADC Data", dsp_window=np.array([])):
     """
     Updates the Matplotlib plots using the global data buffers.
     This function is called repeatedly to simulate live data.
+    `dsp_window` holds the most recent raw ADC samples, used for the FFT panel.
     """
     global current_fig, current_ax1, current_ax2, current_ax3
     global current_raw_line, current_filtered_line, current_fft_line
+    global plot_backgrounds, plot_blit_limits
 
     if not plotting_active or current_fig is None:
         return
 
     with plot_lock:
         try:
-            raw_data_to_plot = np.array(list(current_raw_buffer))
-            filtered_data_to_plot = np.array(list(current_filtered_buffer))
+            # Copies, because the lines keep their data while the buffers are written to
+            raw_data_to_plot = current_raw_buffer.view().copy()
+            filtered_data_to_plot = current_filtered_buffer.view().copy()
             
             current_raw_line.set_data(np.arange(len(raw_data_to_plot)), raw_data_to_plot)
             current_filtered_line.set_data(np.arange(len(filtered_data_to_plot)), filtered_data_to_plot)
@@ -273,7 +470,7 @@ def update_live_plot(sampling_rate, label="ADC Data"):
                 # Fallback if min_y_raw/max_y_raw become problematic (e.g., all same value or only nan)
                 if not np.isfinite(min_y_raw) or not np.isfinite(max_y_raw) or (max_y_raw - min_y_raw) < 1e-9:
                     min_y_raw, max_y_raw = -0.1, 0.1 # Small default range
-                current_ax1.set_ylim(min_y_raw, max_y_raw)
+                _set_stable_ylim(current_ax1, min_y_raw, max_y_raw)
             else:
                 current_ax1.set_ylim(-0.1, 0.1) # Default if no valid data
 
@@ -281,14 +478,14 @@ def update_live_plot(sampling_rate, label="ADC Data"):
                 min_y_filtered, max_y_filtered = np.nanmin(filtered_data_to_plot) * 0.9, np.nanmax(filtered_data_to_plot) * 1.1
                 if not np.isfinite(min_y_filtered) or not np.isfinite(max_y_filtered) or (max_y_filtered - min_y_filtered) < 1e-9:
                     min_y_filtered, max_y_filtered = -0.1, 0.1 # Small default range
-                current_ax2.set_ylim(min_y_filtered, max_y_filtered)
+                _set_stable_ylim(current_ax2, min_y_filtered, max_y_filtered)
             else:
                 current_ax2.set_ylim(-0.1, 0.1) # Default if no valid data
 
 
-            fft_window_size = min(256, len(list(dsp_raw_adc_buffer))) 
+            fft_window_size = _largest_fast_len(min(256, len(dsp_window))) # Fast size, no padding needed
             if fft_window_size >= 2:
-                fft_input_data = np.array(list(dsp_raw_adc_buffer))[-fft_window_size:] 
+                fft_input_data = dsp_window[-fft_window_size:] 
                 
                 processed_fft_input = remove_dc_offset_temp(fft_input_data) 
                 
@@ -316,11 +513,11 @@ def update_live_plot(sampling_rate, label="ADC Data"):
                         non_dc_magnitudes = fft_magnitude[1:]
                         if non_dc_magnitudes.size > 0 and np.nanmax(non_dc_magnitudes) > 0:
                             max_ac_magnitude = np.nanmax(non_dc_magnitudes)
-                            current_ax3.set_ylim(0, max_ac_magnitude * 1.2)
+                            _set_stable_ylim(current_ax3, 0, max_ac_magnitude * 1.2)
                         else: # All AC magnitudes are zero or NaN, but DC is not
                             current_ax3.set_ylim(0, fft_magnitude[0] * 0.01 + 1e-9) # Show tiny fraction of DC or small default
                     else: # No 0Hz or only 0Hz or all values are small
-                        current_ax3.set_ylim(0, np.nanmax(fft_magnitude) * 1.2)
+                        _set_stable_ylim(current_ax3, 0, np.nanmax(fft_magnitude) * 1.2)
                 else:
                     current_ax3.set_ylim(0, 1) # Default if no valid FFT magnitude
 
@@ -329,17 +526,43 @@ def update_live_plot(sampling_rate, label="ADC Data"):
                 current_ax3.set_xlim(0, sampling_rate / 2)
                 current_ax3.set_ylim(0, 1)
 
-            current_fig.canvas.draw()
-            current_fig.canvas.flush_events()
+            canvas = current_fig.canvas
+            axes = (current_ax1, current_ax2, current_ax3)
+            lines = (current_raw_line, current_filtered_line, current_fft_line)
+            limits = tuple(ax.get_xlim() + ax.get_ylim() for ax in axes)
+
+            if not getattr(canvas, 'supports_blit', False):
+                canvas.draw()
+            else:
+                if plot_backgrounds is None or limits != plot_blit_limits:
+                    # Axes changed: render them once without the lines and keep that as the background
+                    for line in lines:
+                        line.set_visible(False)
+                    canvas.draw()
+                    plot_backgrounds = [canvas.copy_from_bbox(ax.bbox) for ax in axes]
+                    plot_blit_limits = limits
+                    for line in lines:
+                        line.set_visible(True)
+                else:
+                    for background in plot_backgrounds:
+                        canvas.restore_region(background)
+
+                # Only the lines changed, so only they are drawn and pushed to the screen
+                for ax, line in zip(axes, lines):
+                    ax.draw_artist(line)
+                    canvas.blit(ax.bbox)
+            canvas.flush_events()
             
         except Exception as e:
             print(f"[CLIENT] Error in update_live_plot: {e}")
 
 
-def write_data_to_file(file_name, raw_weights_all, filtered_weights_all, fir_coefficients, fft_frequencies_last, fft_magnitude_last):
+def write_data_to_file(file_name, raw_weights_all, filtered_weights_all, fir_coefficients, fft_frequencies_last, fft_magnitude_last, dump_text=False):
     """
-    Writes all processed data to a text file for record-keeping.
+    Writes all processed data to a compressed NumPy archive for record-keeping.
     Collects full data set, not just the buffered part.
+    Load it with np.load(path)["raw"], ["filtered"], ["fir"], ["fft_freq"], ["fft_mag"].
+    dump_text=True also writes a human-readable text file, one value per line.
     """
     try:
         output_folder = "output_data"
@@ -347,15 +570,29 @@ def write_data_to_file(file_name, raw_weights_all, filtered_weights_all, fir_coe
             os.makedirs(output_folder)
             print(f"Created output folder: {output_folder}")
 
-        filepath = os.path.join(output_folder, f"all_data_{file_name}.txt")
-        with open(filepath, "w") as f:
-            f.write(f"Raw Weights (total {len(raw_weights_all)} samples):\\n{list(raw_weights_all)}\\n\\n")
-            f.write(f"Filtered Weights (total {len(filtered_weights_all)} samples):\\n{list(filtered_weights_all)}\\n\\n")
-            
-            f.write(f"FIR Coefficients (total {len(fir_coefficients)} samples):\\n{list(fir_coefficients) if len(fir_coefficients) > 0 else 'N/A'}\\n\\n")
-            
-            f.write(f"FFT Frequencies (last computed window, total {len(fft_frequencies_last)} samples):\\n{list(fft_frequencies_last)}\\n\\n")
-            f.write(f"FFT Magnitudes (last computed window, total {len(fft_magnitude_last)} samples):\\n{list(fft_magnitude_last)}\\n\\n")
+        filepath = os.path.join(output_folder, f"all_data_{file_name}.npz")
+        # NumPy writes straight from the array buffers; no Python list or giant string is built
+        np.savez_compressed(filepath, raw=np.asarray(raw_weights_all), filtered=np.asarray(filtered_weights_all),
+                            fir=np.asarray(fir_coefficients), fft_freq=np.asarray(fft_frequencies_last),
+                            fft_mag=np.asarray(fft_magnitude_last))
+
+        if dump_text:
+            text_filepath = os.path.join(output_folder, f"all_data_{file_name}.txt")
+            sections = [
+                (f"Raw Weights (total {len(raw_weights_all)} samples):", raw_weights_all),
+                (f"Filtered Weights (total {len(filtered_weights_all)} samples):", filtered_weights_all),
+                (f"FIR Coefficients (total {len(fir_coefficients)} samples):", fir_coefficients),
+                (f"FFT Frequencies (last computed window, total {len(fft_frequencies_last)} samples):", fft_frequencies_last),
+                (f"FFT Magnitudes (last computed window, total {len(fft_magnitude_last)} samples):", fft_magnitude_last),
+            ]
+            with open(text_filepath, "w") as f:
+                for header, values in sections:
+                    f.write(header + "\n")
+                    if len(values) > 0:
+                        np.savetxt(f, np.asarray(values), fmt='%.10g') # Streams into the open file
+                    else:
+                        f.write("N/A\n")
+                    f.write("\n")
         print(f"[CLIENT] Successfully wrote all data for {file_name} to {filepath}")
     except Exception as e:
         print(f"[CLIENT] Error writing to file: {e}")
@@ -366,7 +603,8 @@ def process_and_plot_live_data(raw_adc_values_full_file, interval_ms, file_name)
     Simulates live processing and plotting of data from a full received file.
     This runs on the main thread and introduces time delays for live effect.
     """
-    global current_raw_buffer, current_filtered_buffer, dsp_raw_adc_buffer
+    global current_raw_buffer, current_filtered_buffer
+    global live_fir_coefficients, live_fir_cutoff
 
     if len(raw_adc_values_full_file) == 0:
         print(f"[CLIENT] No raw ADC data to simulate live processing for {file_name}.")
@@ -374,18 +612,33 @@ def process_and_plot_live_data(raw_adc_values_full_file, interval_ms, file_name)
 
     print(f"[CLIENT] Simulating live processing for {file_name} (interval: {interval_ms}ms)...")
     
-    all_raw_weights = []
-    all_filtered_weights = []
+    # Filled in place as samples are processed; stays NaN where no filtered value exists
+    all_filtered_weights = np.full(len(raw_adc_values_full_file), np.nan)
+    samples_processed = 0
     last_fir_coefficients = np.array([])
     last_fft_frequencies = np.array([])
     last_fft_magnitude = np.array([])
 
     sampling_rate = 1000.0 / interval_ms if interval_ms > 0 else 1.0
+    pause_interval_s = interval_ms / 1000.0 # Loop-invariant, so converted once
     # Number of filter taps
     num_taps = 51
     # Minimum samples needed for FIR and a reasonable FFT window
     min_dsp_samples = max(num_taps, 256) 
+    # The sampling rate may differ from the previous file, so start with a fresh design
+    live_fir_coefficients = np.array([])
+    live_fir_cutoff = None
+    # Redrawing and re-running the FFT at the sample rate is wasted work; do it ~20 times a second
+    plot_decimation = max(1, int(0.05 * sampling_rate))
+    samples_since_last_plot = 0
+
 
+    raw_adc_np = np.asarray(raw_adc_values_full_file)
+    # Weights for the whole file in one call instead of one call per sample
+    all_raw_weights = normalize_to_weights(raw_adc_np)
+    # Prefix sums give the mean of any DSP window in O(1); int64 keeps them exact
+    raw_adc_cumsum = np.concatenate(([0], np.cumsum(raw_adc_np, dtype=np.int64)))
+    dsp_window = raw_adc_np[:0]
 
     init_plot(label=file_name)
 
@@ -395,71 +648,96 @@ def process_and_plot_live_data(raw_adc_values_full_file, interval_ms, file_name)
             print("[CLIENT] Live plotting simulation stopped by user/system.")
             break
 
-        current_raw_adc = raw_adc_values_full_file[i]
-        
-        # Add raw ADC value to DSP buffer (will be DC-removed for processing)
-        dsp_raw_adc_buffer.append(current_raw_adc) 
+        # The DSP window is a view of the last DSP_WINDOW_SIZE raw samples, no buffer or copy needed
+        window_start = max(0, i - DSP_WINDOW_SIZE + 1)
+        dsp_window = raw_adc_np[window_start:i + 1]
 
         # Normalize current raw ADC value to weight and add to raw display buffer
-        current_raw_weight = normalize_to_weights([current_raw_adc])[0]
+        current_raw_weight = all_raw_weights[i]
         current_raw_buffer.append(current_raw_weight)
-        all_raw_weights.append(current_raw_weight)
 
         
         filtered_weight_to_plot = np.nan # Initialize as NaN for plotting gap
+
+        samples_since_last_plot += 1
+        refresh_display = samples_since_last_plot >= plot_decimation
+        if refresh_display:
+            samples_since_last_plot = 0
         
         # Only perform DSP if we have enough data in the buffer for reliable calculations
-        if len(dsp_raw_adc_buffer) >= min_dsp_samples: 
-            current_dsp_raw_values = np.array(list(dsp_raw_adc_buffer))
+        if len(dsp_window) >= min_dsp_samples: 
+            current_dsp_raw_values = dsp_window
 
-            processed_window_dc_removed = remove_dc_offset_temp(current_dsp_raw_values)
+            original_mean_of_window = (raw_adc_cumsum[i + 1] - raw_adc_cumsum[window_start]) / len(dsp_window)
 
-            fft_frequencies, fft_magnitude, cut_off_frequency = compute_fft(processed_window_dc_removed, sampling_rate)
-            last_fft_frequencies = fft_frequencies
-            last_fft_magnitude = fft_magnitude
-            
-            filtered_segment_values_dc_removed, fir_coefficients = fir_filter(processed_window_dc_removed, cut_off_frequency, sampling_rate)
+            # The cut-off only needs tracking at the display rate; in between the current design is reused
+            if refresh_display or live_fir_cutoff is None:
+                processed_window_dc_removed = remove_dc_offset_temp(current_dsp_raw_values, original_mean_of_window)
+
+                fft_frequencies, fft_magnitude, cut_off_frequency = compute_fft(processed_window_dc_removed, sampling_rate)
+                last_fft_frequencies = fft_frequencies
+                last_fft_magnitude = fft_magnitude
+                
+                if live_fir_cutoff is None or abs(cut_off_frequency - live_fir_cutoff) > FIR_CUTOFF_EPSILON:
+                    live_fir_coefficients = design_fir_filter(cut_off_frequency, sampling_rate, len(current_dsp_raw_values))
+                    live_fir_cutoff = cut_off_frequency
+            fir_coefficients = live_fir_coefficients
             last_fir_coefficients = fir_coefficients
             
-            if len(filtered_segment_values_dc_removed) > 0:
-                filtered_point_dc_removed = filtered_segment_values_dc_removed[-1]
-                
-                original_mean_of_window = np.mean(current_dsp_raw_values)
-                re_offset_filtered_value = filtered_point_dc_removed + original_mean_of_window
-                filtered_weight_to_plot = normalize_to_weights([re_offset_filtered_value])[0]
+            if len(fir_coefficients) > 0:
+                # Only the newest filtered point is plotted, and it depends only on the last
+                # len(fir_coefficients) samples, so stream one point instead of filtering the window
+                filtered_point_dc_removed = fir_last_point(current_dsp_raw_values[-len(fir_coefficients):], fir_coefficients, original_mean_of_window)
             else:
-                if processed_window_dc_removed.size > 0:
-                    original_mean_of_window = np.mean(current_dsp_raw_values)
-                    re_offset_value = processed_window_dc_removed[-1] + original_mean_of_window
-                    filtered_weight_to_plot = normalize_to_weights([re_offset_value])[0]
-                else:
-                    filtered_weight_to_plot = current_raw_weight 
+                filtered_point_dc_removed = np.nan
+            re_offset_filtered_value = filtered_point_dc_removed + original_mean_of_window
+            # Same conversion as normalize_to_weights, as scalar math: no NumPy call per sample
+            filtered_weight_to_plot = float((re_offset_filtered_value * INV_FULLSCALE - ZERO_CAL) * INV_SCALE_CAL)
 
 
-        if len(dsp_raw_adc_buffer) >= num_taps:
+        if len(dsp_window) >= num_taps:
             current_filtered_buffer.append(filtered_weight_to_plot)
+            all_filtered_weights[i] = filtered_weight_to_plot
         else:
             current_filtered_buffer.append(np.nan) 
-
-        all_filtered_weights.append(filtered_weight_to_plot if len(dsp_raw_adc_buffer) >= num_taps else np.nan)
+        samples_processed = i + 1
 
 
-        update_live_plot(sampling_rate, label=file_name)
+        if refresh_display:
+            update_live_plot(sampling_rate, label=file_name, dsp_window=dsp_window)
         
-        plt.pause(interval_ms / 1000.0) 
+        pause_plot(pause_interval_s) 
+
+    if samples_since_last_plot > 0:
+        update_live_plot(sampling_rate, label=file_name, dsp_window=dsp_window) # Show the samples since the last refresh
 
     print(f"[CLIENT] Finished simulating live processing for {file_name}. Saving full data.")
-    write_data_to_file(file_name, np.array(all_raw_weights), np.array(all_filtered_weights), last_fir_coefficients, last_fft_frequencies, last_fft_magnitude)
+    write_data_to_file(file_name, all_raw_weights[:samples_processed], all_filtered_weights[:samples_processed], last_fir_coefficients, last_fft_frequencies, last_fft_magnitude)
 
 
-def recvall(sock, n):
-    """Helper function to receive N bytes reliably or return None if EOF is hit."""
-    data = b''
-    while len(data) < n:
-        packet = sock.recv(n - len(data))
-        if not packet:
+def recvall(sock, n, selector=None):
+    """
+    Helper function to receive N bytes reliably or return None if EOF is hit.
+    Reads straight into one preallocated buffer instead of concatenating every packet.
+    With a `selector` (holding the non-blocking `sock`), it waits for readiness with a
+    timeout instead of blocking in recv, and also returns None once plotting has stopped.
+    """
+    data = bytearray(n)
+    view = memoryview(data)
+    received = 0
+    while received < n:
+        if selector is not None and not selector.select(timeout=RECV_POLL_INTERVAL):
+            if not plotting_active:
+                print("[CLIENT] Plotting stopped; abandoning receive.")
+                return None
+            continue
+        try:
+            got = sock.recv_into(view[received:], n - received)
+        except BlockingIOError: # Readiness can be spurious on a non-blocking socket
+            continue
+        if not got:
             return None
-        data += packet
+        received += got
     return data
 
 
@@ -473,20 +751,24 @@ def receive_and_queue_data_loop(data_queue):
     network_thread_running = True 
 
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    selector = selectors.DefaultSelector()
     try:
         s.connect((SERVER_IP, SERVER_PORT))
         print("[CLIENT] Connected to server.")
+        # Reads wait on the selector (epoll/kqueue/select) rather than blocking in recv
+        s.setblocking(False)
+        selector.register(s, selectors.EVENT_READ)
         
         interval_ms = 20 
         mode = "interval"
 
-        config_len_bytes = recvall(s, CONFIG_LENGTH_BYTES)
+        config_len_bytes = recvall(s, CONFIG_LENGTH_BYTES, selector)
         if not config_len_bytes:
             print("[CLIENT] Server disconnected while receiving config length (config).")
             return
         config_len = int.from_bytes(config_len_bytes, 'big')
         
-        config_data_bytes = recvall(s, config_len)
+        config_data_bytes = recvall(s, config_len, selector)
         if not config_data_bytes:
             print("[CLIENT] Server disconnected while receiving config data (config).")
             return
@@ -506,20 +788,20 @@ def receive_and_queue_data_loop(data_queue):
                 print(f"[CLIENT] Set mode: {mode}")
 
         while True:
-            filename_len_bytes = recvall(s, FILENAME_LENGTH_BYTES)
+            filename_len_bytes = recvall(s, FILENAME_LENGTH_BYTES, selector)
             if not filename_len_bytes:
                 print("[CLIENT] Server disconnected or no more files to receive (filename length).")
                 break 
             filename_length = int.from_bytes(filename_len_bytes, 'big')
 
-            filename_bytes = recvall(s, filename_length)
+            filename_bytes = recvall(s, filename_length, selector)
             if not filename_bytes:
                 print("[CLIENT] Server disconnected while receiving filename.")
                 break
             file_name = filename_bytes.decode('utf-8')
             print(f"[CLIENT] Received file name: {file_name}")
 
-            file_content_len_bytes = recvall(s, FILE_CONTENT_LENGTH_BYTES)
+            file_content_len_bytes = recvall(s, FILE_CONTENT_LENGTH_BYTES, selector)
             if not file_content_len_bytes:
                 print("[CLIENT] Server disconnected while receiving file content length.")
                 break
@@ -540,26 +822,34 @@ def receive_and_queue_data_loop(data_queue):
 
             print(f"[CLIENT] Expecting file content of length: {file_content_length} bytes for {file_name}")
 
-            file_content_data = recvall(s, file_content_length)
+            file_content_data = recvall(s, file_content_length, selector)
             if not file_content_data:
                 print(f"[CLIENT] Server disconnected while receiving file content for {file_name}.")
                 break
 
             print(f"[CLIENT] Received file content. Actual Length: {len(file_content_data)} bytes.")
 
-            lines = file_content_data.decode(errors='ignore').splitlines()
-            raw_adc_values = []
-            for line in lines:
-                if 'ADC:' in line:
-                    try:
-                        adc = int(line.strip().split("ADC:")[-1])
-                        raw_adc_values.append(adc)
-                    except ValueError:
-                        print(f"[CLIENT] Warning: Invalid ADC value in line: {line}. Skipping.")
-                        pass
+            adc_matches = _ADC_RE.findall(file_content_data)
+            # A compact int32 array is what crosses the queue; the ADC is 32-bit, but fall back
+            # to int64 rather than wrap around if a file ever holds larger values
+            try:
+                raw_adc_values = np.fromiter(map(int, adc_matches), dtype=np.int32, count=len(adc_matches))
+            except OverflowError:
+                raw_adc_values = np.fromiter(map(int, adc_matches), dtype=np.int64, count=len(adc_matches))
+            skipped_lines = file_content_data.count(b'ADC:') - len(adc_matches)
+            if skipped_lines > 0:
+                print(f"[CLIENT] Warning: Skipped {skipped_lines} line(s) with invalid ADC values in {file_name}.")
             
-            if raw_adc_values:
-                data_queue.put((raw_adc_values, interval_ms, file_name))
+            if raw_adc_values.size > 0:
+                # Wait for room in the bounded queue, but give up once plotting has stopped
+                while True:
+                    try:
+                        data_queue.put((raw_adc_values, interval_ms, file_name), timeout=0.5)
+                        break
+                    except queue.Full:
+                        if not plotting_active:
+                            print("[CLIENT] Plotting stopped; dropping remaining files.")
+                            return
                 print(f"[CLIENT] Put full file '{file_name}' into queue for live simulation.")
             else:
                 print(f"[CLIENT] No valid ADC values found in file {file_name}. Not adding to queue.")
@@ -573,6 +863,7 @@ def receive_and_queue_data_loop(data_queue):
     except Exception as e:
         print(f"[CLIENT] An unexpected error occurred in receive_and_queue_data_loop: {e}")
     finally:
+        selector.close()
         s.close()
         print("[CLIENT] Network connection closed.")
         network_thread_running = False 
@@ -582,7 +873,7 @@ if __name__ == "__main__":
     plt.ion() 
     plotting_active = True 
 
-    data_queue = queue.Queue()
+    data_queue = queue.Queue(maxsize=DATA_QUEUE_SIZE) # Bounded, so a fast server cannot pile up files in memory
 
     data_thread = threading.Thread(target=receive_and_queue_data_loop, args=(data_queue,), daemon=True)
     data_thread.start()
@@ -595,7 +886,6 @@ if __name__ == "__main__":
                 
                 current_raw_buffer.clear()
                 current_filtered_buffer.clear()
-                dsp_raw_adc_buffer.clear() 
 
                 process_and_plot_live_data(raw_adc_values_full_file, interval_ms, file_name)
                 
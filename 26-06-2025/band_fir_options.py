@@ -4,14 +4,20 @@
 import socket
 import matplotlib.pyplot as plt
 from matplotlib.widgets import RadioButtons
+from matplotlib.animation import FuncAnimation
 import numpy as np
 import time
 from scipy.signal import firwin
 import os
+import re
 import threading
-from collections import deque
 import struct
 import queue
+from collections import deque
+from functools import lru_cache
+
+# One "ADC:<int>" per line; the value is whatever follows the last "ADC:" on the line
+ADC_RE = re.compile(rb'ADC:[ \t]*([+-]?\d+)[ \t]*\r?$', re.MULTILINE)
 
 try:
     import cmsisdsp as dsp
@@ -21,72 +27,146 @@ except ImportError:
     print("[CLIENT] ERROR: CMSIS-DSP library not found. Please install it using 'pip install cmsisdsp'")
     exit()
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("[CLIENT] Numba not found; files will be filtered through CMSIS-DSP.")
+
 # A thread-safe event to signal shutdown to all threads
 shutdown_event = threading.Event()
 
 # Default plotting speed, will be updated by the widget
 USER_SELECTED_INTERVAL_MS = 20
+# Shortest time between redraws; faster speeds play several samples per frame instead of redrawing more often
+MIN_FRAME_INTERVAL_MS = 20
 
 # Configuration
 SERVER_IP = '127.0.0.1'
 SERVER_PORT = 9999
 FIR_CUTOFF_HZ = 10.0
+FIR_USE_Q15 = True  # Filter in Q15 fixed point (arm_fir_q15); False keeps the float32 path
+Q15_HEADROOM = 0.5  # Fraction of Q15 full scale the signal peak is scaled to, leaving room for overshoot
+filter_backend = None  # What filtered the current file ("Numba", "CMSIS-DSP Q15", "CMSIS-DSP f32"), shown in the legend
 
 # Protocol constants
 FILENAME_LENGTH_BYTES = 4
 FILE_CONTENT_LENGTH_BYTES = 8
 CONFIG_LENGTH_BYTES = 4
+RECV_BUFFER_BYTES = 1 << 20  # Socket receive buffer requested from the OS
+# Precompiled big-endian length headers (4-byte config/filename lengths, 8-byte content length)
+_HDR1 = struct.Struct(">I")
+_HDR2 = struct.Struct(">Q")
 
 # Calibration constants
 ZERO_CAL = 0.01823035255075
 SCALE_CAL = 0.00000451794631
+INV_FULLSCALE = 1.0 / float(0x80000000)  # Multiply instead of dividing every sample
+INV_SCALE_CAL = 1.0 / SCALE_CAL if SCALE_CAL != 0 else 0.0  # A zero scale gives zero weights
+# normalize_to_weights is affine, so a peak-to-peak in ADC counts times this is the peak-to-peak in weight
+ADC_SPAN_TO_WEIGHT = INV_FULLSCALE * abs(INV_SCALE_CAL)
 
 # Global variables
-current_raw_buffer = deque(maxlen=500)
-current_filtered_buffer = deque(maxlen=500)
-dsp_raw_adc_buffer = deque(maxlen=500)
+# Live plot history: preallocated ring buffers sharing one write index, oldest sample at ring_idx once full
+PLOT_BUFFER_SIZE = 500
+RAW_RING = np.empty(PLOT_BUFFER_SIZE, dtype=np.float32)
+FILT_RING = np.empty(PLOT_BUFFER_SIZE, dtype=np.float32)
+# Oldest-first copies of the rings once they have wrapped, reused every frame
+RAW_ORDERED = np.empty(PLOT_BUFFER_SIZE, dtype=np.float32)
+FILT_ORDERED = np.empty(PLOT_BUFFER_SIZE, dtype=np.float32)
+ring_idx = 0
+ring_filled = 0
+ring_count = 0  # Samples pushed since the last reset
+YLIM_TOLERANCE = 0.01  # Fraction of the current y-span a limit must move before it is reset
 current_fig, current_axes = None, None
 current_raw_line, current_filtered_line = None, None
-plot_lock = threading.Lock()
 speed_radio_buttons = None
+PLOT_X = np.arange(PLOT_BUFFER_SIZE)  # Shared x values for both lines, built once
+# Playback of the current file: precomputed weights, next sample to show, and the animation driving it
+playback_raw_weights, playback_filtered_weights = None, None
+playback_index = 0
+samples_per_frame = 1
+current_anim = None
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _mean_min_max_kernel(values):
+        """Mean, min and max of a non-empty array in a single pass."""
+        total = 0.0
+        lowest = values[0]
+        highest = values[0]
+        for v in values:
+            total += v
+            if v < lowest:
+                lowest = v
+            elif v > highest:
+                highest = v
+        return total / values.shape[0], lowest, highest
+
+    # Compile now (or load from the cache) rather than on the first file
+    _mean_min_max_kernel(np.zeros(1, dtype=np.int64))
+
+
+def mean_min_max(values):
+    """Mean, min and max of the ADC counts as floats; one pass over the array when numba is available."""
+    if NUMBA_AVAILABLE:
+        mean, lowest, highest = _mean_min_max_kernel(values)
+    else:
+        mean, lowest, highest = np.mean(values), np.min(values), np.max(values)
+    return float(mean), float(lowest), float(highest)
 
 
 def calculate_amplitudes_and_dc(raw_adc_values, sampling_rate):
     """
     Calculates amplitudes and the STABLE DC offset for the entire signal.
+    Also returns the filtered signal as weights (None if it could not be filtered).
     """
+    global filter_backend
     print("[CLIENT] Calculating signal amplitudes and stable DC offset...")
-    if not raw_adc_values:
-        return None, None, 0
+    filter_backend = None
+    if len(raw_adc_values) == 0:
+        return None, None, 0, None
 
     try:
-        signal_as_f32 = np.array(raw_adc_values, dtype=np.float32)
-        stable_dc_offset = np.mean(signal_as_f32)
+        raw_adc_values = np.asarray(raw_adc_values)
+        stable_dc_offset, adc_min, adc_max = mean_min_max(raw_adc_values)
         print(f"[CLIENT] Stable DC offset calculated: {stable_dc_offset:.2f}")
 
-        # Calculate raw amplitude
-        raw_weights = normalize_to_weights(raw_adc_values)
-        raw_amplitude = np.nanmax(raw_weights) - np.nanmin(raw_weights)
+        # Calculate raw amplitude straight from the ADC counts, without a weights array
+        raw_amplitude = (adc_max - adc_min) * ADC_SPAN_TO_WEIGHT
         print(f"[CLIENT] Raw data amplitude (peak-to-peak): {raw_amplitude:.2f}")
         
+        if NUMBA_AVAILABLE:
+            fused = fused_filtered_weights(raw_adc_values, stable_dc_offset, FIR_CUTOFF_HZ, sampling_rate)
+            if fused is not None:
+                filtered_weights, filtered_amplitude = fused
+                filter_backend = "Numba"
+                print(f"[CLIENT] Filtered data amplitude (peak-to-peak): {filtered_amplitude:.2f}")
+                return raw_amplitude, filtered_amplitude, stable_dc_offset, filtered_weights
+
         # Calculate filtered amplitude using the stable offset
-        dc_removed_signal = signal_as_f32 - stable_dc_offset
+        signal_as_f32 = raw_adc_values.astype(np.float32)
+        dc_removed_signal = signal_as_f32 - np.float32(stable_dc_offset)
         filtered_ac_signal, _ = fir_filter(dc_removed_signal, FIR_CUTOFF_HZ, sampling_rate)
 
         if filtered_ac_signal.size > 0 and not np.all(np.isnan(filtered_ac_signal)):
+            filtered_amplitude = (float(np.nanmax(filtered_ac_signal)) - float(np.nanmin(filtered_ac_signal))) * ADC_SPAN_TO_WEIGHT
+            # The weights themselves are still needed for playback
             reconstructed_filtered_signal = filtered_ac_signal + stable_dc_offset
             filtered_weights = normalize_to_weights(reconstructed_filtered_signal)
-            filtered_amplitude = np.nanmax(filtered_weights) - np.nanmin(filtered_weights)
             print(f"[CLIENT] Filtered data amplitude (peak-to-peak): {filtered_amplitude:.2f}")
         else:
+            filtered_weights = None
             filtered_amplitude = None
             print("[CLIENT] Could not generate filtered signal to calculate amplitude.")
             
-        return raw_amplitude, filtered_amplitude, stable_dc_offset
+        return raw_amplitude, filtered_amplitude, stable_dc_offset, filtered_weights
         
     except Exception as e:
         print(f"[CLIENT] Error during amplitude calculation: {e}")
-        return None, None, 0
+        return None, None, 0, None
 
 def save_amplitude_results(original_file_name, raw_amplitude, filtered_amplitude):
     """Saves the amplitude calculation results to a unique file."""
@@ -117,114 +197,356 @@ def save_amplitude_results(original_file_name, raw_amplitude, filtered_amplitude
 
 
 def normalize_to_weights(values):
-    """Normalize raw ADC values to physical weights."""
-    weights = []
-    for val in values:
-        try:
-            data_in = float(val) / float(0x80000000)
-            calculated_weight = (data_in - ZERO_CAL) / SCALE_CAL if SCALE_CAL != 0 else 0.0
-            weights.append(calculated_weight)
-        except (ValueError, TypeError):
-            weights.append(np.nan)
-    return np.array(weights)
+    """Normalize raw ADC values to physical weights. A single value gives a float, anything else an array."""
+    if np.isscalar(values):
+        # Single sample from the live loop: plain float math, no array allocation
+        return (float(values) * INV_FULLSCALE - ZERO_CAL) * INV_SCALE_CAL
+    return (np.asarray(values, dtype=np.float64) * INV_FULLSCALE - ZERO_CAL) * INV_SCALE_CAL
+
+
+@lru_cache(maxsize=8)
+def _design_fir(numtaps, cutoff, fs):
+    """firwin design as float32, built once per (numtaps, cutoff, fs). Shared, so callers must not modify it."""
+    return np.asarray(firwin(numtaps, cutoff / (fs / 2), window="hamming", pass_zero=True), dtype=np.float32)
+
+
+@lru_cache(maxsize=8)
+def _design_fir_q15(numtaps, cutoff, fs):
+    """The same design quantised to Q15, padded with a zero tap to the even count arm_fir_init_q15 requires."""
+    fir_coeffs_f32 = _design_fir(numtaps, cutoff, fs)
+    coeffs_q15 = np.zeros(numtaps + numtaps % 2, dtype=np.int16)
+    # CMSIS stores the taps time-reversed, so the pad goes first: it becomes the last tap, not b[0],
+    # and the output is not delayed by a sample
+    coeffs_q15[numtaps % 2:] = np.clip(np.round(fir_coeffs_f32 * 32768.0), -32768, 32767)
+    return coeffs_q15
+
+
+# CMSIS-DSP FIR instances and state buffers reused across files, keyed by (kind, numtaps, cutoff, fs)
+_FIR_CACHE = {}
+
+
+def get_fir(kind, numtaps, cutoff, fs, block_size):
+    """CMSIS-DSP FIR instance ("f32" or "q15") with zeroed state, ready for one block of `block_size` samples."""
+    key = (kind, numtaps, cutoff, fs)
+    entry = _FIR_CACHE.get(key)
+    if entry is None:
+        if kind == "q15":
+            entry = [dsp.arm_fir_instance_q15(), _design_fir_q15(numtaps, cutoff, fs), np.zeros(0, dtype=np.int16)]
+        else:
+            entry = [dsp.arm_fir_instance_f32(), _design_fir(numtaps, cutoff, fs), np.zeros(0, dtype=np.float32)]
+        _FIR_CACHE[key] = entry
+    fir_instance, coeffs, state = entry
+    # The state only ever grows, so a file no longer than an earlier one allocates nothing
+    if len(state) < len(coeffs) + block_size:
+        state = entry[2] = np.zeros(len(coeffs) + block_size, dtype=state.dtype)
+    else:
+        state.fill(0)
+    if kind == "q15":
+        dsp.arm_fir_init_q15(fir_instance, len(coeffs), coeffs, state)
+    else:
+        dsp.arm_fir_init_f32(fir_instance, len(coeffs), coeffs, state)
+    return fir_instance
 
 
 def fir_filter(values, cut_off_frequency, sampling_rate):
     """Apply FIR low-pass filter using the 'flat' API of CMSIS-DSP v1.10.1."""
+    global filter_backend
     try:
         nyquist = sampling_rate / 2
         numtaps = 51
         if nyquist <= 0 or cut_off_frequency <= 0 or cut_off_frequency >= nyquist or numtaps > len(values):
             return np.full_like(values, np.nan), np.array([], dtype=np.float32)
 
-        normalized_cutoff = cut_off_frequency / nyquist
-        fir_coefficients = firwin(numtaps=numtaps, cutoff=normalized_cutoff, window="hamming", pass_zero=True)
-        fir_coeffs_f32 = np.array(fir_coefficients, dtype=np.float32)
+        fir_coeffs_f32 = _design_fir(numtaps, cut_off_frequency, sampling_rate)
+        if FIR_USE_Q15:
+            try:
+                filtered_q15 = _fir_filter_q15(values, numtaps, cut_off_frequency, sampling_rate)
+                filter_backend = "CMSIS-DSP Q15"
+                return filtered_q15, fir_coeffs_f32
+            except Exception as e:
+                print(f"[CLIENT] Q15 FIR failed ({e}), falling back to float32.")
 
-        block_size = len(values)
-        state_f32 = np.zeros(numtaps + block_size - 1, dtype=np.float32)
-        fir_instance = dsp.arm_fir_instance_f32()
-        dsp.arm_fir_init_f32(fir_instance, numtaps, fir_coeffs_f32, state_f32)
+        fir_instance = get_fir("f32", numtaps, cut_off_frequency, sampling_rate, len(values))
         filtered_values = dsp.arm_fir_f32(fir_instance, values)
+        filter_backend = "CMSIS-DSP f32"
         return filtered_values, fir_coeffs_f32
     except Exception as e:
         print(f"[CLIENT] Error in fir_filter (CMSIS-DSP): {e}")
         return np.full_like(values, np.nan), np.array([], dtype=np.float32)
 
 
+if NUMBA_AVAILABLE:
+    # Reordering and fused multiply-add only; full fastmath would also assume no infinities,
+    # and the running min/max below start from +-inf
+    FAST_FLAGS = {"contract", "reassoc"}
+
+    @njit(cache=True, fastmath=FAST_FLAGS)
+    def _filtered_weights_kernel(adc, coeffs, dc, inv_fullscale, zero_cal, inv_scale, weights, stop):
+        """DC removal, FIR, reconstruction and weight scaling for samples [0, stop); returns (min, max)."""
+        numtaps = coeffs.shape[0]
+        w_min, w_max = np.inf, -np.inf
+        for i in range(stop):
+            acc = 0.0
+            # Zero initial state, like arm_fir: the first outputs only see the samples so far
+            for k in range(min(numtaps, i + 1)):
+                acc += coeffs[k] * (adc[i - k] - dc)
+            w = ((acc + dc) * inv_fullscale - zero_cal) * inv_scale
+            weights[i] = w
+            w_min = min(w_min, w)
+            w_max = max(w_max, w)
+        return w_min, w_max
+
+    # Compile now (or load from the cache) rather than on the first file
+    _filtered_weights_kernel(np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.float32), 0.0, 1.0, 0.0, 1.0,
+                             np.empty(1, dtype=np.float64), 1)
+
+
+@lru_cache(maxsize=8)
+def _steady_state_kernel(numtaps, cutoff, fs):
+    """Compile a weights kernel with this filter's taps unrolled as constants, for samples that see every tap."""
+    fir_coeffs_f32 = _design_fir(numtaps, cutoff, fs)
+    # float() of a float32 is exact, so the unrolled constants are the same taps CMSIS-DSP would use
+    taps = " +\n               ".join(f"{float(c)!r} * (adc[i - {k}] - dc)" for k, c in enumerate(fir_coeffs_f32))
+    source = f"""def steady_state(adc, dc, inv_fullscale, zero_cal, inv_scale, weights, start):
+    w_min, w_max = np.inf, -np.inf
+    for i in range(start, adc.shape[0]):
+        acc = ({taps})
+        w = ((acc + dc) * inv_fullscale - zero_cal) * inv_scale
+        weights[i] = w
+        w_min = min(w_min, w)
+        w_max = max(w_max, w)
+    return w_min, w_max
+"""
+    namespace = {"np": np}
+    exec(source, namespace)
+    # No cache=True: numba cannot cache functions built from generated source
+    return njit(fastmath=FAST_FLAGS)(namespace["steady_state"])
+
+
+def fused_filtered_weights(raw_adc_values, dc_offset, cut_off_frequency, sampling_rate, numtaps=51):
+    """Filtered weights and their peak-to-peak straight from the ADC counts, or None if the filter can't be built."""
+    nyquist = sampling_rate / 2
+    if nyquist <= 0 or cut_off_frequency <= 0 or cut_off_frequency >= nyquist or numtaps > len(raw_adc_values):
+        return None
+    fir_coeffs_f32 = _design_fir(numtaps, cut_off_frequency, sampling_rate)
+    adc = np.asarray(raw_adc_values)
+    weights = np.empty(len(adc), dtype=np.float64)
+    dc = float(dc_offset)
+    # The first numtaps - 1 outputs only see part of the taps; the rest run the unrolled kernel
+    warmup = numtaps - 1
+    warmup_min, warmup_max = _filtered_weights_kernel(adc, fir_coeffs_f32, dc, INV_FULLSCALE, ZERO_CAL, INV_SCALE_CAL,
+                                                      weights, warmup)
+    steady_state = _steady_state_kernel(numtaps, cut_off_frequency, sampling_rate)
+    steady_min, steady_max = steady_state(adc, dc, INV_FULLSCALE, ZERO_CAL, INV_SCALE_CAL, weights, warmup)
+    return weights, max(warmup_max, steady_max) - min(warmup_min, steady_min)
+
+
+def _fir_filter_q15(values, numtaps, cut_off_frequency, sampling_rate):
+    """Run the FIR in Q15 with arm_fir_q15 and return the result as float32 in the input's units."""
+    values = np.asarray(values, dtype=np.float32)
+    peak = float(np.max(np.abs(values)))
+    if peak == 0.0:
+        return np.zeros_like(values)
+    scale = Q15_HEADROOM * 32768.0 / peak
+    signal_q15 = np.clip(np.round(values * scale), -32768, 32767).astype(np.int16)
+
+    fir_instance = get_fir("q15", numtaps, cut_off_frequency, sampling_rate, len(values))
+    filtered_q15 = dsp.arm_fir_q15(fir_instance, signal_q15)
+    return np.asarray(filtered_q15, dtype=np.float32) / np.float32(scale)
+
+
+class RunningMinMax:
+    """Min and max of the finite values among the last `window` samples, kept up to date in O(1) per sample."""
+
+    def __init__(self, window):
+        self.window = window
+        self._mins = deque()  # (index, value), values increasing; the front is the minimum
+        self._maxs = deque()  # (index, value), values decreasing; the front is the maximum
+
+    def push(self, index, value):
+        # Drop samples that have left the window
+        while self._mins and self._mins[0][0] <= index - self.window:
+            self._mins.popleft()
+        while self._maxs and self._maxs[0][0] <= index - self.window:
+            self._maxs.popleft()
+        if not np.isfinite(value):
+            return  # Like nanmin/nanmax, gaps do not count
+        while self._mins and self._mins[-1][1] >= value:
+            self._mins.pop()
+        self._mins.append((index, value))
+        while self._maxs and self._maxs[-1][1] <= value:
+            self._maxs.pop()
+        self._maxs.append((index, value))
+
+    def reset(self):
+        self._mins.clear()
+        self._maxs.clear()
+
+    def empty(self):
+        return not self._mins
+
+    def min(self):
+        return self._mins[0][1]
+
+    def max(self):
+        return self._maxs[0][1]
+
+
+RAW_MINMAX = RunningMinMax(PLOT_BUFFER_SIZE)
+FILT_MINMAX = RunningMinMax(PLOT_BUFFER_SIZE)
+
+
+def ring_push(raw_weight, filtered_weight):
+    """Append one raw/filtered pair to the plot ring buffers."""
+    global ring_idx, ring_filled, ring_count
+    RAW_RING[ring_idx] = raw_weight
+    FILT_RING[ring_idx] = filtered_weight
+    RAW_MINMAX.push(ring_count, raw_weight)
+    FILT_MINMAX.push(ring_count, filtered_weight)
+    # Wrap with a compare rather than a modulo; the 500-sample window is not a power of two
+    ring_idx += 1
+    if ring_idx == PLOT_BUFFER_SIZE:
+        ring_idx = 0
+    ring_filled = min(ring_filled + 1, PLOT_BUFFER_SIZE)
+    ring_count += 1
+
+
+def ring_push_many(raw_weights, filtered_weights):
+    """Append a chunk of raw/filtered pairs (at most one buffer long) with slice copies."""
+    global ring_idx, ring_filled, ring_count
+    count = len(raw_weights)
+    first = min(count, PLOT_BUFFER_SIZE - ring_idx)
+    RAW_RING[ring_idx:ring_idx + first] = raw_weights[:first]
+    FILT_RING[ring_idx:ring_idx + first] = filtered_weights[:first]
+    if first < count:
+        RAW_RING[:count - first] = raw_weights[first:]
+        FILT_RING[:count - first] = filtered_weights[first:]
+    for offset in range(count):
+        RAW_MINMAX.push(ring_count + offset, raw_weights[offset])
+        FILT_MINMAX.push(ring_count + offset, filtered_weights[offset])
+    ring_idx += count
+    if ring_idx >= PLOT_BUFFER_SIZE:
+        ring_idx -= PLOT_BUFFER_SIZE
+    ring_filled = min(ring_filled + count, PLOT_BUFFER_SIZE)
+    ring_count += count
+
+
+def frame_timing(interval_ms):
+    """Timer interval and samples per frame that play one sample per `interval_ms` without redrawing faster than MIN_FRAME_INTERVAL_MS."""
+    per_frame = max(1, MIN_FRAME_INTERVAL_MS // max(1, interval_ms))
+    return interval_ms * per_frame, per_frame
+
+
+def ring_reset():
+    """Empty the plot ring buffers for a new file."""
+    global ring_idx, ring_filled, ring_count
+    ring_idx, ring_filled, ring_count = 0, 0, 0
+    RAW_MINMAX.reset()
+    FILT_MINMAX.reset()
+
+
+def ring_view(buf, idx, filled, out):
+    """Contents of a ring buffer oldest first; once it has wrapped they are copied into `out`, not a new array."""
+    if filled < len(buf):
+        return buf[:filled]
+    tail = len(buf) - idx
+    out[:tail] = buf[idx:]
+    out[tail:] = buf[:idx]
+    return out
+
+
 def init_plot(label="ADC Data"):
     """Initializes the Matplotlib figure, axes, and interactive widgets."""
     global current_fig, current_axes, current_raw_line, current_filtered_line, speed_radio_buttons
-    with plot_lock:
-        plt.close('all')
-        current_fig, current_axes = plt.subplots(2, 1, figsize=(10, 6))
-        
-        plt.subplots_adjust(left=0.25)
+    plt.close('all')
+    current_fig, current_axes = plt.subplots(2, 1, figsize=(10, 6))
+    
+    plt.subplots_adjust(left=0.25)
 
-        current_raw_line, = current_axes[0].plot([], [], 'r-', label="Raw Data")
-        current_filtered_line, = current_axes[1].plot([], [], 'k-', label=f"FIR-Filtered @ {FIR_CUTOFF_HZ}Hz (CMSIS-DSP)")
-        
-        current_axes[0].set_title(f"Raw ADC Data - {label}")
-        current_axes[0].set_ylabel("Weight")
-        current_axes[0].grid(True)
-        current_axes[0].legend(loc='upper right')
-        
-        current_axes[1].set_title(f"FIR-Filtered Data - {label}")
-        current_axes[1].set_xlabel("Sample Index")
-        current_axes[1].set_ylabel("Weight")
-        current_axes[1].grid(True)
-        current_axes[1].legend(loc='upper right')
-        
-        widget_ax = plt.axes([0.03, 0.4, 0.15, 0.25])
-        speed_options = ["1ms", "2ms", "5ms", "10ms", "20ms", "50ms", "100ms"]
-        
-        speed_radio_buttons = RadioButtons(widget_ax, speed_options, active=4)
+    current_raw_line, = current_axes[0].plot([], [], 'r-', label="Raw Data")
+    backend = f" ({filter_backend})" if filter_backend else ""
+    current_filtered_line, = current_axes[1].plot([], [], 'k-', label=f"FIR-Filtered @ {FIR_CUTOFF_HZ}Hz{backend}")
+    
+    current_axes[0].set_title(f"Raw ADC Data - {label}")
+    current_axes[0].set_ylabel("Weight")
+    current_axes[0].grid(True)
+    current_axes[0].legend(loc='upper right')
+    
+    current_axes[1].set_title(f"FIR-Filtered Data - {label}")
+    current_axes[1].set_xlabel("Sample Index")
+    current_axes[1].set_ylabel("Weight")
+    current_axes[1].grid(True)
+    current_axes[1].legend(loc='upper right')
+    current_axes[0].set_xlim(0, PLOT_BUFFER_SIZE)
+    current_axes[1].set_xlim(0, PLOT_BUFFER_SIZE)
+    
+    widget_ax = plt.axes([0.03, 0.4, 0.15, 0.25])
+    speed_options = ["1ms", "2ms", "5ms", "10ms", "20ms", "50ms", "100ms"]
+    
+    speed_radio_buttons = RadioButtons(widget_ax, speed_options, active=4)
 
-        def on_speed_change(label):
-            global USER_SELECTED_INTERVAL_MS
-            try:
-                new_interval = int(label.replace('ms', ''))
-                USER_SELECTED_INTERVAL_MS = new_interval
-                print(f"[CLIENT] Real-time speed changed to: {new_interval}ms interval.")
-            except ValueError:
-                pass
-        
-        speed_radio_buttons.on_clicked(on_speed_change)
-        current_fig.canvas.mpl_connect('close_event', lambda evt: shutdown_event.set())
-        print(f"[CLIENT] Plot initialized for: {label}. Close the plot window to exit.")
+    def on_speed_change(label):
+        global USER_SELECTED_INTERVAL_MS, samples_per_frame
+        try:
+            new_interval = int(label.replace('ms', ''))
+            USER_SELECTED_INTERVAL_MS = new_interval
+            timer_interval, samples_per_frame = frame_timing(new_interval)
+            if current_anim is not None:
+                current_anim.event_source.interval = timer_interval
+            print(f"[CLIENT] Real-time speed changed to: {new_interval}ms interval.")
+        except ValueError:
+            pass
+    
+    speed_radio_buttons.on_clicked(on_speed_change)
+    current_fig.canvas.mpl_connect('close_event', lambda evt: shutdown_event.set())
+    print(f"[CLIENT] Plot initialized for: {label}. Close the plot window to exit.")
 
 
-def update_live_plot():
-    """Updates the Matplotlib plots using global data buffers."""
-    if shutdown_event.is_set() or current_fig is None: return
-    with plot_lock:
-        try:
-            raw_data = np.array(list(current_raw_buffer))
-            filtered_data = np.array(list(current_filtered_buffer))
-            current_raw_line.set_data(np.arange(len(raw_data)), raw_data)
-            current_filtered_line.set_data(np.arange(len(filtered_data)), filtered_data)
-            current_axes[0].set_xlim(0, current_raw_buffer.maxlen)
-            current_axes[1].set_xlim(0, current_raw_buffer.maxlen)
-
-            if raw_data.size > 0 and np.any(np.isfinite(raw_data)):
-                min_y, max_y = np.nanmin(raw_data), np.nanmax(raw_data)
-                padding = (max_y - min_y) * 0.1 or 0.1
-                current_axes[0].set_ylim(min_y - padding, max_y + padding)
-            if filtered_data.size > 0 and np.any(np.isfinite(filtered_data)):
-                min_y, max_y = np.nanmin(filtered_data), np.nanmax(filtered_data)
+def animate(frame):
+    """FuncAnimation callback: plays the next samples into the ring buffers and updates the two lines."""
+    global playback_index
+    lines = (current_raw_line, current_filtered_line)
+    if shutdown_event.is_set() or current_fig is None: return lines
+    try:
+        if playback_raw_weights is not None and playback_index < len(playback_raw_weights):
+            end = min(playback_index + samples_per_frame, len(playback_raw_weights))
+            if end - playback_index == 1:
+                ring_push(playback_raw_weights[playback_index], playback_filtered_weights[playback_index])
+            else:
+                ring_push_many(playback_raw_weights[playback_index:end], playback_filtered_weights[playback_index:end])
+            playback_index = end
+
+        raw_data = ring_view(RAW_RING, ring_idx, ring_filled, RAW_ORDERED)
+        filtered_data = ring_view(FILT_RING, ring_idx, ring_filled, FILT_ORDERED)
+        current_raw_line.set_data(PLOT_X[:len(raw_data)], raw_data)
+        current_filtered_line.set_data(PLOT_X[:len(filtered_data)], filtered_data)
+
+        limits_changed = False
+        # Running min/max instead of scanning both buffers every frame
+        for ax, minmax in zip(current_axes, (RAW_MINMAX, FILT_MINMAX)):
+            if not minmax.empty():
+                min_y, max_y = minmax.min(), minmax.max()
                 padding = (max_y - min_y) * 0.1 or 0.1
-                current_axes[1].set_ylim(min_y - padding, max_y + padding)
-                
-            current_fig.canvas.draw_idle()
-            current_fig.canvas.flush_events()
-        except Exception as e:
-            if "FigureManagerBase" not in str(e):
-                 print(f"[CLIENT] Error during plot update: {e}")
+                new_low, new_high = min_y - padding, max_y + padding
+                low, high = ax.get_ylim()
+                # Tiny shifts are not worth a full redraw
+                tolerance = YLIM_TOLERANCE * (high - low)
+                if abs(new_low - low) > tolerance or abs(new_high - high) > tolerance:
+                    ax.set_ylim(new_low, new_high)
+                    limits_changed = True
+        if limits_changed:
+            # Blitting only re-renders the lines; new limits need the axes and ticks drawn once
+            current_fig.canvas.draw()
+    except Exception as e:
+        if "FigureManagerBase" not in str(e):
+             print(f"[CLIENT] Error during plot update: {e}")
+    return lines
 
 
 def process_and_plot_live_data(raw_adc_values, file_name):
     """Calculates amplitudes and DC offset, saves them, then simulates live plotting."""
-    if not raw_adc_values:
+    global playback_raw_weights, playback_filtered_weights, playback_index, samples_per_frame, current_anim
+    if len(raw_adc_values) == 0:
         print(f"[CLIENT] No data to process for {file_name}.")
         return
 
@@ -234,56 +556,53 @@ def process_and_plot_live_data(raw_adc_values, file_name):
     # This can be improved by passing the interval from the network thread
     source_sampling_rate = 1000.0 / source_data_interval
     
-    raw_amp, filtered_amp, stable_dc_offset = calculate_amplitudes_and_dc(raw_adc_values, source_sampling_rate)
+    # The file is complete before playback starts, so the whole signal is filtered once here
+    # (one CMSIS-DSP block call with the stable DC offset) and playback only indexes into it
+    raw_amp, filtered_amp, stable_dc_offset, filtered_weights = calculate_amplitudes_and_dc(raw_adc_values, source_sampling_rate)
     save_amplitude_results(file_name, raw_amp, filtered_amp)
 
+    num_taps = 51
+    raw_weights = normalize_to_weights(raw_adc_values)
+    if filtered_weights is None:
+        filtered_weights = np.full(len(raw_weights), np.nan)
+    else:
+        # Until a full set of taps has been seen, live filtering showed nothing
+        filtered_weights[:num_taps - 1] = np.nan
+
     print(f"[CLIENT] Starting live simulation for {file_name}...")
     init_plot(label=file_name)
-    num_taps = 51
-    min_dsp_samples = num_taps
+    playback_raw_weights, playback_filtered_weights, playback_index = raw_weights, filtered_weights, 0
     
-    for adc_value in raw_adc_values:
-        if shutdown_event.is_set():
-            print("[CLIENT] Plotting stopped by user.")
-            break
-        
-        # --- RECTIFIED: User selection ONLY affects the pause duration ---
-        current_interval_ms = USER_SELECTED_INTERVAL_MS
-        
-        dsp_raw_adc_buffer.append(adc_value)
-        raw_weight = normalize_to_weights([adc_value])[0]
-        current_raw_buffer.append(raw_weight)
-        
-        filtered_weight = np.nan
-        if len(dsp_raw_adc_buffer) >= min_dsp_samples:
-            dsp_window = np.array(list(dsp_raw_adc_buffer)[-min_dsp_samples:], dtype=np.float32)
-            
-            processed_window = dsp_window - stable_dc_offset
-            
-            # --- RECTIFIED: Always use the source data's sampling rate for the filter ---
-            filtered_ac, _ = fir_filter(processed_window, FIR_CUTOFF_HZ, source_sampling_rate)
-            
-            if filtered_ac.size > 0 and not np.all(np.isnan(filtered_ac)):
-                reconstructed_signal = filtered_ac[-1] + stable_dc_offset
-                filtered_weight = normalize_to_weights([reconstructed_signal])[0]
-        
-        current_filtered_buffer.append(filtered_weight)
-        update_live_plot()
-        # The pause is the only thing that changes in real-time
-        plt.pause(current_interval_ms / 1000.0)
+    # --- RECTIFIED: User selection ONLY affects the timer interval ---
+    # A timer plays the samples due since the last frame and only the two lines are re-rendered
+    # (blitting), instead of a full canvas redraw per sample
+    timer_interval, samples_per_frame = frame_timing(USER_SELECTED_INTERVAL_MS)
+    current_anim = FuncAnimation(current_fig, animate, interval=timer_interval, blit=True, cache_frame_data=False)
+    while playback_index < len(raw_weights) and not shutdown_event.is_set():
+        plt.pause(0.05)  # Runs the GUI event loop; the animation timer does the work
+    if shutdown_event.is_set():
+        print("[CLIENT] Plotting stopped by user.")
+    current_anim.event_source.stop()
+    # Blitted lines are skipped by normal redraws, so hand them back for the final figure
+    current_raw_line.set_animated(False)
+    current_filtered_line.set_animated(False)
+    current_fig.canvas.draw_idle()
 
     print(f"[CLIENT] Finished simulation for {file_name}.")
 
 
 def recvall(sock, n):
-    """Helper function to receive n bytes or return None on EOF."""
-    data = b''
-    while len(data) < n:
+    """Helper function to receive n bytes (as a bytearray) or return None on EOF."""
+    # Receive straight into one preallocated buffer instead of growing a bytes object per chunk
+    data = bytearray(n)
+    view = memoryview(data)
+    received = 0
+    while received < n:
         if shutdown_event.is_set(): return None
         try:
-            packet = sock.recv(n - len(data))
-            if not packet: return None
-            data += packet
+            count = sock.recv_into(view[received:], n - received)
+            if not count: return None
+            received += count
         except socket.timeout:
             continue
     return data
@@ -295,11 +614,13 @@ def receive_data_loop(data_queue):
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             s.settimeout(1.0)
+            # Room for whole file payloads in the kernel; set before connect so the window can scale
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER_BYTES)
             s.connect((SERVER_IP, SERVER_PORT))
             print("[CLIENT] Connected to server.")
             config_len_bytes = recvall(s, CONFIG_LENGTH_BYTES)
             if not config_len_bytes: raise ConnectionError("Server disconnected.")
-            config_len = int.from_bytes(config_len_bytes, 'big')
+            config_len = _HDR1.unpack_from(config_len_bytes)[0]
             recvall(s, config_len)
             print("[CLIENT] Received and ignored server config.")
 
@@ -308,7 +629,7 @@ def receive_data_loop(data_queue):
                 if not filename_len_bytes:
                     print("[CLIENT] Server disconnected or no more files.")
                     break
-                filename_length = int.from_bytes(filename_len_bytes, 'big')
+                filename_length = _HDR1.unpack_from(filename_len_bytes)[0]
                 filename_bytes = recvall(s, filename_length)
                 if not filename_bytes: break
                 file_name = filename_bytes.decode('utf-8')
@@ -317,19 +638,16 @@ def receive_data_loop(data_queue):
                     break
                 file_content_len_bytes = recvall(s, FILE_CONTENT_LENGTH_BYTES)
                 if not file_content_len_bytes: break
-                file_content_length = int.from_bytes(file_content_len_bytes, 'big')
+                file_content_length = _HDR2.unpack_from(file_content_len_bytes)[0]
                 file_content_data = recvall(s, file_content_length)
                 if not file_content_data: break
-                lines = file_content_data.decode(errors='ignore').splitlines()
-                raw_adc_values = []
-                for line in lines:
-                    if 'ADC:' in line:
-                        try:
-                            adc_val = int(line.strip().split("ADC:")[-1])
-                            raw_adc_values.append(adc_val)
-                        except (ValueError, IndexError):
-                            pass
-                if raw_adc_values:
+                # Scan the raw bytes in C instead of decoding and splitting line by line
+                adc_matches = ADC_RE.findall(file_content_data)
+                if adc_matches:
+                    raw_adc_values = np.fromiter(map(int, adc_matches), dtype=np.int64, count=len(adc_matches))
+                else:
+                    raw_adc_values = np.empty(0, dtype=np.int64)
+                if raw_adc_values.size > 0:
                     data_queue.put((raw_adc_values, file_name))
     except ConnectionRefusedError:
         print("[CLIENT] Connection refused. Is the server running?")
@@ -358,9 +676,7 @@ if __name__ == "__main__":
                 
                 raw_adc_values, file_name = data_packet
                 
-                current_raw_buffer.clear()
-                current_filtered_buffer.clear()
-                dsp_raw_adc_buffer.clear()
+                ring_reset()
                 
                 process_and_plot_live_data(raw_adc_values, file_name)
 
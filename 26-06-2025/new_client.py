@@ -1,13 +1,20 @@
 # File: standalone_fir_analyzer.py
 # FINAL version: A standalone application with a real-time file loader.
 
+import matplotlib
+# Dense sample traces: merge vertices that would not change the drawn line, and hand Agg
+# long paths in chunks. Set before pyplot is imported so every figure picks them up.
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+matplotlib.rcParams['agg.path.chunksize'] = 10000
 import matplotlib.pyplot as plt
 from matplotlib.widgets import RadioButtons, Button
+from matplotlib.animation import FuncAnimation
 import numpy as np
 import time
 from scipy.signal import firwin
 import os
-from collections import deque
+import re
 import tkinter as tk
 from tkinter import filedialog
 import threading
@@ -20,48 +27,141 @@ except ImportError:
     print("[APP] ERROR: CMSIS-DSP library not found. Please install it using 'pip install cmsisdsp'")
     exit()
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("[APP] Numba not found; calibration math will run through NumPy.")
+
 # --- Global state variables ---
 USER_SELECTED_INTERVAL_MS = 20  # Default plotting speed
+# Fastest the plot is redrawn; faster speeds play several samples per redraw instead
+MIN_FRAME_INTERVAL_MS = 16
 simulation_running = False # Flag to prevent overlapping simulations
 
 # Configuration
 FIR_CUTOFF_HZ = 10.0
+# One "ADC:<int>" per line; the value is whatever follows the last "ADC:" on the line
+ADC_RE = re.compile(rb'ADC:[ \t]*([+-]?\d+)[ \t]*\r?$', re.MULTILINE)
 
 # Calibration constants
 ZERO_CAL = 0.01823035255075
 SCALE_CAL = 0.00000451794631
+ADC_FULL_SCALE = float(0x80000000)
+INV_FULL_SCALE = 1.0 / ADC_FULL_SCALE
+INV_SCALE_CAL = 1.0 / SCALE_CAL if SCALE_CAL != 0 else 0.0  # A zero scale gives zero weights
+
+# FIR coefficients, CMSIS-DSP instance and state buffer, keyed by (cutoff, sampling rate, numtaps)
+_fir_cache = {}
+
+
+class RingBuffer:
+    """
+    Fixed-size float64 sample buffer backed by a preallocated NumPy array. Each sample is
+    written twice, at head and head + maxlen, so the contents are always one contiguous
+    view (oldest first) and never need copying. The min and max of the non-NaN samples
+    are kept up to date as samples come and go, so the plot never has to rescan them.
+    """
+    __slots__ = ('data', 'head', 'full', 'maxlen', 'min', 'max')
+
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self.data = np.full(2 * maxlen, np.nan) # NaN marks slots not written yet
+        self.head = 0 # Next slot to write; the oldest sample once the buffer is full
+        self.full = False
+        self.min, self.max = np.inf, -np.inf
+
+    def append(self, value):
+        evicted = self.data[self.head] if self.full else np.nan
+        self.data[self.head] = value
+        self.data[self.head + self.maxlen] = value
+        self.head += 1
+        if self.head == self.maxlen:
+            self.head = 0
+            self.full = True
+        if evicted == self.min or evicted == self.max:
+            # The old extreme just left the window: one scan to find the new one
+            self._rescan()
+        elif value == value: # Skip NaN
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def _rescan(self):
+        samples = self.view()
+        if samples.size == 0 or np.isnan(samples).all():
+            self.min, self.max = np.inf, -np.inf
+        else:
+            self.min, self.max = np.nanmin(samples), np.nanmax(samples)
+
+    def extent(self):
+        """(min, max) of the non-NaN samples, or None if there are none."""
+        return (self.min, self.max) if self.min <= self.max else None
+
+    def clear(self):
+        self.data.fill(np.nan)
+        self.head = 0
+        self.full = False
+        self.min, self.max = np.inf, -np.inf
+
+    def view(self):
+        """The buffered samples, oldest first. A view, so it changes with the next append."""
+        if self.full:
+            return self.data[self.head:self.head + self.maxlen]
+        return self.data[:self.head]
+
+    def window(self):
+        """Always maxlen samples, oldest first, NaN-padded until the buffer fills up."""
+        if self.full:
+            return self.data[self.head:self.head + self.maxlen]
+        return self.data[:self.maxlen]
+
+    def __len__(self):
+        return self.maxlen if self.full else self.head
+
 
 # Global variables for plotting
-current_raw_buffer = deque(maxlen=500)
-current_filtered_buffer = deque(maxlen=500)
-dsp_raw_adc_buffer = deque(maxlen=500)
+PLOT_WINDOW_SIZE = 500
+YLIM_TOLERANCE = 0.01  # Fraction of the current y-span a limit must move before it is reset
+current_raw_buffer = RingBuffer(maxlen=PLOT_WINDOW_SIZE)
+current_filtered_buffer = RingBuffer(maxlen=PLOT_WINDOW_SIZE)
+# Sample positions for the x-axis, sliced to the fill level instead of a new np.arange every frame
+_X_INDEX = np.arange(PLOT_WINDOW_SIZE, dtype=np.int32)
 current_fig, current_axes = None, None
 current_raw_line, current_filtered_line = None, None
 plot_lock = threading.Lock() # Retained for thread-safe matplotlib calls
 # Widgets need to be global to prevent garbage collection
 speed_radio_buttons = None
 load_button = None
+# Playback of the loaded file: precomputed weights and the animation driving it (kept alive here)
+g_animation = None
+g_raw_weights = np.array([])
+g_filtered_weights = np.array([])
+g_file_name = ""
 
 
 def calculate_amplitudes_and_dc(raw_adc_values):
-    """Calculates amplitudes and the STABLE DC offset for the entire signal."""
+    """
+    Calculates amplitudes and the STABLE DC offset for the entire signal.
+    Also returns the raw and filtered signals as weights (None if they could not be computed).
+    """
     print("[APP] Calculating signal amplitudes and stable DC offset...")
-    if not raw_adc_values:
-        return None, None, 0
+    if len(raw_adc_values) == 0:
+        return None, None, 0, None, None
 
     try:
         # Assuming a fixed sampling rate for analysis based on typical data
         sampling_rate = 50.0 
         
-        signal_as_f32 = np.array(raw_adc_values, dtype=np.float32)
-        stable_dc_offset = np.mean(signal_as_f32)
+        # Weights, mean and DC-removed float32 signal from two passes over the int counts
+        raw_weights, dc_removed_signal, stable_dc_offset = preprocess_adc(raw_adc_values)
         print(f"[APP] Stable DC offset calculated: {stable_dc_offset:.2f}")
 
-        raw_weights = normalize_to_weights(raw_adc_values)
         raw_amplitude = np.nanmax(raw_weights) - np.nanmin(raw_weights)
         print(f"[APP] Raw data amplitude (peak-to-peak): {raw_amplitude:.2f}")
         
-        dc_removed_signal = signal_as_f32 - stable_dc_offset
         filtered_ac_signal, _ = fir_filter(dc_removed_signal, FIR_CUTOFF_HZ, sampling_rate)
 
         if filtered_ac_signal.size > 0 and not np.all(np.isnan(filtered_ac_signal)):
@@ -70,14 +170,15 @@ def calculate_amplitudes_and_dc(raw_adc_values):
             filtered_amplitude = np.nanmax(filtered_weights) - np.nanmin(filtered_weights)
             print(f"[APP] Filtered data amplitude (peak-to-peak): {filtered_amplitude:.2f}")
         else:
+            filtered_weights = None
             filtered_amplitude = None
             print("[APP] Could not generate filtered signal to calculate amplitude.")
             
-        return raw_amplitude, filtered_amplitude, stable_dc_offset
+        return raw_amplitude, filtered_amplitude, stable_dc_offset, raw_weights, filtered_weights
         
     except Exception as e:
         print(f"[APP] Error during amplitude calculation: {e}")
-        return None, None, 0
+        return None, None, 0, None, None
 
 def save_amplitude_results(original_file_name, raw_amplitude, filtered_amplitude):
     """Saves the amplitude calculation results to a unique file."""
@@ -109,17 +210,79 @@ def save_amplitude_results(original_file_name, raw_amplitude, filtered_amplitude
         print(f"[APP] Error saving amplitude to file: {e}")
 
 
+def read_adc_values(filepath):
+    """Parse every "ADC:<int>" line of a data file straight into an int64 array."""
+    # np.fromregex scans the file in one pass; it needs a structured dtype for a single group.
+    # The file is opened in binary so the content matches the bytes pattern.
+    with open(filepath, 'rb') as f:
+        return np.fromregex(f, ADC_RE, dtype=[("adc", np.int64)])["adc"]
+
+
 def normalize_to_weights(values):
     """Normalize raw ADC values to physical weights."""
-    weights = []
-    for val in values:
-        try:
-            data_in = float(val) / float(0x80000000)
-            calculated_weight = (data_in - ZERO_CAL) / SCALE_CAL if SCALE_CAL != 0 else 0.0
-            weights.append(calculated_weight)
-        except (ValueError, TypeError):
-            weights.append(np.nan)
-    return np.array(weights)
+    try:
+        raw = np.asarray(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        # Not all numeric: convert one by one so only the bad values become NaN
+        raw = np.array([_to_float_or_nan(val) for val in values])
+    if NUMBA_AVAILABLE and raw.ndim == 1:
+        return _normalize_kernel(raw, INV_FULL_SCALE, ZERO_CAL, INV_SCALE_CAL)
+    # Multiplying by the reciprocals avoids two divisions per sample
+    return (raw * INV_FULL_SCALE - ZERO_CAL) * INV_SCALE_CAL
+
+
+def preprocess_adc(raw_adc_values):
+    """
+    Everything the analysis needs from the raw ADC counts, read straight from the int array:
+    the weights, the signal minus its mean as float32 (ready for CMSIS-DSP), and the mean itself.
+    """
+    raw_adc_values = np.asarray(raw_adc_values)
+    if NUMBA_AVAILABLE:
+        return _preprocess_kernel(raw_adc_values, INV_FULL_SCALE, ZERO_CAL, INV_SCALE_CAL)
+    stable_dc_offset = float(np.mean(raw_adc_values))
+    raw_weights = (raw_adc_values * INV_FULL_SCALE - ZERO_CAL) * INV_SCALE_CAL
+    return raw_weights, (raw_adc_values - stable_dc_offset).astype(np.float32), stable_dc_offset
+
+
+if NUMBA_AVAILABLE:
+    # Only fused multiply-add contraction is allowed; full fastmath would assume there are no NaNs
+    FAST_FLAGS = {"contract"}
+
+    @njit(parallel=True, fastmath=FAST_FLAGS, cache=True)
+    def _normalize_kernel(raw, inv_full_scale, zero_cal, inv_scale_cal):
+        """Calibration as one multiply-add chain per sample, split across cores."""
+        out = np.empty(raw.shape[0], dtype=np.float64)
+        for i in prange(raw.shape[0]):
+            out[i] = (raw[i] * inv_full_scale - zero_cal) * inv_scale_cal
+        return out
+
+    @njit(parallel=True, fastmath=FAST_FLAGS, cache=True)
+    def _preprocess_kernel(adc, inv_full_scale, zero_cal, inv_scale_cal):
+        """Sum for the mean in one parallel pass; weights and the float32 DC-removed signal in a second."""
+        n = adc.shape[0]
+        total = 0.0
+        for i in prange(n):
+            total += adc[i]
+        dc = total / n
+        weights = np.empty(n, dtype=np.float64)
+        ac = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            value = float(adc[i])
+            weights[i] = (value * inv_full_scale - zero_cal) * inv_scale_cal
+            ac[i] = value - dc
+        return weights, ac, dc
+
+    # Compile now (or load from the cache) rather than on the first file
+    _normalize_kernel(np.zeros(1), INV_FULL_SCALE, ZERO_CAL, INV_SCALE_CAL)
+    _preprocess_kernel(np.zeros(1, dtype=np.int64), INV_FULL_SCALE, ZERO_CAL, INV_SCALE_CAL)
+
+
+def _to_float_or_nan(val):
+    """float(val), or NaN if it cannot be converted."""
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return np.nan
 
 
 def remove_dc_offset_temp(values):
@@ -134,6 +297,26 @@ def remove_dc_offset_temp(values):
         return np.full_like(np.array(values, dtype=np.float32), np.nan)
 
 
+def get_fir(cut_off_frequency, sampling_rate, numtaps, block_size):
+    """Coefficients and a CMSIS-DSP FIR instance with zeroed state, reused across calls with the same parameters."""
+    key = (cut_off_frequency, sampling_rate, numtaps)
+    entry = _fir_cache.get(key)
+    if entry is None:
+        normalized_cutoff = cut_off_frequency / (sampling_rate / 2)
+        fir_coefficients = firwin(numtaps=numtaps, cutoff=normalized_cutoff, window="hamming", pass_zero=True)
+        fir_coeffs_f32 = np.array(fir_coefficients, dtype=np.float32)
+        entry = _fir_cache[key] = [fir_coeffs_f32, dsp.arm_fir_instance_f32(), np.zeros(0, dtype=np.float32)]
+    fir_coeffs_f32, fir_instance, state_f32 = entry
+    # The state only grows, so blocks no longer than an earlier one reuse it
+    if len(state_f32) < numtaps + block_size - 1:
+        state_f32 = entry[2] = np.zeros(numtaps + block_size - 1, dtype=np.float32)
+    else:
+        state_f32.fill(0)
+    # Every call filters an independent block, so the instance starts again from an empty state
+    dsp.arm_fir_init_f32(fir_instance, numtaps, fir_coeffs_f32, state_f32)
+    return fir_coeffs_f32, fir_instance
+
+
 def fir_filter(values, cut_off_frequency, sampling_rate):
     """Apply FIR low-pass filter using the 'flat' API of CMSIS-DSP v1.10.1."""
     try:
@@ -142,14 +325,7 @@ def fir_filter(values, cut_off_frequency, sampling_rate):
         if nyquist <= 0 or cut_off_frequency <= 0 or cut_off_frequency >= nyquist or numtaps > len(values):
             return np.full_like(values, np.nan), np.array([], dtype=np.float32)
 
-        normalized_cutoff = cut_off_frequency / nyquist
-        fir_coefficients = firwin(numtaps=numtaps, cutoff=normalized_cutoff, window="hamming", pass_zero=True)
-        fir_coeffs_f32 = np.array(fir_coefficients, dtype=np.float32)
-
-        block_size = len(values)
-        state_f32 = np.zeros(numtaps + block_size - 1, dtype=np.float32)
-        fir_instance = dsp.arm_fir_instance_f32()
-        dsp.arm_fir_init_f32(fir_instance, numtaps, fir_coeffs_f32, state_f32)
+        fir_coeffs_f32, fir_instance = get_fir(cut_off_frequency, sampling_rate, numtaps, len(values))
         filtered_values = dsp.arm_fir_f32(fir_instance, values)
         return filtered_values, fir_coeffs_f32
     except Exception as e:
@@ -177,33 +353,20 @@ def on_load_file(event):
         print("[APP] No file selected.")
         return
 
-    simulation_running = True
     print(f"[APP] Loading data from: {filepath}")
     
     try:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
+        raw_adc_values = read_adc_values(filepath)
         
-        raw_adc_values = []
-        for line in lines:
-            if 'ADC:' in line:
-                try:
-                    adc_val = int(line.strip().split("ADC:")[-1])
-                    raw_adc_values.append(adc_val)
-                except (ValueError, IndexError):
-                    pass
-        
-        if raw_adc_values:
+        if raw_adc_values.size > 0:
             # Clear previous data and start the new simulation
             current_raw_buffer.clear()
             current_filtered_buffer.clear()
-            dsp_raw_adc_buffer.clear()
             process_and_plot_live_data(raw_adc_values, filepath)
         else:
             print("[APP] No valid ADC data found in the selected file.")
     except Exception as e:
         print(f"[APP] Error reading or processing file: {e}")
-    finally:
         simulation_running = False
 
 
@@ -215,8 +378,11 @@ def init_plot():
         current_fig, current_axes = plt.subplots(2, 1, figsize=(10, 6))
         plt.subplots_adjust(left=0.25, bottom=0.2)
 
-        current_raw_line, = current_axes[0].plot([], [], 'r-', label="Raw Data")
-        current_filtered_line, = current_axes[1].plot([], [], 'k-', label=f"FIR-Filtered @ {FIR_CUTOFF_HZ}Hz (CMSIS-DSP)")
+        # animated=True keeps the lines out of normal redraws; FuncAnimation blits them.
+        # The x data is fixed to the window positions here; frames only replace the y data
+        empty_window = np.full(PLOT_WINDOW_SIZE, np.nan)
+        current_raw_line, = current_axes[0].plot(_X_INDEX, empty_window, 'r-', label="Raw Data", animated=True)
+        current_filtered_line, = current_axes[1].plot(_X_INDEX, empty_window, 'k-', label=f"FIR-Filtered @ {FIR_CUTOFF_HZ}Hz (CMSIS-DSP)", animated=True)
         
         current_axes[0].set_title("Load a file to begin analysis")
         current_axes[0].set_ylabel("Weight")
@@ -228,6 +394,8 @@ def init_plot():
         current_axes[1].set_ylabel("Weight")
         current_axes[1].grid(True)
         current_axes[1].legend(loc='upper right')
+        current_axes[0].set_xlim(0, current_raw_buffer.maxlen)
+        current_axes[1].set_xlim(0, current_raw_buffer.maxlen)
         
         # --- Speed Control Widget ---
         speed_widget_ax = plt.axes([0.05, 0.5, 0.15, 0.25])
@@ -236,6 +404,9 @@ def init_plot():
         def on_speed_change(label):
             global USER_SELECTED_INTERVAL_MS
             USER_SELECTED_INTERVAL_MS = int(label.replace('ms', ''))
+            # If an animation is running, update its interval in real-time
+            if g_animation and g_animation.event_source:
+                g_animation.event_source.interval = frame_timing(USER_SELECTED_INTERVAL_MS)[0]
             print(f"[APP] Real-time speed changed to: {USER_SELECTED_INTERVAL_MS}ms interval.")
         speed_radio_buttons.on_clicked(on_speed_change)
 
@@ -246,42 +417,76 @@ def init_plot():
 
 
 def update_live_plot():
-    """Updates the Matplotlib plots using global data buffers."""
+    """Updates the plot lines from the global data buffers; FuncAnimation blits them afterwards."""
     if current_fig is None: return
     with plot_lock:
         try:
-            raw_data = np.array(list(current_raw_buffer))
-            filtered_data = np.array(list(current_filtered_buffer))
-            current_raw_line.set_data(np.arange(len(raw_data)), raw_data)
-            current_filtered_line.set_data(np.arange(len(filtered_data)), filtered_data)
-            current_axes[0].set_xlim(0, current_raw_buffer.maxlen)
-            current_axes[1].set_xlim(0, current_raw_buffer.maxlen)
-
-            if raw_data.size > 0 and np.any(np.isfinite(raw_data)):
-                min_y, max_y = np.nanmin(raw_data), np.nanmax(raw_data)
-                padding = (max_y - min_y) * 0.1 or 0.1
-                current_axes[0].set_ylim(min_y - padding, max_y + padding)
-            if filtered_data.size > 0 and np.any(np.isfinite(filtered_data)):
-                min_y, max_y = np.nanmin(filtered_data), np.nanmax(filtered_data)
-                padding = (max_y - min_y) * 0.1 or 0.1
-                current_axes[1].set_ylim(min_y - padding, max_y + padding)
-                
-            current_fig.canvas.draw_idle()
-            current_fig.canvas.flush_events()
+            # Same length every frame (NaN past the fill level), so only the y data changes
+            current_raw_line.set_ydata(current_raw_buffer.window())
+            current_filtered_line.set_ydata(current_filtered_buffer.window())
+
+            limits_changed = False
+            # Running extents from the buffers instead of nanmin/nanmax over both every frame
+            for ax, buffer in zip(current_axes, (current_raw_buffer, current_filtered_buffer)):
+                extent = buffer.extent()
+                if extent is not None:
+                    min_y, max_y = extent
+                    padding = (max_y - min_y) * 0.1 or 0.1
+                    new_low, new_high = float(min_y - padding), float(max_y + padding)
+                    low, high = ax.get_ylim()
+                    # Ignore sub-pixel drift of the extent; each reset costs a full figure draw
+                    tolerance = YLIM_TOLERANCE * (high - low)
+                    if abs(new_low - low) > tolerance or abs(new_high - high) > tolerance:
+                        ax.set_ylim(new_low, new_high)
+                        limits_changed = True
+            if limits_changed:
+                # Blitting only re-renders the lines over the cached background; new limits
+                # need the axes and ticks drawn once, and FuncAnimation then re-caches it
+                current_fig.canvas.draw()
         except Exception as e:
             if "FigureManagerBase" not in str(e):
                  print(f"[APP] Error during plot update: {e}")
 
 
+def frame_timing(interval_ms):
+    """Timer interval and samples per frame that play one sample per `interval_ms` without redrawing faster than MIN_FRAME_INTERVAL_MS."""
+    # Round up: rounding down would let the timer fire sooner than MIN_FRAME_INTERVAL_MS (e.g. every 10ms at 10ms)
+    per_frame = max(1, -(-MIN_FRAME_INTERVAL_MS // max(1, interval_ms)))
+    return interval_ms * per_frame, per_frame
+
+
+def playback_frames(n_samples):
+    """FuncAnimation frames: (start, stop) sample ranges, sized from the speed selected at each step."""
+    start = 0
+    while start < n_samples:
+        stop = min(n_samples, start + frame_timing(USER_SELECTED_INTERVAL_MS)[1])
+        yield start, stop
+        start = stop
+
+
+def update_animation_frame(frame):
+    """FuncAnimation callback: plays samples [start, stop) into the plot buffers and returns the lines to blit."""
+    global simulation_running
+    start, stop = frame
+    for i in range(start, stop):
+        current_raw_buffer.append(g_raw_weights[i])
+        current_filtered_buffer.append(g_filtered_weights[i])
+    update_live_plot()
+    if stop == len(g_raw_weights):
+        simulation_running = False
+        print(f"[APP] Finished simulation for {g_file_name}.")
+    return current_raw_line, current_filtered_line
+
+
 def process_and_plot_live_data(raw_adc_values, file_name):
-    """Calculates amplitudes and DC offset, saves them, then simulates live plotting."""
-    if not raw_adc_values:
+    """Calculates amplitudes and DC offset, saves them, then starts the animated live plot."""
+    global g_animation, g_raw_weights, g_filtered_weights, g_file_name, simulation_running
+    if len(raw_adc_values) == 0:
         print(f"[APP] No data to process for {file_name}.")
         return
 
-    # Use a fixed sampling rate for one-time analysis
-    sampling_rate = 50.0 
-    raw_amp, filtered_amp, stable_dc_offset = calculate_amplitudes_and_dc(raw_adc_values)
+    # The whole signal is filtered once here (with the stable DC offset); playback only indexes into it
+    raw_amp, filtered_amp, stable_dc_offset, raw_weights, filtered_weights = calculate_amplitudes_and_dc(raw_adc_values)
     save_amplitude_results(file_name, raw_amp, filtered_amp)
 
     print(f"[APP] Starting live simulation for {file_name}...")
@@ -292,30 +497,29 @@ def process_and_plot_live_data(raw_adc_values, file_name):
     current_axes[1].set_title(f"FIR-Filtered Data - {base_name}")
 
     num_taps = 51
-    min_dsp_samples = num_taps
-    
-    for adc_value in raw_adc_values:
-        current_interval_ms = USER_SELECTED_INTERVAL_MS
-        
-        dsp_raw_adc_buffer.append(adc_value)
-        raw_weight = normalize_to_weights([adc_value])[0]
-        current_raw_buffer.append(raw_weight)
-        
-        filtered_weight = np.nan
-        if len(dsp_raw_adc_buffer) >= min_dsp_samples:
-            dsp_window = np.array(list(dsp_raw_adc_buffer)[-min_dsp_samples:], dtype=np.float32)
-            processed_window = dsp_window - stable_dc_offset
-            filtered_ac, _ = fir_filter(processed_window, FIR_CUTOFF_HZ, sampling_rate)
-            
-            if filtered_ac.size > 0 and not np.all(np.isnan(filtered_ac)):
-                reconstructed_signal = filtered_ac[-1] + stable_dc_offset
-                filtered_weight = normalize_to_weights([reconstructed_signal])[0]
-        
-        current_filtered_buffer.append(filtered_weight)
-        update_live_plot()
-        plt.pause(current_interval_ms / 1000.0)
-
-    print(f"[APP] Finished simulation for {file_name}.")
+    if filtered_weights is None:
+        filtered_weights = np.full(len(raw_adc_values), np.nan)
+    else:
+        # Until a full set of taps has been seen, live filtering showed nothing
+        filtered_weights[:num_taps - 1] = np.nan
+    g_raw_weights = raw_weights if raw_weights is not None else normalize_to_weights(raw_adc_values)
+    g_filtered_weights = filtered_weights
+    g_file_name = file_name
+
+    # A timer plays the samples due since the last frame and only the two lines are re-rendered (blitting),
+    # instead of a blocking plt.pause loop that redrew the whole figure per sample
+    simulation_running = True
+    g_animation = FuncAnimation(
+        current_fig,
+        update_animation_frame,
+        frames=playback_frames(len(g_raw_weights)),
+        interval=frame_timing(USER_SELECTED_INTERVAL_MS)[0],
+        blit=True,
+        repeat=False,
+        # Frames are plain sample ranges; don't keep one per frame for the whole file
+        cache_frame_data=False
+    )
+    current_fig.canvas.draw()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,31 @@
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("cmsisdsp")  # band_fir_options exits without it
+pytest.importorskip("matplotlib")
+signal = pytest.importorskip("scipy.signal")
+
+
+@pytest.fixture(scope="module")
+def band_fir():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "band_fir_options.py")
+    spec = importlib.util.spec_from_file_location("band_fir_options", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("numtaps", [51, 50])
+def test_q15_impulse_response_matches_lfilter(band_fir, numtaps):
+    cutoff, fs = 10.0, 50.0
+    impulse = np.zeros(200, dtype=np.float32)
+    impulse[0] = 1.0
+
+    filtered = band_fir._fir_filter_q15(impulse, numtaps, cutoff, fs)
+    expected = signal.lfilter(band_fir._design_fir(numtaps, cutoff, fs), 1.0, impulse)
+
+    assert np.argmax(filtered) == np.argmax(expected)
+    np.testing.assert_allclose(filtered, expected, atol=1e-3)
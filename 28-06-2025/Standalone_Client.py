@@ -1,3 +1,9 @@
+import matplotlib
+# Dense sample traces: merge vertices that would not change the drawn line, and hand Agg
+# long paths in chunks. Set before pyplot is imported so every figure picks them up.
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+matplotlib.rcParams['agg.path.chunksize'] = 10000
 import matplotlib.pyplot as plt
 from matplotlib.widgets import RadioButtons
 from matplotlib.animation import FuncAnimation
@@ -5,11 +11,13 @@ import numpy as np
 import time
 from scipy.signal import firwin
 import os
+import re
 from collections import deque
 import tkinter as tk
 from tkinter import filedialog
-import threading
-import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 try:
     import cmsisdsp as dsp
@@ -19,22 +27,43 @@ except ImportError:
     print(f"[APP] ERROR: CMSIS-DSP library not found. Please install it using 'pip install cmsisdsp'")
     exit()
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("[APP] Numba not found; calibration math will run through NumPy.")
+
 # --- Global state variables ---
 USER_SELECTED_INTERVAL_MS = 20
 selected_directory = ""
 g_animation = None
+# Files are parsed and filtered in a worker process, so the GUI thread never waits on the GIL
+g_executor = None
+g_pending_load = None  # Future of the most recent file selection
 g_all_raw_weights = np.array([])
 g_all_filtered_weights = np.array([])
+g_x_index = np.array([])  # Sample positions of the loaded file, built once per animation
 # --- RECTIFIED: Removed g_simulation_running flag in favor of managing the g_animation object directly ---
 
 PLOT_WINDOW_SIZE = 500
+# Fastest the plot is redrawn; faster speeds play several samples per redraw instead
+MIN_FRAME_INTERVAL_MS = 16
 
 # Configuration
 FIR_CUTOFF_HZ = 10.0
+# One "ADC:<int>" per line; the value is whatever follows the last "ADC:" on the line
+ADC_RE = re.compile(rb'ADC:[ \t]*([+-]?\d+)[ \t]*\r?$', re.MULTILINE)
 
 # Calibration constants
 ZERO_CAL = 0.01823035255075
 SCALE_CAL = 0.00000451794631
+ADC_FULL_SCALE = float(0x80000000)
+INV_FULL_SCALE = 1.0 / ADC_FULL_SCALE
+INV_SCALE_CAL = 1.0 / SCALE_CAL if SCALE_CAL != 0 else 0.0  # A zero scale gives zero weights
+
+# FIR coefficients, CMSIS-DSP instance and state buffer, keyed by (cutoff, sampling rate, numtaps)
+_fir_cache = {}
 
 # Global variables for plotting
 current_fig, current_axes = None, None
@@ -49,18 +78,16 @@ def calculate_and_process_data(raw_adc_values, file_name):
     Returns the complete, plottable data arrays.
     """
     print(f"[APP] Processing file: {file_name}")
-    if not raw_adc_values:
+    if len(raw_adc_values) == 0:
         return None, None
 
     try:
         sampling_rate = 50.0 
-        signal_as_f32 = np.array(raw_adc_values, dtype=np.float32)
-        stable_dc_offset = np.mean(signal_as_f32)
+        # Weights, mean and DC-removed float32 signal from two passes over the int counts
+        raw_weights, dc_removed_signal, stable_dc_offset = preprocess_adc(raw_adc_values)
         
-        raw_weights = normalize_to_weights(raw_adc_values)
         raw_amplitude = np.nanmax(raw_weights) - np.nanmin(raw_weights)
         
-        dc_removed_signal = signal_as_f32 - stable_dc_offset
         filtered_ac_signal, _ = fir_filter(dc_removed_signal, FIR_CUTOFF_HZ, sampling_rate)
 
         filtered_weights = np.full_like(raw_weights, np.nan)
@@ -99,17 +126,99 @@ def save_amplitude_results(original_file_name, raw_amplitude, filtered_amplitude
         print(f"[APP] Error saving amplitude to file: {e}")
 
 
+def read_adc_values(filepath):
+    """Parse every "ADC:<int>" line of a data file straight into an int64 array."""
+    # np.fromregex scans the file in one pass; it needs a structured dtype for a single group.
+    # The file is opened in binary so the content matches the bytes pattern.
+    with open(filepath, 'rb') as f:
+        return np.fromregex(f, ADC_RE, dtype=[("adc", np.int64)])["adc"]
+
+
 def normalize_to_weights(values):
     """Normalize raw ADC values to physical weights."""
-    weights = []
-    for val in values:
-        try:
-            data_in = float(val) / float(0x80000000)
-            calculated_weight = (data_in - ZERO_CAL) / SCALE_CAL if SCALE_CAL != 0 else 0.0
-            weights.append(calculated_weight)
-        except (ValueError, TypeError):
-            weights.append(np.nan)
-    return np.array(weights)
+    try:
+        raw = np.asarray(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        # Not all numeric: convert one by one so only the bad values become NaN
+        raw = np.array([_to_float_or_nan(val) for val in values])
+    if NUMBA_AVAILABLE and raw.ndim == 1:
+        return _normalize_kernel(raw, INV_FULL_SCALE, ZERO_CAL, INV_SCALE_CAL)
+    # Multiplying by the reciprocals avoids two divisions per sample
+    return (raw * INV_FULL_SCALE - ZERO_CAL) * INV_SCALE_CAL
+
+
+def preprocess_adc(raw_adc_values):
+    """
+    Everything the analysis needs from the raw ADC counts, read straight from the int array:
+    the weights, the signal minus its mean as float32 (ready for CMSIS-DSP), and the mean itself.
+    """
+    raw_adc_values = np.asarray(raw_adc_values)
+    if NUMBA_AVAILABLE:
+        return _preprocess_kernel(raw_adc_values, INV_FULL_SCALE, ZERO_CAL, INV_SCALE_CAL)
+    stable_dc_offset = float(np.mean(raw_adc_values))
+    raw_weights = (raw_adc_values * INV_FULL_SCALE - ZERO_CAL) * INV_SCALE_CAL
+    return raw_weights, (raw_adc_values - stable_dc_offset).astype(np.float32), stable_dc_offset
+
+
+if NUMBA_AVAILABLE:
+    # Only fused multiply-add contraction is allowed; full fastmath would assume there are no NaNs
+    FAST_FLAGS = {"contract"}
+
+    @njit(parallel=True, fastmath=FAST_FLAGS, cache=True)
+    def _normalize_kernel(raw, inv_full_scale, zero_cal, inv_scale_cal):
+        """Calibration as one multiply-add chain per sample, split across cores."""
+        out = np.empty(raw.shape[0], dtype=np.float64)
+        for i in prange(raw.shape[0]):
+            out[i] = (raw[i] * inv_full_scale - zero_cal) * inv_scale_cal
+        return out
+
+    @njit(parallel=True, fastmath=FAST_FLAGS, cache=True)
+    def _preprocess_kernel(adc, inv_full_scale, zero_cal, inv_scale_cal):
+        """Sum for the mean in one parallel pass; weights and the float32 DC-removed signal in a second."""
+        n = adc.shape[0]
+        total = 0.0
+        for i in prange(n):
+            total += adc[i]
+        dc = total / n
+        weights = np.empty(n, dtype=np.float64)
+        ac = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            value = float(adc[i])
+            weights[i] = (value * inv_full_scale - zero_cal) * inv_scale_cal
+            ac[i] = value - dc
+        return weights, ac, dc
+
+    # Compile now (or load from the cache) rather than on the first file
+    _normalize_kernel(np.zeros(1), INV_FULL_SCALE, ZERO_CAL, INV_SCALE_CAL)
+    _preprocess_kernel(np.zeros(1, dtype=np.int64), INV_FULL_SCALE, ZERO_CAL, INV_SCALE_CAL)
+
+
+def _to_float_or_nan(val):
+    """float(val), or NaN if it cannot be converted."""
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def get_fir(cut_off_frequency, sampling_rate, numtaps, block_size):
+    """Coefficients and a CMSIS-DSP FIR instance with zeroed state, reused across calls with the same parameters."""
+    key = (cut_off_frequency, sampling_rate, numtaps)
+    entry = _fir_cache.get(key)
+    if entry is None:
+        normalized_cutoff = cut_off_frequency / (sampling_rate / 2)
+        fir_coefficients = firwin(numtaps=numtaps, cutoff=normalized_cutoff, window="hamming", pass_zero=True)
+        fir_coeffs_f32 = np.array(fir_coefficients, dtype=np.float32)
+        entry = _fir_cache[key] = [fir_coeffs_f32, dsp.arm_fir_instance_f32(), np.zeros(0, dtype=np.float32)]
+    fir_coeffs_f32, fir_instance, state_f32 = entry
+    # The state only grows, so blocks no longer than an earlier one reuse it
+    if len(state_f32) < numtaps + block_size - 1:
+        state_f32 = entry[2] = np.zeros(numtaps + block_size - 1, dtype=np.float32)
+    else:
+        state_f32.fill(0)
+    # Every call filters an independent block, so the instance starts again from an empty state
+    dsp.arm_fir_init_f32(fir_instance, numtaps, fir_coeffs_f32, state_f32)
+    return fir_coeffs_f32, fir_instance
 
 
 def fir_filter(values, cut_off_frequency, sampling_rate):
@@ -119,13 +228,7 @@ def fir_filter(values, cut_off_frequency, sampling_rate):
         numtaps = 51
         if nyquist <= 0 or cut_off_frequency <= 0 or cut_off_frequency >= nyquist or numtaps > len(values):
             return np.full_like(values, np.nan), np.array([], dtype=np.float32)
-        normalized_cutoff = cut_off_frequency / nyquist
-        fir_coefficients = firwin(numtaps=numtaps, cutoff=normalized_cutoff, window="hamming", pass_zero=True)
-        fir_coeffs_f32 = np.array(fir_coefficients, dtype=np.float32)
-        block_size = len(values)
-        state_f32 = np.zeros(numtaps + block_size - 1, dtype=np.float32)
-        fir_instance = dsp.arm_fir_instance_f32()
-        dsp.arm_fir_init_f32(fir_instance, numtaps, fir_coeffs_f32, state_f32)
+        fir_coeffs_f32, fir_instance = get_fir(cut_off_frequency, sampling_rate, numtaps, len(values))
         filtered_values = dsp.arm_fir_f32(fir_instance, values)
         return filtered_values, fir_coeffs_f32
     except Exception as e:
@@ -133,9 +236,9 @@ def fir_filter(values, cut_off_frequency, sampling_rate):
         return np.full_like(values, np.nan), np.array([], dtype=np.float32)
 
 
-def on_file_change(label, data_queue):
-    """Callback for file selection. Stops previous animation and starts a new processing thread."""
-    global selected_directory, g_animation
+def on_file_change(label):
+    """Callback for file selection. Stops previous animation and hands the file to the worker process."""
+    global selected_directory, g_animation, g_pending_load, g_executor
     
     # --- RECTIFIED: Stop any existing animation immediately on click ---
     if g_animation and g_animation.event_source:
@@ -146,38 +249,47 @@ def on_file_change(label, data_queue):
     filepath = os.path.join(selected_directory, label)
     print(f"[APP] User selected new file: {filepath}")
     
-    # Start a background thread to load and process the file
-    thread = threading.Thread(target=load_and_process_file_worker, args=(filepath, data_queue))
-    thread.daemon = True
-    thread.start()
+    # A file that is still loading is superseded; only the latest selection gets plotted
+    if g_pending_load is not None:
+        g_pending_load.cancel()
+    try:
+        g_pending_load = g_executor.submit(load_and_process_file, filepath)
+    except BrokenProcessPool:
+        # The worker died (e.g. killed); start a fresh one rather than refusing every later file
+        print("[APP] Worker process was lost, starting a new one.")
+        g_executor = new_executor()
+        g_pending_load = g_executor.submit(load_and_process_file, filepath)
+
+
+def new_executor():
+    """
+    The single-worker process pool that loads files.
+    Spawned, not forked: this process already runs numba's parallel threading layer,
+    and a fork of it can abort (OpenMP) or hang at exit (TBB).
+    """
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
 
 
-def load_and_process_file_worker(filepath, data_queue):
+def load_and_process_file(filepath):
     """
-    Worker thread function: Reads a file, processes it, and puts the result in a queue.
+    Worker process function: Reads a file and processes it.
+    Returns (raw_weights, filtered_weights, filepath), or None if it could not be processed.
     """
     try:
-        with open(filepath, 'r') as f:
-            lines = f.readlines()
+        raw_adc_values = read_adc_values(filepath)
         
-        raw_adc_values = [int(line.strip().split("ADC:")[-1]) for line in lines if 'ADC:' in line]
-        
-        if raw_adc_values:
+        if raw_adc_values.size > 0:
             raw_weights, filtered_weights = calculate_and_process_data(raw_adc_values, filepath)
             if raw_weights is not None:
-                # Put the fully processed data into the queue for the main thread
-                data_queue.put((raw_weights, filtered_weights, filepath))
-            else:
-                data_queue.put(None) # Signal error
+                return raw_weights, filtered_weights, filepath
         else:
             print("[APP] No valid ADC data found in the selected file.")
-            data_queue.put(None)
     except Exception as e:
         print(f"[APP] Error reading or processing file: {e}")
-        data_queue.put(None)
+    return None
 
 
-def init_plot(file_list, data_queue):
+def init_plot(file_list):
     """Initializes the Matplotlib figure and all interactive widgets."""
     global current_fig, current_axes, current_raw_line, current_filtered_line, speed_radio_buttons, file_radio_buttons
 
@@ -209,7 +321,7 @@ def init_plot(file_list, data_queue):
         USER_SELECTED_INTERVAL_MS = int(label.replace('ms', ''))
         # If an animation is running, update its interval in real-time
         if g_animation and g_animation.event_source:
-            g_animation.event_source.interval = USER_SELECTED_INTERVAL_MS
+            g_animation.event_source.interval = frame_timing(USER_SELECTED_INTERVAL_MS)[0]
         print(f"[APP] Real-time speed changed to: {USER_SELECTED_INTERVAL_MS}ms interval.")
     speed_radio_buttons.on_clicked(on_speed_change)
 
@@ -221,17 +333,35 @@ def init_plot(file_list, data_queue):
     
     def file_change_handler(label):
         original_label = file_list[display_names.index(label)]
-        on_file_change(original_label, data_queue)
+        on_file_change(original_label)
         
     file_radio_buttons.on_clicked(file_change_handler)
     return current_fig
 
 
+def frame_timing(interval_ms):
+    """Timer interval and samples per frame that play one sample per `interval_ms` without redrawing faster than MIN_FRAME_INTERVAL_MS."""
+    # Round up: rounding down would let the timer fire sooner than MIN_FRAME_INTERVAL_MS (e.g. every 10ms at 10ms)
+    per_frame = max(1, -(-MIN_FRAME_INTERVAL_MS // max(1, interval_ms)))
+    return interval_ms * per_frame, per_frame
+
+
+def playback_frames(n_samples):
+    """FuncAnimation frames: (start, stop) sample ranges, sized from the speed selected at each step."""
+    start = 0
+    while start < n_samples:
+        stop = min(n_samples, start + frame_timing(USER_SELECTED_INTERVAL_MS)[1])
+        yield start, stop
+        start = stop
+
+
 def update_animation_frame(frame):
-    """Function called by FuncAnimation for each frame."""
-    # Update the lines with data up to the current frame
-    current_raw_line.set_data(np.arange(frame + 1), g_all_raw_weights[:frame + 1])
-    current_filtered_line.set_data(np.arange(frame + 1), g_all_filtered_weights[:frame + 1])
+    """Function called by FuncAnimation for each frame; `frame` is the (start, stop) range of samples it adds."""
+    frame = frame[1] - 1 # Newest sample on screen
+    # Only the samples inside the scrolling window, so a frame costs the same at any point in the file
+    lo = max(0, frame - PLOT_WINDOW_SIZE)
+    current_raw_line.set_data(g_x_index[lo:frame + 1], g_all_raw_weights[lo:frame + 1])
+    current_filtered_line.set_data(g_x_index[lo:frame + 1], g_all_filtered_weights[lo:frame + 1])
     
     # Implement scrolling x-axis
     if frame < PLOT_WINDOW_SIZE:
@@ -246,10 +376,11 @@ def update_animation_frame(frame):
 
 def start_new_animation(all_raw, all_filtered, file_name):
     """Sets up and starts a new animation in the main thread."""
-    global g_all_raw_weights, g_all_filtered_weights, g_animation, g_simulation_running
+    global g_all_raw_weights, g_all_filtered_weights, g_x_index, g_animation, g_simulation_running
 
     g_all_raw_weights = all_raw
     g_all_filtered_weights = all_filtered
+    g_x_index = np.arange(len(all_raw), dtype=np.int32)
     
     base_name = os.path.basename(file_name)
     current_axes[0].set_title(f"Raw ADC Data - {base_name}")
@@ -275,10 +406,12 @@ def start_new_animation(all_raw, all_filtered, file_name):
     g_animation = FuncAnimation(
         current_fig, 
         update_animation_frame, 
-        frames=len(g_all_raw_weights),
-        interval=USER_SELECTED_INTERVAL_MS, 
+        frames=playback_frames(len(g_all_raw_weights)),
+        interval=frame_timing(USER_SELECTED_INTERVAL_MS)[0], 
         blit=True, 
-        repeat=False
+        repeat=False,
+        # Frames are plain sample ranges; don't keep one per frame for the whole file
+        cache_frame_data=False
     )
     current_fig.canvas.draw()
     g_simulation_running = True # Signal that an animation is now active
@@ -306,33 +439,42 @@ if __name__ == "__main__":
         print(f"[APP] Error scanning directory: {e}")
         exit()
 
-    data_for_plotting_queue = queue.Queue()
-    fig = init_plot(file_list, data_for_plotting_queue)
+    # One worker is enough: a new selection supersedes the one before it
+    g_executor = new_executor()
+    fig = init_plot(file_list)
     
     # --- RECTIFIED: Main application loop using a periodic timer ---
-    def check_queue():
-        """Function to be called periodically to check for new data to plot."""
-        global g_simulation_running
-        try:
-            plot_data = data_for_plotting_queue.get_nowait()
-            
-            if plot_data:
-                all_raw, all_filtered, file_name = plot_data
-                start_new_animation(all_raw, all_filtered, file_name)
-            else: # Received a None, indicating processing failed
-                g_simulation_running = False
-                print("[APP] Ready to load another file.")
-        except queue.Empty:
+    def check_pending_load():
+        """Function to be called periodically to check whether the worker has finished a file."""
+        global g_simulation_running, g_pending_load
+        if g_pending_load is None or not g_pending_load.done():
             # This is normal, just means no new file has been processed
-            pass
+            return
+        future, g_pending_load = g_pending_load, None
+        if future.cancelled():
+            return
+        try:
+            plot_data = future.result()
+        except Exception as e:
+            print(f"[APP] Worker process failed: {e}")
+            plot_data = None
+
+        if plot_data:
+            all_raw, all_filtered, file_name = plot_data
+            start_new_animation(all_raw, all_filtered, file_name)
+        else: # Processing failed
+            g_simulation_running = False
+            print("[APP] Ready to load another file.")
         
     # Use a timer that is part of the Matplotlib canvas for safe, cross-platform GUI updates
-    timer = fig.canvas.new_timer(interval=100) # Check queue every 100ms
-    timer.add_callback(check_queue)
+    timer = fig.canvas.new_timer(interval=100) # Check the worker every 100ms
+    timer.add_callback(check_pending_load)
     timer.start()
 
     print("[APP] Standalone Analyzer ready. Please select a file from the list to begin.")
     
     plt.show()
 
+    # Don't keep the window's exit waiting on a file nobody will look at
+    g_executor.shutdown(wait=False, cancel_futures=True)
     print("[APP] Application exited.")